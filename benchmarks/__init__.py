@@ -0,0 +1,5 @@
+"""Offline benchmark suite - synthetic corpus and local stand-ins for the feeds, Endee and Ollama.
+
+Run ``python -m benchmarks.run`` from the repository root; compare two result
+files with ``python -m benchmarks.compare``.
+"""
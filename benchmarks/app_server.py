@@ -0,0 +1,42 @@
+"""The API under benchmark, run in its own process with the Endee and model stand-ins installed.
+
+Started by ``benchmarks.run``; not meant to be run by hand. The working
+directory, environment and corpus are prepared before the app is imported, so
+settings and data paths point at the benchmark's scratch directory.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workdir", required=True)
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--corpus", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--endee-latency-ms", type=float, default=1.0)
+    parser.add_argument("--encode-ms-per-text", type=float, default=0.0)
+    parser.add_argument("--real-model", action="store_true")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.makedirs(args.workdir, exist_ok=True)
+    os.chdir(args.workdir)
+
+    import uvicorn
+
+    from benchmarks import corpus
+    from benchmarks.fakes import HashingModel, install_fakes
+    from src.api import main as api
+
+    model = None if args.real_model else HashingModel(cost_ms_per_text=args.encode_ms_per_text)
+    install_fakes(api.agent.vector_store, model, args.endee_latency_ms)
+    api.agent.vector_store.upsert_new_articles(corpus.articles(args.corpus, seed=args.seed))
+    uvicorn.run(api.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/new.json
+
+Exits with status 1 when any metric got worse by more than ``--threshold`` percent.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+
+def _metrics(results: dict) -> Iterator[tuple[str, float, bool]]:
+    """(name, value, higher_is_better) for every comparable number in a result file."""
+    for stage, row in results.get("ingest", {}).get("stages", {}).items():
+        yield f"ingest.{stage} articles/s", row["articles_per_sec"], True
+    for suite in ("search", "ask"):
+        for row in results.get(suite, []):
+            c = row["concurrency"]
+            yield f"{suite} c={c} rps", row["rps"], True
+            for p in ("p50_ms", "p95_ms", "p99_ms"):
+                yield f"{suite} c={c} {p}", row[p], False
+            yield f"{suite} c={c} errors", row["errors"], False
+    for row in results.get("storage", []):
+        name = f"storage.{row['backend']} size={row['bucket_size']}"
+        yield f"{name} save_ms", row["last_save_ms"], False
+        yield f"{name} load_ms", row["load_ms"], False
+
+
+def compare(base: dict, new: dict, threshold: float) -> list[dict]:
+    """Metrics present in both runs with their relative change (positive = better)."""
+    before = {name: value for name, value, _ in _metrics(base)}
+    rows = []
+    for name, value, higher_is_better in _metrics(new):
+        if name not in before:
+            continue
+        old = before[name]
+        if old == value:
+            change = 0.0
+        elif old == 0:
+            change = float("inf") if (value > old) == higher_is_better else float("-inf")
+        else:
+            change = (value - old) / old * 100 * (1 if higher_is_better else -1)
+        rows.append({"metric": name, "base": old, "new": value, "change": change, "regression": change < -threshold})
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    base, new = (json.loads(p.read_text(encoding="utf-8")) for p in (args.base, args.new))
+    rows = compare(base, new, args.threshold)
+
+    table = Table(title=f"{base['meta']['commit']} -> {new['meta']['commit']}")
+    for column in ("metric", "base", "new", "change"):
+        table.add_column(column)
+    for row in rows:
+        style = "red" if row["regression"] else ("green" if row["change"] > args.threshold else "")
+        table.add_row(row["metric"], str(row["base"]), str(row["new"]), f"{row['change']:+.1f}%", style=style)
+    console.print(table)
+
+    regressions = [r["metric"] for r in rows if r["regression"]]
+    if regressions:
+        console.print(f"[red]{len(regressions)} regression(s) beyond {args.threshold}%[/red]")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Deterministic synthetic news corpus in the Saurav NewsAPI and stored-article shapes."""
+
+import random
+from datetime import datetime, timedelta
+
+CATEGORY_WORDS = {
+    "technology": "ai chip software cloud startup robotics quantum cybersecurity smartphone semiconductor privacy model",
+    "business": "market stocks inflation earnings merger bank trade investors economy retail tariffs profit",
+    "science": "space nasa climate research physics genome telescope species fossil ocean mission planet",
+    "health": "vaccine hospital cancer study drug mental nutrition trial disease doctors patients virus",
+    "sports": "cricket football match championship league coach tennis olympics goal injury final season",
+    "entertainment": "film music album award celebrity series streaming boxoffice festival actor premiere tour",
+    "general": "government election policy minister protest court city weather parliament summit law crisis",
+}
+COMMON_WORDS = "new report says after over amid first year week plans could more people global local latest".split()
+PLACES = "india us uk australia france europe china delhi london sydney paris washington mumbai tokyo".split()
+SOURCES = ["BBC News", "CNN", "Reuters", "The Hindu", "ABC News", "Le Monde", "Fox News", "Google News"]
+AUTHORS = ["Asha Rao", "Tom Baker", "Lena Fischer", "Ravi Menon", "Maria Lopez", None]
+
+
+def _sentence(rng: random.Random, topic: list[str], words: int) -> str:
+    pool = topic * 2 + COMMON_WORDS + PLACES
+    return " ".join(rng.choice(pool) for _ in range(words))
+
+
+def generate(n: int, seed: int = 0, days: int = 28) -> list[tuple[dict, str, str]]:
+    """``n`` raw NewsAPI articles as (article, category, country), published over the last ``days`` days."""
+    from src.news_ingestion.fetcher import NewsFetcher
+
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)  # same corpus all day
+    items = []
+    for i in range(n):
+        category = rng.choice(NewsFetcher.CATEGORIES)
+        country = rng.choice(NewsFetcher.COUNTRIES)
+        topic = CATEGORY_WORDS[category].split()
+        title = f"{rng.choice(PLACES).title()} {_sentence(rng, topic, 7)}"
+        description = _sentence(rng, topic, 28)
+        published = now - timedelta(seconds=rng.randrange(days * 86400))
+        raw = {
+            "source": {"id": None, "name": rng.choice(SOURCES)},
+            "author": rng.choice(AUTHORS),
+            "title": title,
+            "description": description,
+            "url": f"https://news.example.com/{category}/{country}/{seed}-{i}",
+            "urlToImage": f"https://news.example.com/img/{seed}-{i}.jpg",
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": f"{description} {_sentence(rng, topic, 40)} [+{rng.randrange(500, 5000)} chars]",
+        }
+        items.append((raw, category, country))
+    return items
+
+
+def articles(n: int, seed: int = 0, days: int = 28) -> list[dict]:
+    """``n`` articles normalized exactly as ``NewsFetcher._normalize_article`` stores them."""
+    from src.news_ingestion.fetcher import NewsFetcher
+
+    fetcher = NewsFetcher()
+    return [fetcher._normalize_article(raw, category, country) for raw, category, country in generate(n, seed, days)]
+
+
+def queries(n: int, seed: int = 1) -> list[str]:
+    """``n`` distinct search questions (distinct texts, so result caches never hit)."""
+    rng = random.Random(seed)
+    categories = list(CATEGORY_WORDS)
+    out = []
+    for i in range(n):
+        topic = CATEGORY_WORDS[rng.choice(categories)].split()
+        out.append(f"what is the latest on {rng.choice(topic)} {rng.choice(topic)} in {rng.choice(PLACES)} #{i}")
+    return out
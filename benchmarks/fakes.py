@@ -0,0 +1,266 @@
+"""Local stand-ins for the Saurav feeds, Ollama and Endee, with configurable latency.
+
+The feed and Ollama stand-ins are real HTTP servers, so the fetcher's and the
+LLM client's connection handling is exercised as in production. Endee is
+replaced at the SDK boundary (``FakeEndee`` is assigned to the store's
+``_client``): the wire protocol differs between SDK versions, while the
+``list_indexes`` / ``create_index`` / ``get_index`` / ``index.query`` calls the
+store makes do not.
+"""
+
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import numpy as np
+
+
+class _Server:
+    """ThreadingHTTPServer on a local port, served from a daemon thread."""
+
+    def __init__(self, port: int = 0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self.Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.owner = self
+        self.requests = 0
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_json(self, payload: bytes, status: int = 200) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "_Server":
+        threading.Thread(target=self.httpd.serve_forever, name=type(self).__name__, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FeedServer(_Server):
+    """Serves every feed ``NewsFetcher`` requests, filled from a synthetic corpus.
+
+    Each raw article goes to the top-headlines feed of its category and
+    country; the ``everything`` feeds are empty. Every response is delayed by
+    ``latency_ms``.
+    """
+
+    def __init__(self, items: list[tuple[dict, str, str]], latency_ms: float = 0.0, port: int = 0):
+        from src.news_ingestion.fetcher import NewsFetcher
+
+        super().__init__(port)
+        self.latency = latency_ms / 1000
+        feeds: dict[str, list[dict]] = {}
+        for country in NewsFetcher.COUNTRIES:
+            for category in NewsFetcher.CATEGORIES:
+                feeds[f"/top-headlines/category/{category}/{country}.json"] = []
+        for source_id in NewsFetcher.SOURCES:
+            feeds[f"/everything/{source_id}.json"] = []
+        for raw, category, country in items:
+            feeds[f"/top-headlines/category/{category}/{country}.json"].append(raw)
+        self.payloads = {
+            path: json.dumps({"status": "ok", "totalResults": len(arts), "articles": arts}).encode()
+            for path, arts in feeds.items()
+        }
+
+    class Handler(_Server.Handler):
+        def do_GET(self):
+            feeds = self.server.owner
+            feeds.requests += 1
+            time.sleep(feeds.latency)
+            payload = feeds.payloads.get(self.path)
+            if payload is None:
+                self.send_json(b'{"status": "error"}', status=404)
+            else:
+                self.send_json(payload)
+
+
+class OllamaServer(_Server):
+    """``/api/generate`` stand-in: the first token after ``first_token_ms``, then one every ``token_ms``."""
+
+    def __init__(self, tokens: int = 40, first_token_ms: float = 150.0, token_ms: float = 15.0, port: int = 0):
+        super().__init__(port)
+        self.tokens = tokens
+        self.first_token = first_token_ms / 1000
+        self.token_interval = token_ms / 1000
+
+    class Handler(_Server.Handler):
+        def do_POST(self):
+            ollama = self.server.owner
+            ollama.requests += 1
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not body.get("prompt"):
+                # Model load request (warmup)
+                self.send_json(json.dumps({"response": "", "done": True}).encode())
+                return
+            words = [f" token{i}" for i in range(ollama.tokens)]
+            if not body.get("stream"):
+                time.sleep(ollama.first_token + ollama.token_interval * (ollama.tokens - 1))
+                self.send_json(json.dumps({"response": "".join(words), "done": True}).encode())
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            time.sleep(ollama.first_token)
+            for i, word in enumerate(words + [None]):
+                if i:
+                    time.sleep(ollama.token_interval)
+                line = (json.dumps({"response": word or "", "done": word is None}) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+
+class FakeIndex:
+    """Brute-force cosine index with the query/upsert interface of an Endee index handle."""
+
+    def __init__(self, dimension: int, latency_ms: float = 0.0):
+        self.dimension = dimension
+        self.latency = latency_ms / 1000
+        self._rows: dict[str, int] = {}
+        self._vectors: list[np.ndarray] = []
+        self._meta: list[dict] = []
+        self._filters: list[dict] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def upsert(self, items: list[dict]) -> None:
+        time.sleep(self.latency)
+        with self._lock:
+            for item in items:
+                vector = np.asarray(item["vector"], dtype=np.float32)
+                vector /= np.linalg.norm(vector) or 1.0
+                row = self._rows.get(item["id"])
+                if row is None:
+                    self._rows[item["id"]] = len(self._vectors)
+                    self._vectors.append(vector)
+                    self._meta.append(item.get("meta", {}))
+                    self._filters.append(item.get("filter", {}))
+                else:
+                    self._vectors[row], self._meta[row], self._filters[row] = vector, item.get("meta", {}), item.get("filter", {})
+            self._matrix = None
+
+    def query(
+        self,
+        vector: list[float],
+        top_k: int = 10,
+        filter: Optional[list[dict]] = None,
+        include_vectors: bool = False,
+        **kwargs,
+    ) -> list[dict]:
+        time.sleep(self.latency)
+        with self._lock:
+            if self._matrix is None and self._vectors:
+                self._matrix = np.vstack(self._vectors)
+            matrix, ids, meta, filters = self._matrix, list(self._rows), self._meta, self._filters
+        if matrix is None:
+            return []
+        scores = matrix @ np.asarray(vector, dtype=np.float32)
+        if filter:
+            conditions = [(field, cond["$eq"]) for f in filter for field, cond in f.items()]
+            keep = np.array([all(flt.get(k) == v for k, v in conditions) for flt in filters])
+            scores = np.where(keep, scores, -np.inf)
+        k = min(top_k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {"id": ids[i], "similarity": float(scores[i]), "meta": meta[i]}
+            | ({"vector": matrix[i].tolist()} if include_vectors else {})
+            for i in top
+            if np.isfinite(scores[i])
+        ]
+
+
+class FakeEndee:
+    """In-process Endee client; every call costs ``latency_ms`` (a network round trip)."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.indexes: dict[str, FakeIndex] = {}
+
+    def _round_trip(self) -> None:
+        time.sleep(self.latency_ms / 1000)
+
+    def set_base_url(self, base_url: str) -> None:
+        pass
+
+    def list_indexes(self) -> list[dict]:
+        self._round_trip()
+        return [{"name": name} for name in self.indexes]
+
+    def create_index(self, name: str, dimension: int, **kwargs) -> None:
+        self._round_trip()
+        if name in self.indexes:
+            from endee.exceptions import ConflictException
+            raise ConflictException(f"Index {name} already exists")
+        self.indexes[name] = FakeIndex(dimension, self.latency_ms)
+
+    def get_index(self, name: str) -> FakeIndex:
+        self._round_trip()
+        return self.indexes[name]
+
+    def delete_index(self, name: str) -> None:
+        self._round_trip()
+        self.indexes.pop(name, None)
+
+
+class HashingModel:
+    """Sentence-transformer stand-in: signed feature hashing of lowercase tokens.
+
+    Texts sharing words get similar vectors, so retrieval, MMR and
+    deduplication behave sensibly. ``cost_ms_per_text`` simulates model compute.
+    """
+
+    def __init__(self, dimension: int = 384, cost_ms_per_text: float = 0.0):
+        self.dimension = dimension
+        self.cost = cost_ms_per_text / 1000
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts: list[str], batch_size: int = 32, convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                h = zlib.crc32(token.encode())
+                vectors[row, h % self.dimension] += 1.0 if h & 0x10000 else -1.0
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        if self.cost:
+            time.sleep(self.cost * len(texts))
+        return vectors
+
+
+def install_fakes(vector_store, model: Optional[HashingModel], endee_latency_ms: float = 0.0) -> None:
+    """Point a vector store at the stand-ins: ``model`` (None loads the real one) and ``FakeEndee``."""
+    from src.embeddings.encoder import EmbeddingEncoder
+
+    encoder = EmbeddingEncoder(use_cache=False)
+    if model is not None:
+        encoder._model = model
+    vector_store._encoder = encoder
+    if hasattr(vector_store, "_client"):
+        vector_store._client = FakeEndee(endee_latency_ms)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""Offline benchmarks: ingest throughput, /search and /ask latency, storage save/load times.
+
+Needs no Endee, Ollama or internet: feeds and Ollama are local HTTP
+stand-ins, Endee is an in-process stand-in and embeddings come from a hashing
+model unless ``--real-model`` is given. Everything runs in a scratch
+directory, and results are written as JSON for ``benchmarks.compare``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import httpx
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+SUITES = ("ingest", "search", "ask", "storage")
+
+# Settings for every benchmark process; caches that would turn repeated work
+# into hits are off so runs measure the real paths.
+BENCH_ENV = {
+    "VECTOR_BACKEND": "endee",
+    "EMBEDDING_CACHE_ENABLED": "false",
+    "ANSWER_CACHE_ENABLED": "false",
+    "AUTO_DELETE_ENABLED": "false",
+    "INGEST_SCHEDULE_MINUTES": "0",
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def _rate(count: int, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds else 0.0
+
+
+def _stage(count: int, seconds: float) -> dict:
+    return {"articles": count, "seconds": round(seconds, 4), "articles_per_sec": _rate(count, seconds)}
+
+
+def _model(args):
+    from benchmarks.fakes import HashingModel
+
+    return None if args.real_model else HashingModel(cost_ms_per_text=args.encode_ms_per_text)
+
+
+async def bench_ingest(args) -> dict:
+    """Per-stage throughput of one full ingest of ``--articles`` articles."""
+    from benchmarks import corpus
+    from benchmarks.fakes import FeedServer, install_fakes
+    from src.news_ingestion.article_db import SQLiteArticleStore
+    from src.news_ingestion.dedup import NearDuplicateIndex
+    from src.news_ingestion.fetcher import NewsFetcher
+    from src.news_ingestion.storage import NewsStorage
+    from src.vector_db.base import BaseVectorStore
+
+    items = corpus.generate(args.articles, seed=args.seed)
+    with FeedServer(items, latency_ms=args.feed_latency_ms) as feeds:
+        fetcher = NewsFetcher(base_url=feeds.url)
+        t0 = time.perf_counter()
+        articles = await fetcher.fetch_all(conditional=False)
+        fetch_seconds = time.perf_counter() - t0
+    report = fetcher.last_fetch_report
+
+    t0 = time.perf_counter()
+    dedup = NearDuplicateIndex()
+    dedup.assign_canonical(articles)
+    stories = dedup.canonical_articles(articles)
+    dedup_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    NewsStorage.from_settings().save_articles(articles)
+    store_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    SQLiteArticleStore().insert_articles(articles)
+    article_db_seconds = time.perf_counter() - t0
+
+    vector_store = BaseVectorStore.from_settings()
+    install_fakes(vector_store, _model(args), args.endee_latency_ms)
+    t0 = time.perf_counter()
+    indexed = vector_store.upsert_new_articles(stories)
+    index_seconds = time.perf_counter() - t0
+    batches = vector_store.last_upsert_stats
+
+    t0 = time.perf_counter()
+    vector_store.upsert_new_articles(stories)
+    unchanged_seconds = time.perf_counter() - t0
+
+    return {
+        "articles": len(articles),
+        "stories": len(stories),
+        "feeds": report["feeds_total"],
+        "failed_feeds": report["failed"],
+        "stages": {
+            "fetch": _stage(len(articles), fetch_seconds),
+            "dedup": _stage(len(articles), dedup_seconds),
+            "store": _stage(len(articles), store_seconds),
+            "article_db": _stage(len(articles), article_db_seconds),
+            "encode": _stage(indexed, sum(b["encode_seconds"] for b in batches)),
+            "upsert": _stage(indexed, sum(b["upsert_seconds"] for b in batches)),
+            "index": _stage(indexed, index_seconds),
+            "index_unchanged": _stage(len(stories), unchanged_seconds),
+        },
+    }
+
+
+def _latency_summary(latencies: list[float], errors: int, seconds: float, concurrency: int) -> dict:
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (0.0, 0.0, 0.0)
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": _rate(len(latencies), seconds),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "mean_ms": round(float(ms.mean()), 2) if len(ms) else 0.0,
+        "max_ms": round(float(ms.max()), 2) if len(ms) else 0.0,
+    }
+
+
+async def _load(url: str, bodies: list[dict], concurrency: int) -> dict:
+    """POST every body with ``concurrency`` requests in flight; latency percentiles of the successful ones."""
+    latencies: list[float] = []
+    errors = 0
+    pending = iter(bodies)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=300, limits=limits) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for body in pending:
+                t0 = time.perf_counter()
+                try:
+                    ok = (await client.post(url, json=body)).status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - t0)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return _latency_summary(latencies, errors, time.perf_counter() - started, concurrency)
+
+
+class AppProcess:
+    """``benchmarks.app_server`` in a child process, ready once ``/ready`` answers 200."""
+
+    def __init__(self, args, workdir: Path, ollama_url: str):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.log_path = workdir / "app.log"
+        self.env = {**os.environ, **BENCH_ENV, "OLLAMA_BASE_URL": ollama_url, "ENDEE_PARTITIONING": args.partitioning}
+        self.cmd = [
+            sys.executable, "-m", "benchmarks.app_server",
+            "--workdir", str(workdir / "app"),
+            "--port", str(self.port),
+            "--corpus", str(args.articles),
+            "--seed", str(args.seed),
+            "--endee-latency-ms", str(args.endee_latency_ms),
+            "--encode-ms-per-text", str(args.encode_ms_per_text),
+        ] + (["--real-model"] if args.real_model else [])
+        self.process = None
+
+    def __enter__(self) -> "AppProcess":
+        self._log = open(self.log_path, "w", encoding="utf-8")
+        self.process = subprocess.Popen(self.cmd, cwd=REPO_ROOT, env=self.env, stdout=self._log, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + 300
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                if httpx.get(f"{self.url}/ready", timeout=5).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.25)
+        self.__exit__()
+        raise RuntimeError(f"Benchmark app did not become ready:\n{self.log_path.read_text(encoding='utf-8')[-2000:]}")
+
+    def __exit__(self, *exc) -> None:
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self._log.close()
+
+
+async def bench_api(args, suites: set[str], workdir: Path) -> dict:
+    """p50/p95/p99 of /search and /ask at each concurrency level, against the app in a child process."""
+    from benchmarks import corpus
+    from benchmarks.fakes import OllamaServer
+
+    results = {}
+    ollama = OllamaServer(tokens=args.llm_tokens, first_token_ms=args.llm_first_token_ms, token_ms=args.llm_token_ms)
+    with ollama, AppProcess(args, workdir, ollama.url) as app:
+        texts = iter(corpus.queries(10 * (args.search_requests + args.ask_requests) * len(args.concurrency) + 100))
+        # Warm connections, the batcher thread and the executors before measuring.
+        await _load(f"{app.url}/search", [{"query": next(texts)} for _ in range(20)], 4)
+
+        for suite, path, count in (("search", "/search", args.search_requests), ("ask", "/ask", args.ask_requests)):
+            if suite not in suites:
+                continue
+            levels = []
+            for concurrency in args.concurrency:
+                bodies = [{"query": next(texts), "top_k": args.top_k} for _ in range(max(count, concurrency))]
+                levels.append(await _load(f"{app.url}{path}", bodies, concurrency))
+                console.print(f"  {path} c={concurrency}: p50 {levels[-1]['p50_ms']}ms p99 {levels[-1]['p99_ms']}ms")
+            results[suite] = levels
+    return results
+
+
+def bench_storage(args, workdir: Path) -> list[dict]:
+    """Save time of one ingest-sized batch into a growing bucket, and full load time, per backend."""
+    from benchmarks import corpus
+    from src.news_ingestion.segments import SegmentedNewsStorage
+    from src.news_ingestion.storage import NewsStorage
+
+    sizes = sorted(args.storage_sizes)
+    pool = corpus.articles(sizes[-1], seed=args.seed + 1)
+    rows = []
+    for name, cls in (("json", NewsStorage), ("segmented", SegmentedNewsStorage)):
+        storage = cls(data_dir=str(workdir / f"storage_{name}"))
+        stored = 0
+        for size in sizes:
+            save_seconds = []
+            while stored < size:
+                batch = pool[stored : min(stored + args.storage_batch, size)]
+                t0 = time.perf_counter()
+                storage.save_articles(batch)
+                save_seconds.append(time.perf_counter() - t0)
+                stored += len(batch)
+            for thread in list(getattr(storage, "_compactions", {}).values()):
+                thread.join()
+            t0 = time.perf_counter()
+            loaded = len(storage.load_all_articles())
+            load_seconds = time.perf_counter() - t0
+            rows.append({
+                "backend": name,
+                "bucket_size": size,
+                "batch": args.storage_batch,
+                "last_save_ms": round(save_seconds[-1] * 1000, 2),
+                "mean_save_ms": round(1000 * sum(save_seconds) / len(save_seconds), 2),
+                "load_ms": round(load_seconds * 1000, 2),
+                "loaded": loaded,
+            })
+            console.print(f"  {name} bucket={size}: save {rows[-1]['last_save_ms']}ms load {rows[-1]['load_ms']}ms")
+    return rows
+
+
+def _print_summary(results: dict) -> None:
+    if "ingest" in results:
+        table = Table(title=f"Ingest ({results['ingest']['articles']} articles)")
+        for column in ("stage", "seconds", "articles/s"):
+            table.add_column(column)
+        for stage, row in results["ingest"]["stages"].items():
+            table.add_row(stage, str(row["seconds"]), str(row["articles_per_sec"]))
+        console.print(table)
+    for suite in ("search", "ask"):
+        if suite in results:
+            table = Table(title=f"/{suite}")
+            for column in ("concurrency", "rps", "p50 ms", "p95 ms", "p99 ms", "errors"):
+                table.add_column(column)
+            for row in results[suite]:
+                table.add_row(*(str(row[k]) for k in ("concurrency", "rps", "p50_ms", "p95_ms", "p99_ms", "errors")))
+            console.print(table)
+    if "storage" in results:
+        table = Table(title="Storage")
+        for column in ("backend", "bucket size", "save ms", "load ms"):
+            table.add_column(column)
+        for row in results["storage"]:
+            table.add_row(row["backend"], str(row["bucket_size"]), str(row["last_save_ms"]), str(row["load_ms"]))
+        console.print(table)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"Comma-separated subset of {','.join(SUITES)}")
+    parser.add_argument("--quick", action="store_true", help="Small corpus and few requests (smoke run)")
+    parser.add_argument("--out", default=None, help="Result file (default benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--articles", type=int, default=5000, help="Corpus size for ingest and the search index")
+    parser.add_argument("--concurrency", default="1,8,32,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--search-requests", type=int, default=500, help="Requests per /search level")
+    parser.add_argument("--ask-requests", type=int, default=100, help="Requests per /ask level")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--partitioning", default="weekly", choices=["weekly", "none"])
+    parser.add_argument("--real-model", action="store_true", help="Use the sentence-transformers model")
+    parser.add_argument("--encode-ms-per-text", type=float, default=0.0, help="Simulated model cost per text")
+    parser.add_argument("--feed-latency-ms", type=float, default=20.0)
+    parser.add_argument("--endee-latency-ms", type=float, default=1.0)
+    parser.add_argument("--llm-first-token-ms", type=float, default=150.0)
+    parser.add_argument("--llm-token-ms", type=float, default=15.0)
+    parser.add_argument("--llm-tokens", type=int, default=40)
+    parser.add_argument("--storage-sizes", default="1000,5000,20000", help="Bucket sizes to measure")
+    parser.add_argument("--storage-batch", type=int, default=500, help="Articles per save")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.articles, args.concurrency = 500, "1,8"
+        args.search_requests, args.ask_requests = 50, 10
+        args.storage_sizes = "500,2000"
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+    args.storage_sizes = [int(s) for s in args.storage_sizes.split(",")]
+    return args
+
+
+async def main(argv=None) -> dict:
+    args = parse_args(argv)
+    suites = {s.strip() for s in args.suites.split(",") if s.strip()}
+    commit = _git_commit()
+    results = {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat() + "Z",
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k != "out"},
+        }
+    }
+    out = Path(args.out) if args.out else REPO_ROOT / "benchmarks" / "results" / (
+        f"{datetime.utcnow():%Y%m%d-%H%M%S}-{commit}.json"
+    )
+
+    with tempfile.TemporaryDirectory(prefix="news-bench-") as scratch:
+        workdir = Path(scratch)
+        # Settings are read on first import; point them (and all relative data paths) at the scratch dir.
+        os.environ.update(BENCH_ENV, ENDEE_PARTITIONING=args.partitioning)
+        os.chdir(workdir)
+        if "ingest" in suites:
+            console.print("[bold]Ingest[/bold]")
+            results["ingest"] = await bench_ingest(args)
+        if suites & {"search", "ask"}:
+            console.print("[bold]API latency[/bold]")
+            results.update(await bench_api(args, suites, workdir))
+        if "storage" in suites:
+            console.print("[bold]Storage[/bold]")
+            results["storage"] = bench_storage(args, workdir)
+        os.chdir(REPO_ROOT)
+
+    results["meta"]["finished_at"] = datetime.utcnow().isoformat() + "Z"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    _print_summary(results)
+    console.print(f"\nResults written to [bold]{out}[/bold]")
+    return results
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -15,6 +15,17 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    # API server (python main.py --serve); 0 workers -> one per CPU core
+    api_host: str = "0.0.0.0"
+    api_port: int = 8000
+    api_workers: int = 0
+
+    # Metrics (/metrics in Prometheus format) and the per-request Server-Timing header
+    metrics_enabled: bool = True
+    server_timing_enabled: bool = False
+    metrics_dir: str = "data/metrics"  # per-worker snapshots in pre-fork mode
+    metrics_flush_seconds: float = 5.0
+
     # Endee Vector Database
     endee_url: str = "http://localhost:8080/api/v1"
     endee_token: Optional[str] = None
@@ -22,20 +33,90 @@ class Settings(BaseSettings):
     # Ollama LLM (free, local)
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "llama3.2"
+    ollama_max_concurrency: int = 2
+    ollama_max_queue: int = 32
+    ollama_timeout: float = 60.0
+
+    # Semantic answer cache for RAG (reuse answers for paraphrased questions)
+    answer_cache_enabled: bool = True
+    answer_cache_threshold: float = 0.92
+    answer_cache_min_overlap: float = 0.6
+    answer_cache_size: int = 512
+    answer_cache_ttl_seconds: float = 3600.0
+
+    # RAG context: token budget, near-duplicate collapsing and MMR diversity
+    context_max_tokens: int = 1500
+    context_dedup_threshold: float = 0.9
+    context_mmr_lambda: float = 0.7
+    context_fetch_multiplier: int = 2
 
     # News API - Saurav's free API
     news_api_base: str = "https://saurav.tech/NewsAPI"
+    fetch_concurrency: int = 10
+    fetch_per_host_limit: int = 6
+    fetch_timeout: float = 30.0
+    conditional_fetch_enabled: bool = True
+    feed_state_path: str = "data/feed_state.json"
+
+    # Background ingest jobs (/ingest); 0 disables the in-process schedule
+    ingest_schedule_minutes: float = 0.0
+    ingest_jobs_dir: str = "data/ingest_jobs"
+    ingest_jobs_keep: int = 50
+    ingest_max_resumes: int = 3  # an unfinished job is abandoned after this many resumes
 
     # Storage retention
     retention_weeks: int = 4
     retention_months: int = 3
     auto_delete_enabled: bool = True
+    storage_backend: str = "json"  # json | segmented
+    storage_compact_after_segments: int = 16
+    article_db_enabled: bool = True
+    article_db_path: str = "data/articles.db"
+
+    # Near-duplicate detection at ingest (MinHash LSH); variants index as one story
+    dedup_enabled: bool = True
+    dedup_db_path: str = "data/dedup.db"
+    dedup_threshold: float = 0.7  # estimated Jaccard similarity of title+description shingles
+
+    # User profiles (/users/{id}/...): one vector per interest plus a weighted centroid
+    profile_db_path: str = "data/profiles.db"
+    profile_click_weight: float = 0.3  # share of clicked articles in the profile centroid
+    profile_click_decay: float = 0.9  # per click; older clicks fade from the click vector
+    profile_click_boost: float = 0.1  # weight added to the interest closest to a clicked article
+    profile_seen_max: int = 500  # clicked article IDs kept and excluded from recommendations
 
     # Embedding model
     embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_batch_size: int = 64
+    embedding_cache_enabled: bool = True
+    embedding_cache_dir: str = "data/embeddings_cache"
+    embedding_cache_max_mb: int = 256
+    embedding_cache_dtype: str = "float16"
+    encode_workers: int = 0  # CPU executor threads for async encoding; 0 -> one per core
+    query_batch_enabled: bool = True
+    query_batch_max_size: int = 32
+    query_batch_max_wait_ms: float = 2.0
+
+    # Vector store backend: endee (server) or local (in-process NumPy index)
+    vector_backend: str = "endee"
+    local_index_dir: str = "data/vector_index"
+    local_index_dtype: str = "float32"
+    vector_io_workers: int = 32  # threads for blocking vector-store calls on the async path
 
     # Index name for Endee
     news_index_name: str = "news_vectors"
+    endee_index_ttl_seconds: float = 300.0
+    endee_partitioning: str = "weekly"  # weekly (one index per ISO week) | none
+    endee_fanout_concurrency: int = 8
+
+    # Query caches (embedding LRU + search results, invalidated on ingest)
+    query_embedding_cache_size: int = 1024
+    search_cache_size: int = 2048
+    search_cache_ttl_seconds: float = 300.0
+    index_generation_path: str = "data/index_generation"
+    batch_search_concurrency: int = 8
+    batch_search_max_queries: int = 500
+    index_ledger_path: str = "data/index_ledger.json"
 
 
 @lru_cache
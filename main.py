@@ -1,12 +1,30 @@
 #!/usr/bin/env python3
 """News Intelligence System - Main entry point."""
 
+import argparse
+
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "src.api.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Production mode: warm up once, then fork workers sharing the loaded model",
     )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: API_WORKERS)")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.serve:
+        from src.api.server import serve
+
+        serve(host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run(
+            "src.api.main:app",
+            host=args.host or "0.0.0.0",
+            port=args.port or 8000,
+            reload=True,
+        )
@@ -1,47 +1,90 @@
 #!/usr/bin/env python3
 """Run news ingestion: fetch, store, index in Endee."""
 
-import asyncio
+import argparse
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn
 
-from src.news_ingestion.fetcher import NewsFetcher
-from src.news_ingestion.storage import NewsStorage
-from src.vector_db.endee_client import EndeeVectorStore
+from src.news_ingestion.jobs import IngestBusyError, IngestJobs
+from src.vector_db.base import BaseVectorStore
 
 console = Console()
 
 
-async def main():
+def main(full_reindex: bool = False):
     console.print("[bold blue]News Intelligence - Ingestion Pipeline[/bold blue]\n")
 
-    with Progress(SpinnerColumn(), console=console) as progress:
-        t1 = progress.add_task("Fetching news...", total=None)
-        fetcher = NewsFetcher()
-        articles = await fetcher.fetch_all()
-        progress.update(t1, completed=True)
-        console.print(f"  [green]✓[/green] Fetched {len(articles)} articles")
-
-        t2 = progress.add_task("Storing (weekly/monthly)...", total=None)
-        storage = NewsStorage()
-        storage.save_articles(articles)
-        deleted = storage.run_auto_deletion()
-        progress.update(t2, completed=True)
-        console.print(f"  [green]✓[/green] Stored | Deleted {deleted} old buckets")
-
-        t3 = progress.add_task("Indexing in Endee...", total=None)
-        vector_store = EndeeVectorStore()
-        indexed = vector_store.upsert_articles(articles)
-        progress.update(t3, completed=True)
-        console.print(f"  [green]✓[/green] Indexed {indexed} vectors in Endee")
+    # Same jobs, stages and single-flight lock as the API's background ingest.
+    vector_store = BaseVectorStore.from_settings()
+    jobs = IngestJobs(vector_store=vector_store)
+    try:
+        with console.status("Running ingest job..."):
+            job = jobs.run_now(full_reindex=full_reindex)
+    except IngestBusyError as e:
+        console.print(f"[yellow]Another ingest is running (job {e.holder.get('job_id')}, pid {e.holder.get('pid')})[/yellow]")
+        return
 
+    if job["resumed"]:
+        console.print(f"  [dim]Resumed unfinished job {job['id']}[/dim]")
+    _print_stages(job["stages"], vector_store)
+
+    if job["status"] != "succeeded":
+        console.print(f"\n[bold red]Ingestion failed:[/bold red] {job['error']}")
+        sys.exit(1)
     console.print("\n[bold green]Ingestion complete![/bold green]")
 
 
+def _print_stages(stages: dict, vector_store: BaseVectorStore) -> None:
+    fetch, dedup, index = stages["fetch"], stages["dedup"], stages["index"]
+    store, retention = stages["store"], stages["retention"]
+    if fetch["status"] == "done":
+        console.print(
+            f"  [green]✓[/green] Fetched {fetch['articles']} articles from {fetch['feeds']} feeds "
+            f"in {fetch['seconds']}s ({fetch['skipped']} unchanged, {fetch['failed']} failed)"
+        )
+        for feed in fetch.get("errors", []):
+            console.print(f"    [yellow]![/yellow] {feed['url']}: {feed['error']}")
+    if dedup["status"] == "done" and dedup.get("enabled", True):
+        console.print(
+            f"  [green]✓[/green] Deduplicated: {dedup['duplicates']} near-duplicates, "
+            f"{dedup['new_stories']} new stories, {dedup['coverage_grown']} with wider coverage"
+        )
+    if store["status"] == "done":
+        console.print(f"  [green]✓[/green] Stored {store['articles']} articles (weekly/monthly)")
+    if retention["status"] == "done":
+        console.print(
+            f"  [green]✓[/green] Retention: deleted {retention['deleted_buckets']} old buckets, "
+            f"{retention['dropped_partitions']} old index partitions"
+        )
+    if index["status"] != "done":
+        return
+    console.print(
+        f"  [green]✓[/green] Indexed {index['indexed']} vectors in Endee "
+        f"({index['skipped_unchanged']} already up to date)"
+    )
+    for b in vector_store.last_upsert_stats:
+        console.print(
+            f"    [dim]batch {b['batch']}: {b['size']} articles | "
+            f"encode {b['encode_seconds']}s ({b['encode_per_sec']}/s) | upsert {b['upsert_seconds']}s[/dim]"
+        )
+    cache = vector_store.embedding_cache_stats()
+    if "hits" in cache:
+        console.print(
+            f"  [green]✓[/green] Embedding cache: {cache['hits']} hits / {cache['misses']} misses "
+            f"({cache['hit_ratio']:.0%})"
+        )
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--full-reindex",
+        action="store_true",
+        help="Re-embed and re-upload every stored article (e.g. after changing EMBEDDING_MODEL)",
+    )
+    args = parser.parse_args()
+    main(full_reindex=args.full_reindex)
@@ -4,14 +4,14 @@ from typing import Optional
 
 from src.rag.pipeline import RAGPipeline
 from src.recommendations.engine import RecommendationEngine
-from src.vector_db.endee_client import EndeeVectorStore
+from src.vector_db.base import BaseVectorStore
 
 
 class NewsIntelligenceAgent:
     """Agent that orchestrates search, RAG, and recommendations."""
 
     def __init__(self):
-        self.vector_store = EndeeVectorStore()
+        self.vector_store = BaseVectorStore.from_settings()
         self.rag = RAGPipeline(vector_store=self.vector_store)
         self.recommender = RecommendationEngine(vector_store=self.vector_store)
 
@@ -40,10 +40,42 @@ class NewsIntelligenceAgent:
             return {"task": "recommend", "recommendations": recs}
 
         if task_lower == "summarize" and query:
-            answer = self.rag.ask(
-                f"Summarize the main points and key takeaways from news about: {query}",
-                top_k=8,
-            )
+            answer = self.rag.ask(self._summarize_prompt(query), top_k=8)
             return {"task": "summarize", **answer}
 
+        return self._unknown(task)
+
+    async def run_workflow_async(
+        self,
+        task: str,
+        query: Optional[str] = None,
+        user_interests: Optional[list[str]] = None,
+    ) -> dict:
+        """Async variant of ``run_workflow`` for request handlers."""
+        task_lower = task.strip().lower()
+
+        if task_lower == "search" and query:
+            results = await self.vector_store.semantic_search_async(query, top_k=10)
+            return {"task": "search", "results": results}
+
+        if task_lower == "ask" and query:
+            return {"task": "ask", **await self.rag.ask_async(query, top_k=5)}
+
+        if task_lower == "recommend":
+            interests = user_interests or [query or "technology"]
+            recs = await self.recommender.recommend_async(interests, top_k=10)
+            return {"task": "recommend", "recommendations": recs}
+
+        if task_lower == "summarize" and query:
+            answer = await self.rag.ask_async(self._summarize_prompt(query), top_k=8)
+            return {"task": "summarize", **answer}
+
+        return self._unknown(task)
+
+    @staticmethod
+    def _summarize_prompt(query: str) -> str:
+        return f"Summarize the main points and key takeaways from news about: {query}"
+
+    @staticmethod
+    def _unknown(task: str) -> dict:
         return {"task": task, "error": "Unknown task or missing query. Use: search, ask, recommend, summarize."}
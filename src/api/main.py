@@ -1,20 +1,84 @@
 """FastAPI application for News Intelligence System."""
 
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
+from config.settings import settings
 from src.agents.workflows import NewsIntelligenceAgent
-from src.news_ingestion.fetcher import NewsFetcher
-from src.news_ingestion.storage import NewsStorage
-from src.vector_db.endee_client import EndeeVectorStore
+from src.news_ingestion.article_db import SQLiteArticleStore
+from src.news_ingestion.jobs import IngestBusyError, IngestJobs
+from src.observability import metrics
+
+logger = logging.getLogger(__name__)
+
+
+warmup_state: dict = {"ready": False, "seconds": None, "components": {}}
+
+
+def warmup() -> dict:
+    """Load the embedding model, resolve the vector index and load the Ollama model.
+
+    The service is ready once the vector store is warm; an unreachable Ollama
+    only affects ``/ask`` and is reported without blocking readiness.
+    """
+    started = time.perf_counter()
+    components = {}
+    for name, step in (("vector_store", agent.vector_store.warmup), ("llm", agent.rag.llm.warmup)):
+        t0 = time.perf_counter()
+        try:
+            step()
+            components[name] = {"ok": True, "seconds": round(time.perf_counter() - t0, 3)}
+        except Exception as e:
+            # Keep serving; the index handle is resolved again on first use.
+            logger.warning("%s warmup failed: %s", name, e)
+            components[name] = {"ok": False, "error": str(e)}
+    warmup_state.update(
+        ready=components["vector_store"]["ok"],
+        seconds=round(time.perf_counter() - started, 3),
+        components=components,
+    )
+    return warmup_state
+
+
+def reset_after_fork() -> None:
+    """Called in each pre-forked worker before it starts serving."""
+    agent.vector_store.after_fork()
+    metrics.start_worker()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up before serving requests (already done by the parent in pre-fork mode).
+
+    Also runs the ingest scheduler when ``INGEST_SCHEDULE_MINUTES`` is set.
+    """
+    if not warmup_state["ready"]:
+        warmup()
+    scheduler = None
+    if settings.ingest_schedule_minutes > 0:
+        scheduler = asyncio.create_task(get_ingest_jobs().run_schedule(settings.ingest_schedule_minutes))
+    yield
+    if scheduler is not None:
+        scheduler.cancel()
+
 
 app = FastAPI(
     title="News Intelligence System",
     description="AI-powered news with semantic search, RAG, and recommendations",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,16 +87,65 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+app.add_middleware(metrics.ServerTimingMiddleware)
 
 agent = NewsIntelligenceAgent()
 
 
-class SearchRequest(BaseModel):
+@lru_cache
+def get_ingest_jobs() -> IngestJobs:
+    """Shared background ingest runner; indexes through the agent's vector store."""
+    return IngestJobs(vector_store=agent.vector_store)
+
+
+@lru_cache
+def get_article_store() -> Optional[SQLiteArticleStore]:
+    """Shared SQLite article store, or None when disabled."""
+    return SQLiteArticleStore() if settings.article_db_enabled else None
+
+
+def published_since(days: Optional[int]) -> Optional[str]:
+    """ISO lower bound for ``published_at``, rounded to the hour so repeated queries hit the cache."""
+    if not days:
+        return None
+    return (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%dT%H:00:00")
+
+
+def hydrate_results(results: list[dict]) -> list[dict]:
+    """Attach the full stored article to each search hit, where available."""
+    store = get_article_store()
+    if store is None:
+        return results
+    articles = store.get_many([r["id"] for r in results])
+    return [{**r, "article": articles.get(r["id"])} for r in results]
+
+
+class SearchQuery(BaseModel):
     query: str
     top_k: int = 10
     category: Optional[str] = None
     country: Optional[str] = None
+    days: Optional[int] = None  # only articles published in the last N days
+
+    def search_kwargs(self) -> dict:
+        return {
+            "query": self.query,
+            "top_k": self.top_k,
+            "category": self.category,
+            "country": self.country,
+            "since": published_since(self.days),
+        }
+
+
+class SearchRequest(SearchQuery):
+    hydrate: bool = False
+
+
+class BatchSearchRequest(BaseModel):
+    queries: list[SearchQuery]
+    hydrate: bool = False
 
 
 class AskRequest(BaseModel):
@@ -46,6 +159,15 @@ class RecommendRequest(BaseModel):
     category: Optional[str] = None
 
 
+class UserInterestsRequest(BaseModel):
+    interests: list[str]
+    weights: Optional[dict[str, float]] = None  # omitted interests keep their current weight
+
+
+class UserClickRequest(BaseModel):
+    article_id: str
+
+
 @app.get("/")
 def root():
     return {"message": "News Intelligence System API", "docs": "/docs"}
@@ -56,28 +178,104 @@ def health():
     return {"status": "ok"}
 
 
-@app.post("/search")
-def semantic_search(req: SearchRequest):
-    """Semantic search over news using Endee."""
-    results = agent.vector_store.semantic_search(
-        query=req.query,
-        top_k=req.top_k,
-        category=req.category,
-        country=req.country,
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once the model is loaded and the vector index is reachable."""
+    if not warmup_state["ready"]:
+        await asyncio.to_thread(warmup)
+    return JSONResponse(
+        {"pid": os.getpid(), **warmup_state},
+        status_code=200 if warmup_state["ready"] else 503,
     )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Stage latency histograms and request latencies in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/llm/stats")
+def llm_stats():
+    """Ollama client concurrency, queue depth and coalescing counters."""
+    return agent.rag.llm.stats()
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Hit ratios and approximate memory use of the query, result, embedding and answer caches."""
+    stats = agent.vector_store.cache_stats()
+    if agent.rag.answer_cache is not None:
+        stats["answers"] = agent.rag.answer_cache.stats()
+    return stats
+
+
+@app.post("/search")
+async def semantic_search(req: SearchRequest):
+    """Semantic search over news using the configured vector store."""
+    results = await agent.vector_store.semantic_search_async(**req.search_kwargs())
+    if req.hydrate:
+        results = await asyncio.to_thread(hydrate_results, results)
     return {"query": req.query, "results": results}
 
 
+@app.post("/search/batch")
+async def batch_search(req: BatchSearchRequest):
+    """Many semantic searches in one call (e.g. watchlists); results are in input order."""
+    if len(req.queries) > settings.batch_search_max_queries:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.batch_search_max_queries} queries per batch (BATCH_SEARCH_MAX_QUERIES)",
+        )
+
+    batches = await agent.vector_store.batch_search_async([q.search_kwargs() for q in req.queries])
+    if req.hydrate:
+        batches = await asyncio.to_thread(lambda: [hydrate_results(results) for results in batches])
+    return {"results": [{"query": q.query, "results": results} for q, results in zip(req.queries, batches)]}
+
+
+@app.get("/articles")
+def list_articles(
+    category: Optional[str] = None,
+    country: Optional[str] = None,
+    source: Optional[str] = None,
+    days: Optional[int] = Query(None, description="Only articles published in the last N days"),
+    limit: int = Query(100, le=1000),
+):
+    """Query stored articles by metadata (served from the local SQLite store)."""
+    store = get_article_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Article store disabled (ARTICLE_DB_ENABLED=false)")
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    articles = store.query(category=category, country=country, source=source, since=since, limit=limit)
+    return {"count": len(articles), "articles": articles}
+
+
 @app.post("/ask")
-def rag_ask(req: AskRequest):
+async def rag_ask(req: AskRequest):
     """RAG: ask questions answered from news context."""
-    return agent.rag.ask(req.query, top_k=req.top_k)
+    return await agent.rag.ask_async(req.query, top_k=req.top_k)
+
+
+@app.post("/ask/stream")
+async def rag_ask_stream(req: AskRequest):
+    """RAG over Server-Sent Events: a ``sources`` event first, then ``token`` events, then ``done``."""
+
+    async def events():
+        async for event, data in agent.rag.ask_stream_async(req.query, top_k=req.top_k):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/recommend")
-def recommend(req: RecommendRequest):
+async def recommend(req: RecommendRequest):
     """Get personalized news recommendations."""
-    recs = agent.recommender.recommend(
+    recs = await agent.recommender.recommend_async(
         user_interests=req.interests,
         top_k=req.top_k,
         category=req.category,
@@ -85,29 +283,85 @@ def recommend(req: RecommendRequest):
     return {"recommendations": recs}
 
 
+@app.put("/users/{user_id}/interests")
+async def set_user_interests(user_id: str, req: UserInterestsRequest):
+    """Create or update a user profile; only interests new to the profile are embedded."""
+    profile = await asyncio.to_thread(agent.recommender.update_interests, user_id, req.interests, req.weights)
+    return agent.recommender.profiles.summary(profile)
+
+
+@app.post("/users/{user_id}/clicks")
+async def record_user_click(user_id: str, req: UserClickRequest):
+    """Fold a clicked article into the user's profile; it is no longer recommended to them."""
+    store = get_article_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Article store disabled (ARTICLE_DB_ENABLED=false)")
+    article = (await asyncio.to_thread(store.get_many, [req.article_id])).get(req.article_id)
+    if article is None:
+        raise HTTPException(status_code=404, detail="Unknown article")
+    profile = await asyncio.to_thread(agent.recommender.record_click, user_id, article)
+    return agent.recommender.profiles.summary(profile)
+
+
+@app.get("/users/{user_id}/profile")
+def get_user_profile(user_id: str):
+    """Interests with their (click-adjusted) weights and click count."""
+    profile = agent.recommender.profiles.get(user_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Unknown user")
+    return agent.recommender.profiles.summary(profile)
+
+
+@app.delete("/users/{user_id}")
+def delete_user_profile(user_id: str):
+    if not agent.recommender.profiles.delete(user_id):
+        raise HTTPException(status_code=404, detail="Unknown user")
+    return {"deleted": user_id}
+
+
+@app.get("/users/{user_id}/recommendations")
+async def recommend_for_user(user_id: str, top_k: int = Query(10, le=100), category: Optional[str] = None):
+    """Recommendations from the stored profile vectors (no query embedding on this path)."""
+    recs = await agent.recommender.recommend_for_user_async(user_id, top_k=top_k, category=category)
+    if recs is None:
+        raise HTTPException(status_code=404, detail="Unknown user")
+    return {"user_id": user_id, "recommendations": recs}
+
+
 @app.post("/workflow")
-def run_workflow(
+async def run_workflow(
     task: str = Query(..., description="search, ask, recommend, summarize"),
     query: Optional[str] = None,
 ):
     """Agentic workflow - route to appropriate handler."""
-    return agent.run_workflow(task=task, query=query)
-
-
-@app.post("/ingest")
-async def ingest_news():
-    """Fetch news from free API, store, and index in Endee."""
-    fetcher = NewsFetcher()
-    storage = NewsStorage()
-    vector_store = EndeeVectorStore()
-
-    articles = await fetcher.fetch_all()
-    storage.save_articles(articles)
-    deleted = storage.run_auto_deletion()
-    indexed = vector_store.upsert_articles(articles)
-
-    return {
-        "fetched": len(articles),
-        "indexed": indexed,
-        "deleted_old_buckets": deleted,
-    }
+    return await agent.run_workflow_async(task=task, query=query)
+
+
+@app.post("/ingest", status_code=202)
+async def ingest_news(
+    full_reindex: bool = Query(False, description="Re-index every stored article, e.g. after a model change"),
+):
+    """Start a background ingest (fetch, dedup, store, retention, index); poll ``/ingest/{job_id}`` for progress.
+
+    An unfinished earlier job is resumed from its last checkpoint instead.
+    """
+    try:
+        job = get_ingest_jobs().start(full_reindex=full_reindex)
+    except IngestBusyError as e:
+        raise HTTPException(status_code=409, detail={"error": str(e), "job_id": e.holder.get("job_id")})
+    return {"job_id": job["id"], "status": job["status"], "resumed": job["resumed"], "url": f"/ingest/{job['id']}"}
+
+
+@app.get("/ingest")
+def list_ingest_jobs(limit: int = Query(20, le=100)):
+    """Recent ingest jobs, newest first."""
+    return {"jobs": get_ingest_jobs().recent(limit=limit)}
+
+
+@app.get("/ingest/{job_id}")
+def ingest_status(job_id: str):
+    """Per-stage status, counts and durations of an ingest job."""
+    job = get_ingest_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown ingest job")
+    return job
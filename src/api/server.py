@@ -0,0 +1,132 @@
+"""Pre-fork production server - warm up once, then fork workers that share the model."""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Optional
+
+import uvicorn
+
+from config.settings import settings
+from src.observability import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _limit_torch_threads(workers: int) -> None:
+    """Give each worker its share of the cores instead of all of them.
+
+    Must run in the parent before warmup: torch sizes its OpenMP pool from
+    ``OMP_NUM_THREADS`` when it is first used, and a pool started before the
+    fork cannot be safely resized in the children.
+    """
+    share = max(1, (os.cpu_count() or 1) // workers)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(var, str(share))
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(share)
+
+
+def _run_worker(sock: socket.socket) -> None:
+    """Child process: drop inherited connections, then serve on the shared socket."""
+    from src.api import main
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    main.reset_after_fork()
+    uvicorn.Server(uvicorn.Config(main.app)).run(sockets=[sock])
+
+
+def _spawn(sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(sock)
+        except BaseException:
+            logger.exception("Worker crashed")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve(host: Optional[str] = None, port: Optional[int] = None, workers: Optional[int] = None) -> None:
+    """Warm up in this process, then fork ``workers`` uvicorn workers on one listening socket.
+
+    The embedding model, index handle and Ollama model are loaded before the
+    fork, so workers share the model weights copy-on-write and are ready as
+    soon as they start. Dead workers are replaced; SIGTERM/SIGINT stop all of
+    them. Platforms without ``fork`` (Windows) fall back to one process.
+    """
+    host = host or settings.api_host
+    port = port or settings.api_port
+    workers = workers or settings.api_workers or os.cpu_count() or 1
+    forking = hasattr(os, "fork") and workers > 1
+
+    # Before importing the app and warming up: warmup runs the model, which starts
+    # torch's OpenMP pool at the size the workers inherit.
+    if forking:
+        _limit_torch_threads(workers)
+
+    from src.api import main
+
+    started = time.perf_counter()
+    state = main.warmup()
+    logger.info("Warmup finished in %.2fs: %s", time.perf_counter() - started, state["components"])
+
+    if not forking:
+        uvicorn.run(main.app, host=host, port=port)
+        return
+
+    sock = _bind(host, port)
+    metrics.prepare_multiprocess()
+    # Keep the warmed-up heap out of the GC's reach so collections in the
+    # workers do not touch (and copy) the shared pages.
+    gc.collect()
+    gc.freeze()
+
+    children = {_spawn(sock) for _ in range(workers)}
+    logger.info("Serving on %s:%d with %d workers (pids %s)", host, port, workers, sorted(children))
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            logger.warning("Worker %d exited with status %d; restarting", pid, status)
+            time.sleep(1)
+            children.add(_spawn(sock))
+    sock.close()
@@ -1,5 +1,7 @@
 """Embeddings module - sentence transformers for vector encoding."""
 
+from src.embeddings.batcher import BatchingEncoder
+from src.embeddings.cache import EmbeddingCache, shared_cache
 from src.embeddings.encoder import EmbeddingEncoder
 
-__all__ = ["EmbeddingEncoder"]
+__all__ = ["BatchingEncoder", "EmbeddingCache", "EmbeddingEncoder", "shared_cache"]
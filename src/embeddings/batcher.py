@@ -0,0 +1,101 @@
+"""Micro-batching query encoder - one forward pass for many concurrent requests."""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional
+
+from config.settings import settings
+
+
+class BatchingEncoder:
+    """Coalesces single-text encode calls from concurrent requests into batches.
+
+    Callers submit one text and get a ``Future``. A worker thread takes the
+    first waiting text, collects more for up to ``max_wait_ms`` or until
+    ``max_batch`` texts are queued, then runs a single ``encoder.encode`` over
+    the distinct texts and resolves every caller's future. While a batch is
+    encoding, new requests queue up and form the next batch, so under load
+    batches fill without waiting and an idle service adds at most
+    ``max_wait_ms`` of latency.
+    """
+
+    def __init__(self, encoder, max_batch: Optional[int] = None, max_wait_ms: Optional[float] = None):
+        self.encoder = encoder
+        self.max_batch = max_batch or settings.query_batch_max_size
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.query_batch_max_wait_ms) / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "encoded": 0, "max_batch_seen": 0, "encode_seconds": 0.0}
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread (again, if we are in a forked child)."""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._work, name="query-encoder", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for encoding; the future resolves to its vector."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, text: str) -> list[float]:
+        """Encode one text, batched with whatever else is in flight."""
+        return self.submit(text).result()
+
+    def _collect(self) -> list[tuple[str, Future]]:
+        """Block for one request, then gather more until the batch is full or the wait expires."""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self) -> None:
+        while True:
+            batch = self._collect()
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            t0 = time.perf_counter()
+            try:
+                vectors = dict(zip(texts, self.encoder.encode(texts, batch_size=self.max_batch)))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self._stats["encode_seconds"] += time.perf_counter() - t0
+            self._stats["requests"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["encoded"] += len(texts)
+            self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(batch))
+            for text, future in batch:
+                future.set_result(vectors[text])
+
+    def stats(self) -> dict:
+        """Batch counts and average batch size."""
+        stats = dict(self._stats)
+        batches = stats["batches"]
+        stats["avg_batch_size"] = round(stats["requests"] / batches, 2) if batches else 0.0
+        stats["avg_encode_ms"] = round(1000 * stats.pop("encode_seconds") / batches, 2) if batches else 0.0
+        stats["queued"] = self._queue.qsize()
+        stats["max_batch"] = self.max_batch
+        stats["max_wait_ms"] = self.max_wait * 1000
+        return stats
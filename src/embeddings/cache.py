@@ -0,0 +1,345 @@
+"""Persistent embedding cache - skip re-encoding text that was already embedded."""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+from config.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+FORMAT_VERSION = 2
+
+
+class _FileLock:
+    """Exclusive lock between processes on a lock file (``flock`` on POSIX, ``msvcrt`` on Windows)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 s; keep waiting
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._fd)
+        self._fd = None
+
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by model name + hash of the embedded text.
+
+    Vectors live in a memory-mapped float16/float32 matrix and their keys in a
+    memory-mapped key array, both shared by every process that opens the
+    cache. The matrix is sized from ``max_mb``; the least recently used
+    entries are evicted when it fills.
+
+    Any number of readers may look vectors up. Writes happen only inside
+    ``writer()``, which holds a file lock across processes and starts from
+    the current on-disk state. A writer clears a slot's key before
+    overwriting its vector, and readers re-check the key after copying the
+    vector, so a reader never returns a vector of another text. Use
+    ``shared_cache`` to get the one instance per process for a model.
+    """
+
+    EVICT_FRACTION = 0.1  # share of slots freed per eviction pass
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Optional[str] = None,
+        max_mb: Optional[int] = None,
+        dtype: Optional[str] = None,
+    ):
+        self.model_name = model_name
+        self.cache_dir = Path(cache_dir or settings.embedding_cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = (max_mb or settings.embedding_cache_max_mb) * 1024 * 1024
+        self.dtype = np.dtype(dtype or settings.embedding_cache_dtype)
+
+        slug = model_name.replace("/", "__")
+        self._meta_path = self.cache_dir / f"{slug}.json"
+        self._vectors_path = self.cache_dir / f"{slug}.vectors"
+        self._keys_path = self.cache_dir / f"{slug}.keys"
+        self._ticks_path = self.cache_dir / f"{slug}.ticks.npy"
+        self._file_lock = _FileLock(self.cache_dir / f"{slug}.lock")
+
+        self.dimension: Optional[int] = None
+        self._vectors: Optional[np.memmap] = None
+        self._keys: Optional[np.memmap] = None
+        self._ticks: Optional[np.ndarray] = None  # only loaded while writing
+        self._slots: dict[bytes, int] = {}
+        self._free: list[int] = []
+        self._tick = 0
+        self._meta_mtime: Optional[int] = None
+        self._keys_mtime: Optional[int] = None
+        self._lock = threading.RLock()  # guards the in-memory state
+        self._write_lock = threading.Lock()  # one writer per process; the file lock covers other processes
+        self._writer_thread: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        with self._lock:
+            self._sync()
+
+    def _key(self, text: str) -> bytes:
+        """Cache key for a text under this model."""
+        digest = hashlib.blake2b(f"{self.model_name}\0{text}".encode(), digest_size=16)
+        return digest.hexdigest().encode()
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _close(self) -> None:
+        self._vectors = self._keys = None
+        self.dimension = None
+        self._slots = {}
+        self._meta_mtime = self._keys_mtime = None
+
+    def _open(self) -> None:
+        """Map the cache files if they exist and match this model and dtype."""
+        self._close()
+        meta_mtime = self._mtime(self._meta_path)
+        if meta_mtime is None:
+            return
+        try:
+            with open(self._meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if (
+                meta.get("version") != FORMAT_VERSION
+                or meta.get("model") != self.model_name
+                or meta.get("dtype") != self.dtype.name
+            ):
+                return  # incompatible; the next writer recreates it
+            dim, capacity = int(meta["dimension"]), int(meta["capacity"])
+            self._vectors = np.memmap(self._vectors_path, dtype=self.dtype, mode="r+", shape=(capacity, dim))
+            self._keys = np.memmap(self._keys_path, dtype="S32", mode="r+", shape=(capacity,))
+        except (OSError, ValueError, KeyError):
+            self._close()
+            return
+        self.dimension = dim
+        self._meta_mtime = meta_mtime
+        self._index_keys()
+
+    def _index_keys(self) -> None:
+        """Rebuild the key -> slot map from the shared key array."""
+        self._keys_mtime = self._mtime(self._keys_path)
+        keys = np.array(self._keys)
+        self._slots = {bytes(keys[slot]): int(slot) for slot in np.flatnonzero(keys != b"")}
+
+    def _sync(self) -> None:
+        """Pick up what other instances wrote: a recreated cache, or new entries after a flush."""
+        if self._mtime(self._meta_path) != self._meta_mtime:
+            self._open()
+        elif self._keys is not None and self._mtime(self._keys_path) != self._keys_mtime:
+            self._index_keys()
+
+    def _create(self, dimension: int) -> None:
+        """Allocate new cache files for an embedding dimension (under the file lock).
+
+        Files are written under temporary names and swapped in, so other
+        processes keep their old mapping until they notice the new metadata.
+        """
+        capacity = max(1, self.max_bytes // (dimension * self.dtype.itemsize))
+        tmp_vectors = self._vectors_path.with_suffix(".vectors.tmp")
+        tmp_keys = self._keys_path.with_suffix(".keys.tmp")
+        np.memmap(tmp_vectors, dtype=self.dtype, mode="w+", shape=(capacity, dimension)).flush()
+        np.memmap(tmp_keys, dtype="S32", mode="w+", shape=(capacity,)).flush()
+        os.replace(tmp_vectors, self._vectors_path)
+        os.replace(tmp_keys, self._keys_path)
+        self._ticks_path.unlink(missing_ok=True)
+        self._write_atomic(
+            self._meta_path,
+            json.dumps({
+                "version": FORMAT_VERSION,
+                "model": self.model_name,
+                "dtype": self.dtype.name,
+                "dimension": dimension,
+                "capacity": capacity,
+            }).encode(),
+        )
+        self._open()
+
+    def _load_ticks(self) -> None:
+        """LRU ticks (writer-only state) and the free slots, from the current files."""
+        capacity = len(self._keys)
+        try:
+            ticks = np.load(self._ticks_path)
+            if ticks.shape != (capacity,):
+                raise ValueError("ticks do not match the cache")
+        except (OSError, ValueError):
+            ticks = np.zeros(capacity, dtype=np.int64)
+        keys = np.array(self._keys)
+        ticks[keys == b""] = 0
+        self._ticks = ticks
+        self._tick = int(ticks.max()) if capacity else 0
+        self._free = np.flatnonzero(keys == b"")[::-1].tolist()
+
+    @contextmanager
+    def writer(self) -> Iterator["EmbeddingCache"]:
+        """Hold the cache's write lock (in this process and across processes).
+
+        ``put_many`` is only allowed inside. Everything written is flushed and
+        published to other instances when the block exits.
+        """
+        with self._write_lock:
+            self._file_lock.acquire()
+            self._writer_thread = threading.get_ident()
+            try:
+                with self._lock:
+                    self._sync()
+                    if self._keys is not None:
+                        self._load_ticks()
+                try:
+                    yield self
+                finally:
+                    with self._lock:
+                        self._flush()
+                        self._ticks = None
+                        self._free = []
+            finally:
+                self._writer_thread = None
+                self._file_lock.release()
+
+    def _evict(self) -> None:
+        """Free the least recently used slots."""
+        n = max(1, int(len(self._ticks) * self.EVICT_FRACTION))
+        for slot in np.argpartition(self._ticks, n - 1)[:n]:
+            self._slots.pop(bytes(self._keys[slot]), None)
+            self._keys[slot] = b""
+            self._ticks[slot] = 0
+            self._free.append(int(slot))
+
+    def get_many(self, texts: list[str]) -> list[Optional[list[float]]]:
+        """Look up cached vectors; ``None`` marks a miss."""
+        results: list[Optional[list[float]]] = []
+        with self._lock:
+            self._sync()
+            for text in texts:
+                key = self._key(text)
+                slot = self._slots.get(key)
+                vector = None
+                if slot is not None:
+                    vector = np.array(self._vectors[slot], dtype=np.float32)
+                    if self._keys[slot] != key:
+                        # Slot was reused by a writer in another process since we indexed it.
+                        self._slots.pop(key, None)
+                        vector = None
+                if vector is None:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                self.hits += 1
+                if self._ticks is not None:
+                    self._tick += 1
+                    self._ticks[slot] = self._tick
+                results.append(vector.tolist())
+        return results
+
+    def put_many(self, texts: list[str], vectors: list[list[float]]) -> None:
+        """Store vectors for texts, evicting old entries if the cache is full. Only inside ``writer()``."""
+        if not texts:
+            return
+        arr = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self._writer_thread != threading.get_ident():
+                raise RuntimeError("EmbeddingCache.put_many outside writer()")
+            if self._vectors is None or arr.shape[1] != self.dimension:
+                self._create(arr.shape[1])
+                self._load_ticks()
+            for text, vec in zip(texts, arr):
+                key = self._key(text)
+                slot = self._slots.get(key)
+                if slot is None:
+                    if not self._free:
+                        self._evict()
+                    slot = self._free.pop()
+                    self._slots[key] = slot
+                # Clear the key first: readers elsewhere re-check it after copying the vector.
+                self._keys[slot] = b""
+                self._vectors[slot] = vec
+                self._keys[slot] = key
+                self._tick += 1
+                self._ticks[slot] = self._tick
+
+    def _flush(self) -> None:
+        """Persist vectors, keys and LRU ticks, and tell other instances to re-index their keys."""
+        if self._vectors is None or self._ticks is None:
+            return
+        self._vectors.flush()
+        self._keys.flush()
+        tmp = self._ticks_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, self._ticks)
+        os.replace(tmp, self._ticks_path)
+        os.utime(self._keys_path)
+        self._keys_mtime = self._mtime(self._keys_path)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and size of the cache."""
+        lookups = self.hits + self.misses
+        capacity = len(self._keys) if self._keys is not None else 0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._slots),
+            "capacity": capacity,
+            "bytes": capacity * (self.dimension or 0) * self.dtype.itemsize,
+        }
+
+
+_shared: dict[tuple[int, str, str], EmbeddingCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_cache(model_name: str, cache_dir: Optional[str] = None) -> EmbeddingCache:
+    """The process-wide cache for a model and cache directory.
+
+    Every encoder in a process uses the same instance, so their reads and
+    writes go through one set of locks and one view of the slots. Keyed by
+    pid as well, so a forked worker opens its own mappings.
+    """
+    path = str(Path(cache_dir or settings.embedding_cache_dir).resolve())
+    key = (os.getpid(), path, model_name)
+    with _shared_lock:
+        cache = _shared.get(key)
+        if cache is None:
+            cache = _shared[key] = EmbeddingCache(model_name, cache_dir=path)
+        return cache
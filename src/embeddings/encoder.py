@@ -1,16 +1,36 @@
 """Embedding encoder using sentence-transformers (free, local)."""
 
-from typing import Optional
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Iterator, Optional
 
 from config.settings import settings
+from src.observability.metrics import timed
+
+
+@lru_cache
+def _cpu_executor(pid: int) -> ThreadPoolExecutor:
+    workers = settings.encode_workers or os.cpu_count() or 1
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="encode")
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """Executor for CPU-bound encoding, sized to the cores (one per process, fork-safe)."""
+    return _cpu_executor(os.getpid())
 
 
 class EmbeddingEncoder:
     """Encodes text to vectors using sentence-transformers."""
 
-    def __init__(self, model_name: Optional[str] = None):
+    def __init__(self, model_name: Optional[str] = None, use_cache: Optional[bool] = None):
         self.model_name = model_name or settings.embedding_model
         self._model = None
+        self._use_cache = settings.embedding_cache_enabled if use_cache is None else use_cache
 
     @property
     def model(self):
@@ -20,14 +40,90 @@ class EmbeddingEncoder:
             self._model = SentenceTransformer(self.model_name)
         return self._model
 
+    @property
+    def cache(self):
+        """This process's shared on-disk embedding cache for the model (None when disabled)."""
+        if not self._use_cache:
+            return None
+        from src.embeddings.cache import shared_cache
+        return shared_cache(self.model_name)
+
     @property
     def dimension(self) -> int:
-        """Vector dimension from model."""
+        """Vector dimension from model (or the cache, to avoid loading the model)."""
+        if self._model is None and self.cache is not None and self.cache.dimension:
+            return self.cache.dimension
         return self.model.get_sentence_embedding_dimension()
 
-    def encode(self, texts: str | list[str]) -> list[list[float]]:
-        """Encode text(s) to vectors."""
+    def warmup(self) -> None:
+        """Load the model and run one forward pass (bypassing the cache)."""
+        self._encode_model(["warmup"])
+
+    def _encode_model(self, texts: list[str], batch_size: Optional[int] = None) -> list[list[float]]:
+        """Run the sentence-transformer on texts."""
+        vectors = self.model.encode(
+            texts,
+            batch_size=batch_size or settings.embedding_batch_size,
+            convert_to_numpy=True,
+        )
+        return vectors.tolist()
+
+    def encode(
+        self,
+        texts: str | list[str],
+        batch_size: Optional[int] = None,
+        store: bool = False,
+    ) -> list[list[float]]:
+        """Encode text(s) to vectors, serving cached embeddings where possible.
+
+        Only ``encode_batches`` (article indexing) passes ``store``; query and
+        context encodes read the cache but never fill it.
+        """
         if isinstance(texts, str):
             texts = [texts]
-        vectors = self.model.encode(texts, convert_to_numpy=True)
-        return vectors.tolist()
+        cache = self.cache
+        if cache is None:
+            with timed("encode", "model"):
+                return self._encode_model(texts, batch_size)
+
+        with timed("encode", "cache_lookup"):
+            vectors = cache.get_many(texts)
+            missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            with timed("encode", "model"):
+                computed = self._encode_model([texts[i] for i in missing], batch_size)
+            if store:
+                cache.put_many([texts[i] for i in missing], computed)
+            for i, vec in zip(missing, computed):
+                vectors[i] = vec
+        return vectors
+
+    async def encode_async(self, texts: str | list[str], batch_size: Optional[int] = None) -> list[list[float]]:
+        """``encode`` on the CPU executor, so the event loop is never blocked by the model."""
+        loop = asyncio.get_running_loop()
+        # Carry the request context over so the encode shows up in its Server-Timing.
+        run = contextvars.copy_context().run
+        return await loop.run_in_executor(get_cpu_executor(), run, self.encode, texts, batch_size)
+
+    def cache_stats(self) -> dict:
+        """Embedding cache hit/miss counters."""
+        return self.cache.stats() if self.cache is not None else {"enabled": False}
+
+    def encode_batches(
+        self,
+        texts: list[str],
+        batch_size: Optional[int] = None,
+    ) -> Iterator[tuple[int, list[list[float]], float]]:
+        """Encode texts chunk by chunk, yielding (offset, vectors, seconds) per chunk.
+
+        New embeddings are written to the cache under its write lock, which is
+        held until the generator finishes and then flushed.
+        """
+        batch_size = batch_size or settings.embedding_batch_size
+        cache = self.cache
+        with cache.writer() if cache is not None else nullcontext():
+            for start in range(0, len(texts), batch_size):
+                chunk = texts[start : start + batch_size]
+                t0 = time.perf_counter()
+                vectors = self.encode(chunk, batch_size=batch_size, store=cache is not None)
+                yield start, vectors, time.perf_counter() - t0
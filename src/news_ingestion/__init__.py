@@ -1,6 +1,21 @@
 """News ingestion module - fetch from free APIs and manage storage."""
 
+from src.news_ingestion.article_db import SQLiteArticleStore
+from src.news_ingestion.dedup import NearDuplicateIndex
+from src.news_ingestion.feed_cache import FeedStateCache
 from src.news_ingestion.fetcher import NewsFetcher
+from src.news_ingestion.jobs import IngestBusyError, IngestJobs, IngestLock
+from src.news_ingestion.segments import SegmentedNewsStorage
 from src.news_ingestion.storage import NewsStorage
 
-__all__ = ["NewsFetcher", "NewsStorage"]
+__all__ = [
+    "FeedStateCache",
+    "IngestBusyError",
+    "IngestJobs",
+    "IngestLock",
+    "NearDuplicateIndex",
+    "NewsFetcher",
+    "NewsStorage",
+    "SQLiteArticleStore",
+    "SegmentedNewsStorage",
+]
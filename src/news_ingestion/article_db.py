@@ -0,0 +1,134 @@
+"""SQLite article store - indexed local queries and full-content hydration."""
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from config.settings import settings
+
+COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "content",
+    "url",
+    "source",
+    "author",
+    "published_at",
+    "category",
+    "country",
+    "fetched_at",
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    {", ".join(f"{c} TEXT" for c in COLUMNS[1:])}
+);
+CREATE INDEX IF NOT EXISTS idx_articles_category ON articles(category);
+CREATE INDEX IF NOT EXISTS idx_articles_country ON articles(country);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source);
+CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles(published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_fetched_at ON articles(fetched_at);
+"""
+
+
+class SQLiteArticleStore:
+    """Stores normalized articles (``NewsFetcher._normalize_article`` shape) in SQLite.
+
+    Runs alongside the JSON buckets: answers category/country/source/date
+    queries through secondary indexes and hydrates full articles for search hits.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.article_db_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _iso(dt: datetime) -> str:
+        """Format a naive UTC datetime like stored timestamps."""
+        return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def insert_articles(self, articles: list[dict]) -> int:
+        """Bulk insert articles, ignoring IDs already stored. Returns rows inserted."""
+        rows = [tuple(a.get(c, "") for c in COLUMNS) for a in articles]
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO articles ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                rows,
+            )
+            return conn.total_changes - before
+
+    def get_many(self, article_ids: list[str]) -> dict[str, dict]:
+        """Fetch full articles by ID."""
+        if not article_ids:
+            return {}
+        found: dict[str, dict] = {}
+        with closing(self._connect()) as conn:
+            for i in range(0, len(article_ids), 500):
+                chunk = article_ids[i : i + 500]
+                rows = conn.execute(
+                    f"SELECT * FROM articles WHERE id IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                )
+                found.update({row["id"]: dict(row) for row in rows})
+        return found
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """Articles matching the filters, newest first (``since``/``until`` on published_at)."""
+        clauses, params = [], []
+        for column, value in (("category", category), ("country", country), ("source", source)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("published_at >= ?")
+            params.append(self._iso(since))
+        if until:
+            clauses.append("published_at <= ?")
+            params.append(self._iso(until))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT * FROM articles {where} ORDER BY published_at DESC LIMIT ?",
+                [*params, limit],
+            )
+            return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def delete_fetched_before(self, cutoff: datetime) -> int:
+        """Delete articles fetched before ``cutoff`` (naive UTC). Returns rows deleted."""
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute("DELETE FROM articles WHERE fetched_at < ?", (self._iso(cutoff),))
+            return cursor.rowcount
+
+    def run_retention(self) -> int:
+        """Apply the storage retention window as a date-range delete."""
+        if not settings.auto_delete_enabled:
+            return 0
+        keep = max(timedelta(weeks=settings.retention_weeks), timedelta(days=30 * settings.retention_months))
+        return self.delete_fetched_before(datetime.utcnow() - keep)
@@ -0,0 +1,264 @@
+"""Near-duplicate detection - MinHash fingerprints in a persistent SQLite LSH index."""
+
+import hashlib
+import json
+import re
+import sqlite3
+import zlib
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config.settings import settings
+
+_PRIME = (1 << 31) - 1
+_SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,60}$")  # "... - BBC News"
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS canonical (
+    id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL,
+    categories TEXT NOT NULL,
+    countries TEXT NOT NULL,
+    variants INTEGER NOT NULL DEFAULT 0,
+    first_seen TEXT NOT NULL,
+    article TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_canonical_first_seen ON canonical(first_seen);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    canonical_id TEXT NOT NULL,
+    PRIMARY KEY (band, key, canonical_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_bands_canonical ON bands(canonical_id);
+CREATE TABLE IF NOT EXISTS members (
+    id TEXT PRIMARY KEY,
+    canonical_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_members_canonical ON members(canonical_id);
+"""
+
+
+def fingerprint_text(article: dict) -> str:
+    """Title and description, lowercased, without punctuation or a trailing " - Source" tag."""
+    title = _SOURCE_SUFFIX.sub("", article.get("title") or "")
+    text = f"{title} {article.get('description') or ''}".lower()
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+class MinHasher:
+    """MinHash signatures over word shingles (universal hashing modulo a Mersenne prime).
+
+    The fraction of equal signature positions estimates the Jaccard
+    similarity of two texts' shingle sets. Seeded, so signatures stay
+    comparable across processes and runs.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        self.shingle_size = shingle_size
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        words = text.split()
+        if not words:
+            return None
+        k = min(self.shingle_size, len(words))
+        shingles = {" ".join(words[i : i + k]) for i in range(len(words) - k + 1)}
+        hashes = np.fromiter((zlib.crc32(s.encode()) % _PRIME for s in shingles), dtype=np.uint64, count=len(shingles))
+        return ((np.outer(self.a, hashes) + self.b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """Groups near-duplicate articles under one canonical ID.
+
+    The same wire story is published under several countries and categories
+    with small title or URL changes, so each variant gets its own article ID.
+    Each article's MinHash signature is split into ``BANDS`` bands; articles
+    sharing any band with a known story are candidates, and the closest
+    candidate with estimated Jaccard similarity >= ``threshold`` becomes its
+    canonical story. The variant's category and country are merged into the
+    canonical story, so one vector carries the filter coverage of all of them.
+    """
+
+    BANDS = 16
+
+    def __init__(self, path: Optional[str] = None, threshold: Optional[float] = None, num_perm: int = 64):
+        self.path = Path(path or settings.dedup_db_path)
+        self.threshold = threshold or settings.dedup_threshold
+        self.hasher = MinHasher(num_perm)
+        self.rows = num_perm // self.BANDS
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _band_keys(self, signature: np.ndarray) -> list[tuple[int, int]]:
+        bands = signature[: self.BANDS * self.rows].reshape(self.BANDS, self.rows)
+        return [
+            (i, int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "big", signed=True))
+            for i, band in enumerate(bands)
+        ]
+
+    @staticmethod
+    def _in_chunks(conn: sqlite3.Connection, sql: str, ids: list[str]) -> list[sqlite3.Row]:
+        """Run ``sql`` (with one ``{}`` for the placeholders) over ``ids`` in chunks of 500."""
+        rows = []
+        for i in range(0, len(ids), 500):
+            chunk = ids[i : i + 500]
+            rows.extend(conn.execute(sql.format(", ".join("?" for _ in chunk)), chunk))
+        return rows
+
+    def _best_match(self, conn: sqlite3.Connection, signature: np.ndarray, keys: list[tuple[int, int]]) -> Optional[str]:
+        clause = " OR ".join("(band = ? AND key = ?)" for _ in keys)
+        candidates = [
+            row[0]
+            for row in conn.execute(
+                f"SELECT DISTINCT canonical_id FROM bands WHERE {clause}", [v for key in keys for v in key]
+            )
+        ]
+        best, best_similarity = None, self.threshold
+        for row in self._in_chunks(conn, "SELECT id, signature FROM canonical WHERE id IN ({})", candidates):
+            similarity = float(np.mean(np.frombuffer(row["signature"], dtype=np.uint32) == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = row["id"], similarity
+        return best
+
+    @staticmethod
+    def _merge_coverage(conn: sqlite3.Connection, canonical_id: str, article: dict) -> bool:
+        """Add the variant's category/country to its canonical story. True if coverage grew."""
+        row = conn.execute("SELECT categories, countries FROM canonical WHERE id = ?", (canonical_id,)).fetchone()
+        categories, countries = json.loads(row["categories"]), json.loads(row["countries"])
+        grown = False
+        for values, value in ((categories, article.get("category")), (countries, article.get("country"))):
+            if value and value not in values:
+                values.append(value)
+                grown = True
+        conn.execute(
+            "UPDATE canonical SET categories = ?, countries = ?, variants = variants + 1 WHERE id = ?",
+            (json.dumps(categories), json.dumps(countries), canonical_id),
+        )
+        return grown
+
+    def assign_canonical(self, articles: list[dict]) -> dict:
+        """Set ``canonical_id`` on every article (its own ID for a new story).
+
+        Articles seen before keep their earlier assignment. Returns counts of
+        articles, near-duplicates, new stories and stories whose
+        category/country coverage grew (those need re-indexing).
+        """
+        report = {"articles": len(articles), "duplicates": 0, "new_stories": 0, "coverage_grown": 0}
+        now = datetime.utcnow().isoformat()
+        grown: set[str] = set()
+        with closing(self._connect()) as conn, conn:
+            known = {
+                row["id"]: row["canonical_id"]
+                for row in self._in_chunks(
+                    conn, "SELECT id, canonical_id FROM members WHERE id IN ({})", [a["id"] for a in articles]
+                )
+            }
+            for article in articles:
+                canonical_id = known.get(article["id"])
+                if canonical_id is None:
+                    signature = self.hasher.signature(fingerprint_text(article))
+                    if signature is None:
+                        article["canonical_id"] = article["id"]
+                        continue
+                    keys = self._band_keys(signature)
+                    canonical_id = self._best_match(conn, signature, keys)
+                    if canonical_id is None:
+                        canonical_id = article["id"]
+                        conn.execute(
+                            "INSERT OR REPLACE INTO canonical (id, signature, categories, countries, first_seen, article)"
+                            " VALUES (?, ?, ?, ?, ?, ?)",
+                            (
+                                canonical_id,
+                                signature.tobytes(),
+                                json.dumps([article["category"]] if article.get("category") else []),
+                                json.dumps([article["country"]] if article.get("country") else []),
+                                now,
+                                json.dumps(article, ensure_ascii=False),
+                            ),
+                        )
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO bands (band, key, canonical_id) VALUES (?, ?, ?)",
+                            [(band, key, canonical_id) for band, key in keys],
+                        )
+                        report["new_stories"] += 1
+                    elif self._merge_coverage(conn, canonical_id, article):
+                        grown.add(canonical_id)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO members (id, canonical_id) VALUES (?, ?)", (article["id"], canonical_id)
+                    )
+                    known[article["id"]] = canonical_id
+                if canonical_id != article["id"]:
+                    report["duplicates"] += 1
+                article["canonical_id"] = canonical_id
+        report["coverage_grown"] = len(grown)
+        return report
+
+    def canonical_articles(self, articles: list[dict]) -> list[dict]:
+        """One article per canonical story, in first-seen order, for indexing.
+
+        A story with variants carries ``categories`` and ``countries`` lists
+        covering all of them. Articles without a ``canonical_id`` (stored
+        before deduplication was enabled) stand for themselves.
+        """
+        by_id = {a["id"]: a for a in articles}
+        ids = list(dict.fromkeys(a.get("canonical_id") or a["id"] for a in articles))
+        with closing(self._connect()) as conn:
+            rows = {
+                row["id"]: row
+                for row in self._in_chunks(
+                    conn, "SELECT id, article, categories, countries FROM canonical WHERE id IN ({})", ids
+                )
+            }
+        canonical = []
+        for canonical_id in ids:
+            row = rows.get(canonical_id)
+            if row is None:
+                if canonical_id in by_id:
+                    canonical.append(by_id[canonical_id])
+                continue
+            article = json.loads(row["article"])
+            categories, countries = json.loads(row["categories"]), json.loads(row["countries"])
+            # Lists only when variants added coverage, so single-variant stories index as before.
+            if len(categories) > 1 or len(countries) > 1:
+                article.update(categories=categories, countries=countries)
+            canonical.append(article)
+        return canonical
+
+    def stats(self) -> dict:
+        with closing(self._connect()) as conn:
+            stories, variants = conn.execute("SELECT COUNT(*), COALESCE(SUM(variants), 0) FROM canonical").fetchone()
+        return {"stories": stories, "variants": variants}
+
+    def delete_seen_before(self, cutoff: datetime) -> int:
+        """Forget stories first seen before ``cutoff`` (naive UTC). Returns stories deleted."""
+        with closing(self._connect()) as conn, conn:
+            stale = [row[0] for row in conn.execute("SELECT id FROM canonical WHERE first_seen < ?", (cutoff.isoformat(),))]
+            for i in range(0, len(stale), 500):
+                chunk = stale[i : i + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                for table, column in (("bands", "canonical_id"), ("members", "canonical_id"), ("canonical", "id")):
+                    conn.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", chunk)
+            return len(stale)
+
+    def run_retention(self) -> int:
+        """Apply the storage retention window, like ``SQLiteArticleStore.run_retention``."""
+        if not settings.auto_delete_enabled:
+            return 0
+        keep = max(timedelta(weeks=settings.retention_weeks), timedelta(days=30 * settings.retention_months))
+        return self.delete_seen_before(datetime.utcnow() - keep)
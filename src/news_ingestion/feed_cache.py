@@ -0,0 +1,86 @@
+"""Persistent feed state for conditional HTTP fetching (ETag / Last-Modified)."""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from config.settings import settings
+
+
+class FeedStateCache:
+    """Remembers HTTP validators and a body hash for each feed URL.
+
+    Used to send conditional requests and to skip feeds whose body has not
+    changed since the last successful fetch.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.feed_state_path)
+        self._state: dict[str, dict] = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                self._state = {}
+
+    @staticmethod
+    def content_hash(body: bytes) -> str:
+        """Hash of a feed body."""
+        return hashlib.sha256(body).hexdigest()
+
+    def conditional_headers(self, url: str) -> dict:
+        """If-None-Match / If-Modified-Since headers for a known feed."""
+        entry = self._state.get(url, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_unchanged(self, url: str, body_hash: str) -> bool:
+        """True if the feed body matches the last recorded one."""
+        return self._state.get(url, {}).get("sha256") == body_hash
+
+    def record(
+        self,
+        url: str,
+        body_hash: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Record the validators of a successfully processed feed."""
+        self._state[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": body_hash,
+            "updated_at": datetime.utcnow().isoformat() + "Z",
+        }
+        self._dirty = True
+
+    def commit(self, validators: dict[str, dict]) -> None:
+        """Record validators of processed feeds (``NewsFetcher.pending_validators``) and save."""
+        for url, entry in validators.items():
+            self.record(url, **entry)
+        self.save()
+
+    def clear(self) -> None:
+        """Forget all feeds so the next fetch downloads everything."""
+        self._state = {}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write state to disk atomically."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(tmp, self.path)
+        self._dirty = False
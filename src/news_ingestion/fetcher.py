@@ -1,13 +1,17 @@
 """Free News API fetcher - Saurav's NewsAPI (no API key required)."""
 
+import asyncio
 import hashlib
 import json
+import time
 from datetime import datetime
 from typing import Any, Optional
 
 import httpx
 
 from config.settings import settings
+from src.news_ingestion.feed_cache import FeedStateCache
+from src.observability.metrics import observe
 
 
 class NewsFetcher:
@@ -16,9 +20,13 @@ class NewsFetcher:
     BASE_URL = "https://saurav.tech/NewsAPI"
     COUNTRIES = ["in", "us", "gb", "au", "fr"]
     CATEGORIES = ["technology", "business", "science", "health", "sports", "entertainment", "general"]
+    SOURCES = ["bbc-news", "cnn", "fox-news", "google-news"]
 
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, feed_state: Optional[FeedStateCache] = None):
         self.base_url = base_url or settings.news_api_base
+        self.feed_state = feed_state or FeedStateCache()
+        self.last_fetch_report: dict = {}
+        self.pending_validators: dict[str, dict] = {}
 
     def _generate_id(self, article: dict) -> str:
         """Generate unique ID for article."""
@@ -41,57 +49,153 @@ class NewsFetcher:
             "fetched_at": datetime.utcnow().isoformat() + "Z",
         }
 
+    def _parse_feed(self, data: dict, category: str, country: str) -> list[dict]:
+        """Normalize the articles of a feed payload, dropping removed entries."""
+        articles = data.get("articles", [])
+        return [
+            self._normalize_article(a, category, country)
+            for a in articles
+            if a.get("title") and a.get("title") != "[Removed]"
+        ]
+
+    async def _get_json(self, url: str, client: Optional[httpx.AsyncClient] = None) -> dict:
+        """GET a feed, reusing ``client`` if given."""
+        if client is None:
+            async with httpx.AsyncClient(timeout=settings.fetch_timeout) as own_client:
+                return await self._get_json(url, own_client)
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_changed_json(self, url: str, client: httpx.AsyncClient) -> tuple[Optional[dict], str, dict]:
+        """Conditionally GET a feed.
+
+        Returns (payload, status, validators); payload is None when the server
+        answers 304 or the body hash matches the last recorded one.
+        """
+        response = await client.get(url, headers=self.feed_state.conditional_headers(url))
+        if response.status_code == 304:
+            return None, "not_modified", {}
+        response.raise_for_status()
+        body_hash = self.feed_state.content_hash(response.content)
+        if self.feed_state.is_unchanged(url, body_hash):
+            return None, "unchanged", {}
+        validators = {
+            "body_hash": body_hash,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        }
+        return json.loads(response.content), "changed", validators
+
+    def _feeds(self, include_everything: bool = True) -> list[tuple[str, str, str]]:
+        """All feeds as (url, category, country)."""
+        feeds = [
+            (f"{self.base_url}/top-headlines/category/{category}/{country}.json", category, country)
+            for country in self.COUNTRIES
+            for category in self.CATEGORIES
+        ]
+        if include_everything:
+            feeds += [(f"{self.base_url}/everything/{source_id}.json", "general", "gb") for source_id in self.SOURCES]
+        return feeds
+
     async def fetch_top_headlines(
         self,
         category: Optional[str] = None,
         country: str = "us",
+        client: Optional[httpx.AsyncClient] = None,
     ) -> list[dict]:
         """Fetch top headlines. No API key required."""
         category = category or "general"
         url = f"{self.base_url}/top-headlines/category/{category}/{country}.json"
+        data = await self._get_json(url, client)
+        return self._parse_feed(data, category, country)
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            data = response.json()
-
-        articles = data.get("articles", [])
-        return [
-            self._normalize_article(a, category, country)
-            for a in articles
-            if a.get("title") and a.get("title") != "[Removed]"
-        ]
-
-    async def fetch_everything(self, source_id: str = "bbc-news") -> list[dict]:
+    async def fetch_everything(
+        self,
+        source_id: str = "bbc-news",
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> list[dict]:
         """Fetch everything from a source (bbc-news, cnn, fox-news, google-news)."""
         url = f"{self.base_url}/everything/{source_id}.json"
+        data = await self._get_json(url, client)
+        return self._parse_feed(data, "general", "gb")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            data = response.json()
-
-        articles = data.get("articles", [])
-        return [
-            self._normalize_article(a, "general", "gb")
-            for a in articles
-            if a.get("title") and a.get("title") != "[Removed]"
-        ]
+    async def fetch_all(
+        self,
+        include_everything: bool = True,
+        concurrency: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        conditional: Optional[bool] = None,
+    ) -> list[dict]:
+        """Fetch news from all categories, countries and sources (comprehensive ingestion).
+
+        Feeds are fetched concurrently over one pooled keep-alive client, bounded by
+        ``concurrency`` overall and ``per_host_limit`` per host. With ``conditional``
+        (default ``CONDITIONAL_FETCH_ENABLED``) only articles from feeds that changed
+        since the last run are returned. Per-feed timings, statuses and failures are
+        recorded in ``last_fetch_report``.
+
+        Validators of changed feeds are not saved here: they are left in
+        ``pending_validators`` for the caller to ``FeedStateCache.commit`` once
+        the articles are stored and indexed. Otherwise a failure after the
+        fetch would turn the next run's requests into 304s, and those
+        articles would never be indexed.
+        """
+        conditional = settings.conditional_fetch_enabled if conditional is None else conditional
+        concurrency = concurrency or settings.fetch_concurrency
+        per_host_limit = per_host_limit or settings.fetch_per_host_limit
+        feeds = self._feeds(include_everything)
+        limit = asyncio.Semaphore(concurrency)
+        host_limits: dict[str, asyncio.Semaphore] = {}
+        pending: dict[str, dict] = {}
+
+        async def fetch_feed(client: httpx.AsyncClient, url: str, category: str, country: str):
+            host_limit = host_limits.setdefault(httpx.URL(url).host, asyncio.Semaphore(per_host_limit))
+            async with host_limit, limit:
+                t0 = time.perf_counter()
+                articles, status, error = [], "changed", None
+                try:
+                    if conditional:
+                        data, status, validators = await self._get_changed_json(url, client)
+                    else:
+                        data = await self._get_json(url, client)
+                    if data is not None:
+                        articles = self._parse_feed(data, category, country)
+                        if conditional:
+                            pending[url] = validators
+                except Exception as e:
+                    articles, status, error = [], "error", f"{type(e).__name__}: {e}"
+                seconds = time.perf_counter() - t0
+                observe("fetch", seconds, status)
+                return articles, {
+                    "url": url,
+                    "status": status,
+                    "articles": len(articles),
+                    "seconds": round(seconds, 4),
+                    "error": error,
+                }
+
+        started = time.perf_counter()
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(timeout=settings.fetch_timeout, limits=limits) as client:
+            results = await asyncio.gather(*(fetch_feed(client, *feed) for feed in feeds))
+        self.pending_validators = pending
 
-    async def fetch_all(self) -> list[dict]:
-        """Fetch news from all categories and countries (comprehensive ingestion)."""
         all_articles: list[dict] = []
         seen_ids: set[str] = set()
-
-        for country in self.COUNTRIES:
-            for category in self.CATEGORIES:
-                try:
-                    articles = await self.fetch_top_headlines(category=category, country=country)
-                    for a in articles:
-                        if a["id"] not in seen_ids:
-                            seen_ids.add(a["id"])
-                            all_articles.append(a)
-                except Exception:
-                    continue
-
+        for articles, _ in results:
+            for a in articles:
+                if a["id"] not in seen_ids:
+                    seen_ids.add(a["id"])
+                    all_articles.append(a)
+
+        feed_stats = [stats for _, stats in results]
+        self.last_fetch_report = {
+            "feeds": feed_stats,
+            "feeds_total": len(feed_stats),
+            "failed": sum(1 for f in feed_stats if f["error"]),
+            "skipped": sum(1 for f in feed_stats if f["status"] in ("not_modified", "unchanged")),
+            "articles": len(all_articles),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
         return all_articles
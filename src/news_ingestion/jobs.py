@@ -0,0 +1,429 @@
+"""Background ingestion jobs - single-flight lock, stage checkpoints and an interval scheduler."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from config.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("fetch", "dedup", "store", "retention", "index")
+
+
+class IngestBusyError(RuntimeError):
+    """Raised when another ingest (in this or another process) holds the lock."""
+
+    def __init__(self, holder: Optional[dict]):
+        self.holder = holder or {}
+        super().__init__(f"Ingest already running (job {self.holder.get('job_id')})")
+
+
+class IngestLock:
+    """Cross-process single-flight lock: an exclusive ``flock`` on a lock file (``msvcrt`` on Windows).
+
+    The OS releases the lock when its holder exits, crashed or not, so a dead
+    process never blocks ingest and two processes can never both take over a
+    stale lock. While held, the file records the holder's pid and job ID.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def holder(self) -> Optional[dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def acquire(self, job_id: str) -> bool:
+        if self._fd is not None:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        os.ftruncate(fd, 0)
+        os.write(fd, json.dumps({"pid": os.getpid(), "job_id": job_id, "since": time.time()}).encode())
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            os.ftruncate(fd, 0)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            os.close(fd)
+
+
+class IngestJobs:
+    """Runs the ingest pipeline as background jobs with persisted status.
+
+    Each job moves through the stages fetch -> dedup -> store -> retention ->
+    index. Job status (per-stage state, counts and durations) is written to
+    ``INGEST_JOBS_DIR/<id>.json`` after every stage, so any server worker can
+    report it. Fetched articles are checkpointed to ``<id>.articles.json``
+    (again after dedup, with their canonical IDs) and the fetched feeds'
+    HTTP validators to ``<id>.validators.json``; a job that failed or was
+    interrupted is resumed from its first unfinished stage by the next run
+    instead of fetching again. It is abandoned instead when a full reindex is
+    requested, after ``INGEST_MAX_RESUMES`` resumes, or when its checkpoint
+    cannot be read; the next run then starts a new job. Validators are only committed to the feed state once the
+    index stage succeeded, so a failed job never makes the next fetch skip
+    feeds whose articles were not indexed.
+
+    The API runs jobs in the background (``start``), scripts in the
+    foreground (``run_now``); both use the same stages and the given vector
+    store, so its caches and index generation stay in step with what is
+    indexed.
+    """
+
+    def __init__(self, jobs_dir: Optional[str] = None, keep: Optional[int] = None, vector_store=None):
+        self.jobs_dir = Path(jobs_dir or settings.ingest_jobs_dir)
+        self.keep = keep or settings.ingest_jobs_keep
+        self.lock = IngestLock(self.jobs_dir / "ingest.lock")
+        self.vector_store = vector_store
+        self._tasks: set[asyncio.Task] = set()
+
+    def _get_vector_store(self):
+        if self.vector_store is None:
+            from src.vector_db.base import BaseVectorStore
+            self.vector_store = BaseVectorStore.from_settings()
+        return self.vector_store
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _articles_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.articles.json"
+
+    def _validators_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.validators.json"
+
+    def _write_json(self, path: Path, data, **kwargs) -> None:
+        """Write via a temporary file, so a crash never leaves truncated JSON behind."""
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, **kwargs)
+        os.replace(tmp, path)
+
+    def _save(self, job: dict) -> None:
+        self._write_json(self._job_path(job["id"]), job, indent=2)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Status of a job, or None if unknown."""
+        if not job_id.replace("-", "").isalnum():
+            return None
+        try:
+            with open(self._job_path(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def recent(self, limit: int = 20) -> list[dict]:
+        """Most recent jobs first."""
+        jobs = []
+        for path in self.jobs_dir.glob("*.json"):
+            if path.name.endswith((".articles.json", ".validators.json")):
+                continue
+            job = self.get(path.stem)
+            if job:
+                jobs.append(job)
+        jobs.sort(key=lambda j: j["created_at"], reverse=True)
+        return jobs[:limit]
+
+    def _remove_checkpoints(self, job_id: str) -> None:
+        for path in (self._articles_path(job_id), self._validators_path(job_id)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _prune(self) -> None:
+        for job in self.recent(limit=10_000)[self.keep :]:
+            try:
+                self._job_path(job["id"]).unlink()
+            except FileNotFoundError:
+                pass
+            self._remove_checkpoints(job["id"])
+
+    def _unfinished(self) -> Optional[dict]:
+        """The latest job that stopped before its last stage, if it can be resumed."""
+        for job in self.recent(limit=self.keep):
+            if job["status"] == "succeeded":
+                return None
+            if job["status"] in ("failed", "running") and job["stages"]["fetch"]["status"] == "done":
+                if self._articles_path(job["id"]).exists():
+                    return job
+        return None
+
+    def _new_job(self, full_reindex: bool, trigger: str) -> dict:
+        return {
+            "id": uuid.uuid4().hex[:12],
+            "trigger": trigger,
+            "full_reindex": full_reindex,
+            "status": "queued",
+            "created_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "resumed": 0,
+            "error": None,
+            "stages": {stage: {"status": "pending"} for stage in STAGES},
+        }
+
+    def _abandon_reason(self, job: dict, full_reindex: bool, state: dict) -> Optional[str]:
+        """Why an unfinished job cannot be resumed (None if it can; its checkpoint is loaded into ``state``)."""
+        if full_reindex and not job["full_reindex"]:
+            # The reindex fetches every feed and re-indexes all stored articles.
+            return "Superseded by full reindex"
+        if job["resumed"] >= settings.ingest_max_resumes:
+            return f"Gave up after {job['resumed']} resumes"
+        try:
+            self._articles(job, state)
+            self._validators(job, state)
+        except (OSError, ValueError) as e:
+            return f"Unreadable checkpoint: {e}"
+        return None
+
+    def _claim(self, full_reindex: bool, trigger: str) -> tuple[dict, dict]:
+        """Pick the job to run, take the lock and mark it running. Returns the job and its stage state.
+
+        An unfinished job is resumed unless ``_abandon_reason`` gives a reason
+        not to; it is then marked ``abandoned`` and a new job starts (a full
+        reindex if either asked for one). Raises ``IngestBusyError`` if an
+        ingest is running.
+        """
+        unfinished, state, reason = self._unfinished(), {}, None
+        if unfinished is not None:
+            reason = self._abandon_reason(unfinished, full_reindex, state)
+        if unfinished is not None and reason is None:
+            job, abandoned = unfinished, None
+        else:
+            state = {}
+            full_reindex = full_reindex or bool(unfinished and unfinished["full_reindex"])
+            job, abandoned = self._new_job(full_reindex, trigger), unfinished
+        if not self.lock.acquire(job["id"]):
+            raise IngestBusyError(self.lock.holder())
+        try:
+            if abandoned is not None:
+                abandoned.update(status="abandoned", error=f"{reason} (new job {job['id']})")
+                self._save(abandoned)
+                self._remove_checkpoints(abandoned["id"])
+            if job["status"] != "queued":
+                job["resumed"] += 1
+                job["error"] = None
+            job["status"] = "running"
+            job["started_at"] = datetime.utcnow().isoformat()
+            self._save(job)
+        except BaseException:
+            self.lock.release()
+            raise
+        return job, state
+
+    def start(self, full_reindex: bool = False, trigger: str = "api") -> dict:
+        """Take the lock and run a job in the background; returns it immediately.
+
+        Resumes an unfinished job instead of starting a new one (see
+        ``_claim``). Raises ``IngestBusyError`` if an ingest is already running.
+        """
+        job, state = self._claim(full_reindex, trigger)
+        task = asyncio.get_running_loop().create_task(self._run(job, state))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def run_now(self, full_reindex: bool = False, trigger: str = "cli") -> dict:
+        """Run a job to completion from synchronous code (scripts); returns its final status.
+
+        Same job selection and lock as ``start``. A failed stage does not
+        raise: the job's ``status`` is ``failed`` and its ``error`` says why.
+        """
+        job, state = self._claim(full_reindex, trigger)
+        asyncio.run(self._run(job, state))
+        return job
+
+    async def _run(self, job: dict, state: dict) -> None:
+        try:
+            for stage in STAGES:
+                info = job["stages"].setdefault(stage, {"status": "pending"})
+                if info["status"] == "done":
+                    continue
+                info.pop("error", None)
+                info.update(status="running", started_at=datetime.utcnow().isoformat())
+                self._save(job)
+                t0 = time.perf_counter()
+                try:
+                    counts = await getattr(self, f"_stage_{stage}")(job, state)
+                except Exception as e:
+                    info.update(status="failed", seconds=round(time.perf_counter() - t0, 3), error=str(e))
+                    raise
+                info.update(status="done", seconds=round(time.perf_counter() - t0, 3), **counts)
+                self._save(job)
+            job["status"] = "succeeded"
+            self._remove_checkpoints(job["id"])
+        except Exception as e:
+            logger.exception("Ingest job %s failed", job["id"])
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = datetime.utcnow().isoformat()
+            self._save(job)
+            self.lock.release()
+            self._prune()
+
+    def _articles(self, job: dict, state: dict) -> list[dict]:
+        """Fetched articles of this job (from memory, or the checkpoint when resuming)."""
+        if "articles" not in state:
+            with open(self._articles_path(job["id"]), encoding="utf-8") as f:
+                state["articles"] = json.load(f)
+        return state["articles"]
+
+    def _validators(self, job: dict, state: dict) -> dict:
+        """HTTP validators of the feeds this job fetched (empty if its fetch stage has not run)."""
+        if "validators" not in state:
+            try:
+                with open(self._validators_path(job["id"]), encoding="utf-8") as f:
+                    state["validators"] = json.load(f)
+            except FileNotFoundError:
+                state["validators"] = {}
+        return state["validators"]
+
+    def _checkpoint(self, job: dict, state: dict, articles: list[dict]) -> None:
+        self._write_json(self._articles_path(job["id"]), articles)
+        state["articles"] = articles
+
+    async def _stage_fetch(self, job: dict, state: dict) -> dict:
+        from src.news_ingestion.fetcher import NewsFetcher
+
+        fetcher = NewsFetcher()
+        articles = await fetcher.fetch_all(conditional=not job["full_reindex"])
+        self._checkpoint(job, state, articles)
+        self._write_json(self._validators_path(job["id"]), fetcher.pending_validators)
+        state["validators"] = fetcher.pending_validators
+        report = fetcher.last_fetch_report
+        return {
+            "articles": len(articles),
+            "feeds": report["feeds_total"],
+            "skipped": report["skipped"],
+            "failed": report["failed"],
+            "errors": [{"url": feed["url"], "error": feed["error"]} for feed in report["feeds"] if feed["error"]],
+        }
+
+    async def _stage_dedup(self, job: dict, state: dict) -> dict:
+        from src.news_ingestion.dedup import NearDuplicateIndex
+
+        if not settings.dedup_enabled:
+            return {"enabled": False}
+        articles = self._articles(job, state)
+
+        def dedup() -> dict:
+            report = NearDuplicateIndex().assign_canonical(articles)
+            self._checkpoint(job, state, articles)
+            return report
+
+        return await asyncio.to_thread(dedup)
+
+    async def _stage_store(self, job: dict, state: dict) -> dict:
+        from src.news_ingestion.article_db import SQLiteArticleStore
+        from src.news_ingestion.storage import NewsStorage
+
+        articles = self._articles(job, state)
+
+        def store() -> None:
+            NewsStorage.from_settings().save_articles(articles)
+            if settings.article_db_enabled:
+                SQLiteArticleStore().insert_articles(articles)
+
+        await asyncio.to_thread(store)
+        return {"articles": len(articles)}
+
+    async def _stage_retention(self, job: dict, state: dict) -> dict:
+        from src.news_ingestion.article_db import SQLiteArticleStore
+        from src.news_ingestion.dedup import NearDuplicateIndex
+        from src.news_ingestion.storage import NewsStorage
+
+        def retention() -> dict:
+            storage = NewsStorage.from_settings()
+            deleted = storage.run_auto_deletion()
+            dropped = 0
+            if storage.auto_delete:
+                dropped = self._get_vector_store().drop_expired(storage.retention_cutoff())
+            if settings.article_db_enabled:
+                SQLiteArticleStore().run_retention()
+            forgotten = NearDuplicateIndex().run_retention() if settings.dedup_enabled else 0
+            return {"deleted_buckets": deleted, "dropped_partitions": dropped, "forgotten_stories": forgotten}
+
+        return await asyncio.to_thread(retention)
+
+    async def _stage_index(self, job: dict, state: dict) -> dict:
+        from src.news_ingestion.dedup import NearDuplicateIndex
+        from src.news_ingestion.feed_cache import FeedStateCache
+        from src.news_ingestion.storage import NewsStorage
+
+        def index() -> dict:
+            vector_store = self._get_vector_store()
+            if job["full_reindex"]:
+                to_index = NewsStorage.from_settings().load_all_articles()
+            else:
+                to_index = self._articles(job, state)
+            if settings.dedup_enabled:
+                to_index = NearDuplicateIndex().canonical_articles(to_index)
+            indexed = vector_store.upsert_new_articles(to_index, full_reindex=job["full_reindex"])
+            FeedStateCache().commit(self._validators(job, state))
+            return {
+                "stories": len(to_index),
+                "indexed": indexed,
+                "skipped_unchanged": vector_store.last_upsert_skipped,
+                "batches": len(vector_store.last_upsert_stats),
+            }
+
+        return await asyncio.to_thread(index)
+
+    async def run_schedule(self, interval_minutes: float) -> None:
+        """Start an ingest every ``interval_minutes`` (skipped while one is running).
+
+        Safe to run in every server worker: the lock lets one through, and a
+        worker skips its turn if any job started within the interval.
+        """
+        interval = interval_minutes * 60
+        while True:
+            latest = next(iter(self.recent(limit=1)), None)
+            due_in = interval
+            if latest is not None:
+                started = datetime.fromisoformat(latest["started_at"] or latest["created_at"])
+                due_in = interval - (datetime.utcnow() - started).total_seconds()
+            if latest is None or due_in <= 0:
+                try:
+                    self.start(trigger="schedule")
+                except IngestBusyError:
+                    pass
+                due_in = interval
+            await asyncio.sleep(max(due_in, 1))
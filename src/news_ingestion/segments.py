@@ -0,0 +1,190 @@
+"""Append-only segmented article storage (JSONL segments + compact ID index)."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+from config.settings import settings
+from src.news_ingestion.storage import NewsStorage
+
+
+class SegmentedNewsStorage(NewsStorage):
+    """NewsStorage backend that appends each save as a new JSONL segment.
+
+    Bucket layout::
+
+        <bucket>/segments/000001.jsonl   one segment per save (temp file + rename)
+        <bucket>/ids.bin                 12-byte digests of stored IDs, for dedup
+
+    Saving costs O(new articles) instead of rewriting the bucket. Once a bucket
+    has more than ``compact_after`` segments they are merged in a background
+    thread. A legacy ``articles.json`` is still read and folded in on compaction.
+    """
+
+    ID_DIGEST_SIZE = 12
+    SEGMENT_SUFFIX = ".jsonl"
+    READ_ATTEMPTS = 3  # re-reads of a bucket whose segments vanished mid-read
+
+    def __init__(self, *args, compact_after: Optional[int] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compact_after = compact_after or settings.storage_compact_after_segments
+        self._locks: dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._compactions: dict[Path, threading.Thread] = {}
+
+    def _lock(self, bucket_dir: Path) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(bucket_dir, threading.Lock())
+
+    @classmethod
+    def _id_digest(cls, article_id: str) -> bytes:
+        return hashlib.blake2b(article_id.encode(), digest_size=cls.ID_DIGEST_SIZE).digest()
+
+    def _segments(self, bucket_dir: Path) -> list[Path]:
+        """Segment files of a bucket, oldest first."""
+        seg_dir = bucket_dir / "segments"
+        if not seg_dir.exists():
+            return []
+        return sorted(p for p in seg_dir.iterdir() if p.suffix == self.SEGMENT_SUFFIX)
+
+    def _next_segment_path(self, bucket_dir: Path) -> Path:
+        segments = self._segments(bucket_dir)
+        seq = int(segments[-1].stem) + 1 if segments else 1
+        return bucket_dir / "segments" / f"{seq:06d}{self.SEGMENT_SUFFIX}"
+
+    @staticmethod
+    def _write_atomic(path: Path, lines: list[str]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _read_segment(self, path: Path) -> list[dict]:
+        articles = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    articles.append(json.loads(line))
+        return articles
+
+    def _read_bucket(self, bucket_dir: Path) -> list[dict]:
+        """Read the legacy articles.json plus all segments of a bucket."""
+        for attempt in range(self.READ_ATTEMPTS):
+            try:
+                articles = super()._read_bucket(bucket_dir)
+                for segment in self._segments(bucket_dir):
+                    articles.extend(self._read_segment(segment))
+                return articles
+            except FileNotFoundError:
+                # A concurrent compaction replaced the segments; re-list and read again.
+                if attempt == self.READ_ATTEMPTS - 1:
+                    raise
+
+    def _iter_bucket(self, bucket_dir: Path) -> Iterator[dict]:
+        """Stream a bucket's articles segment by segment."""
+        try:
+            yield from super()._read_bucket(bucket_dir)
+            for segment in self._segments(bucket_dir):
+                with open(segment, encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if line:
+                            yield json.loads(line)
+        except FileNotFoundError:
+            # Segments were compacted mid-read; re-read the bucket (callers dedup by ID).
+            yield from self._read_bucket(bucket_dir)
+
+    def _load_ids(self, bucket_dir: Path) -> set[bytes]:
+        """Load the bucket's ID index, rebuilding it from segments if missing or torn."""
+        ids_file = bucket_dir / "ids.bin"
+        size = self.ID_DIGEST_SIZE
+        if ids_file.exists():
+            data = ids_file.read_bytes()
+            if len(data) % size == 0:
+                return {data[i : i + size] for i in range(0, len(data), size)}
+        ids = {self._id_digest(a["id"]) for a in self._read_bucket(bucket_dir)}
+        self._write_ids(bucket_dir, ids)
+        return ids
+
+    def _write_ids(self, bucket_dir: Path, ids: set[bytes]) -> None:
+        ids_file = bucket_dir / "ids.bin"
+        tmp = ids_file.with_suffix(".tmp")
+        tmp.write_bytes(b"".join(sorted(ids)))
+        os.replace(tmp, ids_file)
+
+    def save_articles(self, articles: list[dict], bucket: str = "weekly") -> Path:
+        """Append new articles to the bucket as a fresh segment."""
+        path = self._get_bucket_path(bucket)
+        path.mkdir(parents=True, exist_ok=True)
+
+        with self._lock(path):
+            ids = self._load_ids(path)
+            new_articles, new_ids = [], []
+            for a in articles:
+                digest = self._id_digest(a["id"])
+                if digest not in ids:
+                    ids.add(digest)
+                    new_ids.append(digest)
+                    new_articles.append(a)
+            if not new_articles:
+                return path
+
+            segment = self._next_segment_path(path)
+            self._write_atomic(segment, [json.dumps(a, ensure_ascii=False) + "\n" for a in new_articles])
+            # The ID index is derived data: a torn append is detected and rebuilt on load.
+            with open(path / "ids.bin", "ab") as f:
+                f.write(b"".join(new_ids))
+            self._update_manifest(path, new_articles)
+            segment_count = len(self._segments(path))
+
+        if segment_count > self.compact_after:
+            self.compact_in_background(path)
+        return segment
+
+    def compact(self, bucket_dir: Path) -> Optional[Path]:
+        """Merge a bucket's segments (and legacy articles.json) into one deduplicated segment."""
+        with self._lock(bucket_dir):
+            segments = self._segments(bucket_dir)
+            legacy = bucket_dir / "articles.json"
+            if len(segments) <= 1 and not legacy.exists():
+                return None
+
+            merged: list[dict] = []
+            seen: set[str] = set()
+            for a in self._read_bucket(bucket_dir):
+                if a["id"] not in seen:
+                    seen.add(a["id"])
+                    merged.append(a)
+
+            target = self._next_segment_path(bucket_dir)
+            self._write_atomic(target, [json.dumps(a, ensure_ascii=False) + "\n" for a in merged])
+            for old in segments:
+                old.unlink(missing_ok=True)
+            legacy.unlink(missing_ok=True)
+            self._write_ids(bucket_dir, {self._id_digest(i) for i in seen})
+            return target
+
+    def compact_in_background(self, bucket_dir: Path) -> threading.Thread:
+        """Start (or return the running) compaction thread for a bucket."""
+        with self._locks_guard:
+            running = self._compactions.get(bucket_dir)
+            if running is not None and running.is_alive():
+                return running
+            thread = threading.Thread(target=self.compact, args=(bucket_dir,), daemon=True)
+            self._compactions[bucket_dir] = thread
+            thread.start()
+            return thread
+
+    def wait_for_compactions(self, timeout: Optional[float] = None) -> None:
+        """Block until running background compactions finish."""
+        with self._locks_guard:
+            threads = list(self._compactions.values())
+        for thread in threads:
+            thread.join(timeout)
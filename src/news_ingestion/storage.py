@@ -1,10 +1,12 @@
 """News storage with weekly/monthly retention and auto-deletion."""
 
+import hashlib
 import json
+import os
 import shutil
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from config.settings import settings
 
@@ -25,6 +27,18 @@ class NewsStorage:
         self.retention_months = retention_months or settings.retention_months
         self.auto_delete = auto_delete if auto_delete is not None else settings.auto_delete_enabled
 
+    @classmethod
+    def from_settings(cls, **kwargs) -> "NewsStorage":
+        """Create the storage backend selected by ``STORAGE_BACKEND`` (json or segmented)."""
+        if settings.storage_backend == "segmented":
+            from src.news_ingestion.segments import SegmentedNewsStorage
+            return SegmentedNewsStorage(**kwargs)
+        return cls(**kwargs)
+
+    def _get_bucket_path(self, bucket: str = "weekly") -> Path:
+        """Path of the current weekly or monthly bucket."""
+        return self._get_weekly_path() if bucket == "weekly" else self._get_monthly_path()
+
     def _get_weekly_path(self, date: Optional[datetime] = None) -> Path:
         """Get path for weekly storage bucket."""
         dt = date or datetime.utcnow()
@@ -38,11 +52,7 @@ class NewsStorage:
 
     def save_articles(self, articles: list[dict], bucket: str = "weekly") -> Path:
         """Save articles to weekly or monthly bucket."""
-        if bucket == "weekly":
-            path = self._get_weekly_path()
-        else:
-            path = self._get_monthly_path()
-
+        path = self._get_bucket_path(bucket)
         path.mkdir(parents=True, exist_ok=True)
         file_path = path / "articles.json"
 
@@ -57,36 +67,185 @@ class NewsStorage:
 
         with open(file_path, "w", encoding="utf-8") as f:
             json.dump(combined, f, indent=2, ensure_ascii=False)
+        self._update_manifest(path, new_articles)
 
         return file_path
 
-    def load_all_articles(self) -> list[dict]:
-        """Load all articles from weekly and monthly storage."""
-        all_articles: list[dict] = []
-        seen_ids: set[str] = set()
+    def _read_bucket(self, bucket_dir: Path) -> list[dict]:
+        """Read all articles stored in one bucket directory."""
+        articles_file = bucket_dir / "articles.json"
+        if not articles_file.exists():
+            return []
+        with open(articles_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _iter_bucket(self, bucket_dir: Path) -> Iterator[dict]:
+        """Yield the articles of one bucket directory."""
+        yield from self._read_bucket(bucket_dir)
+
+    def _update_manifest(self, bucket_dir: Path, articles: list[dict]) -> None:
+        """Record categories, countries and published_at range of newly saved articles.
+
+        Must be called after the articles are written to the bucket.
+        """
+        if not articles:
+            return
+        manifest = self._read_manifest(bucket_dir)
+        if manifest is None:
+            # First manifest for a bucket that may predate manifests: cover everything in it.
+            articles = self._read_bucket(bucket_dir)
+            manifest = {"categories": [], "countries": [], "min_published": None, "max_published": None}
+        published = [a["published_at"] for a in articles if a.get("published_at")]
+        if manifest["min_published"]:
+            published.append(manifest["min_published"])
+        if manifest["max_published"]:
+            published.append(manifest["max_published"])
+        manifest = {
+            "categories": sorted(set(manifest["categories"]).union(*(self._coverage(a, "category") for a in articles))),
+            "countries": sorted(set(manifest["countries"]).union(*(self._coverage(a, "country") for a in articles))),
+            "min_published": min(published) if published else None,
+            "max_published": max(published) if published else None,
+        }
+        tmp = bucket_dir / "manifest.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, bucket_dir / "manifest.json")
+
+    @staticmethod
+    def _coverage(article: dict, field: str) -> list[str]:
+        """Categories or countries a (possibly merged) story covers."""
+        plural = "categories" if field == "category" else "countries"
+        return article.get(plural) or [article.get(field, "")]
+
+    @staticmethod
+    def _read_manifest(bucket_dir: Path) -> Optional[dict]:
+        manifest_file = bucket_dir / "manifest.json"
+        if not manifest_file.exists():
+            return None
+        try:
+            with open(manifest_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _bucket_span(bucket: str, name: str) -> Optional[tuple[datetime, datetime]]:
+        """[start, end) fetch-time span covered by a bucket directory name."""
+        try:
+            if bucket == "weekly":
+                start = datetime.strptime(f"{name}-1", "%Y-W%W-%w")
+                return start, start + timedelta(weeks=1)
+            start = datetime.strptime(name, "%Y-%m")
+            end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+            return start, end
+        except ValueError:
+            return None
 
-        for bucket in ["weekly", "monthly"]:
+    @staticmethod
+    def _parse_time(value: str) -> Optional[datetime]:
+        """Parse an ISO timestamp to naive UTC."""
+        if not value:
+            return None
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt
+
+    @staticmethod
+    def _compact_id(article_id: str) -> int:
+        """8-byte integer digest of an article ID, for memory-bounded dedup."""
+        return int.from_bytes(hashlib.blake2b(article_id.encode(), digest_size=8).digest(), "big")
+
+    def _bucket_may_match(
+        self,
+        bucket: str,
+        bucket_dir: Path,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        categories: Optional[set[str]],
+        countries: Optional[set[str]],
+    ) -> bool:
+        """False if no article in the bucket can match the filters."""
+        span = self._bucket_span(bucket, bucket_dir.name)
+        # Articles are published before they are fetched, so a bucket fetched
+        # entirely before ``since`` holds nothing published after it.
+        if since and span and span[1] <= since:
+            return False
+        manifest = self._read_manifest(bucket_dir)
+        if manifest is None:
+            return True
+        if categories and not categories & set(manifest["categories"]):
+            return False
+        if countries and not countries & set(manifest["countries"]):
+            return False
+        min_published = self._parse_time(manifest.get("min_published") or "")
+        max_published = self._parse_time(manifest.get("max_published") or "")
+        if since and max_published and max_published < since:
+            return False
+        if until and min_published and min_published > until:
+            return False
+        return True
+
+    def iter_articles(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        categories: Optional[list[str]] = None,
+        countries: Optional[list[str]] = None,
+        buckets: tuple[str, ...] = ("weekly", "monthly"),
+    ) -> Iterator[dict]:
+        """Lazily yield stored articles, bucket by bucket, deduplicated by ID.
+
+        ``since``/``until`` (naive UTC) filter on ``published_at``. Buckets that
+        cannot match the date range or category/country filters are skipped
+        without being read.
+        """
+        category_set = set(categories) if categories else None
+        country_set = set(countries) if countries else None
+        seen_ids: set[int] = set()
+
+        for bucket in buckets:
             bucket_path = self.data_dir / bucket
             if not bucket_path.exists():
                 continue
-            for subdir in bucket_path.iterdir():
-                if subdir.is_dir():
-                    articles_file = subdir / "articles.json"
-                    if articles_file.exists():
-                        with open(articles_file, encoding="utf-8") as f:
-                            articles = json.load(f)
-                        for a in articles:
-                            if a["id"] not in seen_ids:
-                                seen_ids.add(a["id"])
-                                a["_bucket"] = bucket
-                                a["_path"] = str(subdir)
-                                all_articles.append(a)
-
-        return all_articles
+            for subdir in sorted(bucket_path.iterdir()):
+                if not subdir.is_dir():
+                    continue
+                if not self._bucket_may_match(bucket, subdir, since, until, category_set, country_set):
+                    continue
+                for a in self._iter_bucket(subdir):
+                    if category_set and category_set.isdisjoint(self._coverage(a, "category")):
+                        continue
+                    if country_set and country_set.isdisjoint(self._coverage(a, "country")):
+                        continue
+                    if since or until:
+                        published = self._parse_time(a.get("published_at", ""))
+                        if published is None:
+                            continue
+                        if (since and published < since) or (until and published > until):
+                            continue
+                    key = self._compact_id(a["id"])
+                    if key in seen_ids:
+                        continue
+                    seen_ids.add(key)
+                    a["_bucket"] = bucket
+                    a["_path"] = str(subdir)
+                    yield a
+
+    def load_all_articles(self) -> list[dict]:
+        """Load all articles from weekly and monthly storage."""
+        return list(self.iter_articles())
+
+    def retention_cutoff(self) -> datetime:
+        """Weekly data older than this is deleted by ``run_auto_deletion``."""
+        return datetime.utcnow() - timedelta(weeks=self.retention_weeks)
 
     def _get_old_weekly_dirs(self) -> list[Path]:
         """Get weekly directories older than retention period."""
-        cutoff = datetime.utcnow() - timedelta(weeks=self.retention_weeks)
+        cutoff = self.retention_cutoff()
         old_dirs = []
         weekly_path = self.data_dir / "weekly"
         if not weekly_path.exists():
@@ -0,0 +1,5 @@
+"""Observability module - stage latency histograms, /metrics and Server-Timing."""
+
+from src.observability.metrics import ServerTimingMiddleware, count_error, observe, render, timed
+
+__all__ = ["ServerTimingMiddleware", "count_error", "observe", "render", "timed"]
@@ -0,0 +1,310 @@
+"""In-process latency histograms and counters, exported in Prometheus text format.
+
+Hot paths wrap their work in ``timed(stage, op)``: one ``perf_counter`` pair,
+a dict lookup and a bisect under a lock, so instrumentation stays on in
+production. The same call also records the stage in the current request's
+timings (a context variable set by ``ServerTimingMiddleware``), which become
+the ``Server-Timing`` response header.
+
+Pre-forked workers each keep their own registry and periodically write a
+snapshot to ``METRICS_DIR/<pid>.json``; ``/metrics`` on any worker merges
+them, so a scrape sees the totals of the whole server.
+"""
+
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from config.settings import settings
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Stage timings of the request being served: stage -> [seconds, calls].
+_request_timings: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("request_timings", default=None)
+# Fan-out threads run in copies of the request's context, which share its timings dict.
+_request_timings_lock = threading.Lock()
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def _new_series(self) -> list:
+        raise NotImplementedError
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), list(values)] for key, values in self._series.items()]
+
+    def reset(self) -> None:
+        """Forget all series (a fresh lock too, in case one was held across a fork)."""
+        self._lock = threading.Lock()
+        self._series = {}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_series(self) -> list:
+        return [0.0]
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(labels.get(label, "") for label in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = self._new_series()
+            series[0] += amount
+
+    def expose(self, series: dict[tuple, list]) -> list[str]:
+        return [f"{self.name}{_labels(self.labels, key)} {_num(values[0])}" for key, values in series.items()]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram; each series is [bucket counts..., sum, count]."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def _new_series(self) -> list:
+        return [0] * len(self.buckets) + [0.0, 0]
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels.get(label, "") for label in self.labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = self._new_series()
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def expose(self, series: dict[tuple, list]) -> list[str]:
+        lines = []
+        for key, values in series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + (_num(bound),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + ('+Inf',))} {values[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_num(values[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {values[-1]}")
+        return lines
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+STAGE_SECONDS = Histogram(
+    "news_stage_duration_seconds",
+    "Time spent per pipeline stage (embed, encode, endee, llm, llm_first_token, fetch) and operation.",
+    ("stage", "op"),
+)
+STAGE_ERRORS = Counter("news_stage_errors_total", "Failed stage calls.", ("stage", "op"))
+REQUEST_SECONDS = Histogram(
+    "news_http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ("method", "route", "status"),
+)
+
+METRICS: tuple[_Metric, ...] = (STAGE_SECONDS, STAGE_ERRORS, REQUEST_SECONDS)
+
+
+def observe(stage: str, seconds: float, op: str = "") -> None:
+    """Record one timed call of ``stage`` (also in the current request's Server-Timing)."""
+    if settings.metrics_enabled:
+        STAGE_SECONDS.observe(seconds, stage=stage, op=op)
+    timings = _request_timings.get()
+    if timings is not None:
+        with _request_timings_lock:
+            entry = timings.get(stage)
+            if entry is None:
+                timings[stage] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+
+def count_error(stage: str, op: str = "") -> None:
+    if settings.metrics_enabled:
+        STAGE_ERRORS.inc(stage=stage, op=op)
+
+
+@contextmanager
+def timed(stage: str, op: str = "") -> Iterator[None]:
+    """Time the enclosed block as one call of ``stage``; exceptions are counted and re-raised."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        count_error(stage, op)
+        raise
+    finally:
+        observe(stage, time.perf_counter() - t0, op)
+
+
+def server_timing(timings: dict, total: float) -> str:
+    """``Server-Timing`` header value; stages called more than once carry their call count."""
+    with _request_timings_lock:
+        stages = [(stage, seconds, calls) for stage, (seconds, calls) in timings.items()]
+    parts = []
+    for stage, seconds, calls in stages:
+        part = f"{stage};dur={seconds * 1000:.1f}"
+        parts.append(part + f';desc="{calls} calls"' if calls > 1 else part)
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware: per-route request latency, plus an optional ``Server-Timing`` header.
+
+    The header is sent with the response start, so streamed responses only
+    report the stages that ran before their first byte.
+    """
+
+    def __init__(self, app, header: Optional[bool] = None):
+        self.app = app
+        self.header = settings.server_timing_enabled if header is None else header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings: dict = {}
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.header:
+                    value = server_timing(timings, time.perf_counter() - started)
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", value.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            if settings.metrics_enabled:
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                REQUEST_SECONDS.observe(
+                    time.perf_counter() - started, method=scope["method"], route=route, status=str(status)
+                )
+
+
+def snapshot() -> dict:
+    return {metric.name: metric.snapshot() for metric in METRICS}
+
+
+def _merge(into: dict[str, dict[tuple, list]], snap: dict) -> None:
+    for name, series in snap.items():
+        merged = into.setdefault(name, {})
+        for key, values in series:
+            key = tuple(key)
+            current = merged.get(key)
+            merged[key] = list(values) if current is None else [a + b for a, b in zip(current, values)]
+
+
+class _Multiprocess:
+    """Snapshot files shared by pre-forked workers."""
+
+    def __init__(self):
+        self.dir: Optional[Path] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def path(self, pid: int) -> Path:
+        return self.dir / f"{pid}.json"
+
+    def write(self) -> None:
+        tmp = self.path(os.getpid()).with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot(), f)
+        os.replace(tmp, self.path(os.getpid()))
+
+    def _flush_forever(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                self.write()
+            except OSError:
+                pass
+
+    def start(self, directory: str, interval: float) -> None:
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._flush_forever, args=(interval,), name="metrics-flush", daemon=True)
+        self._thread.start()
+
+    def others(self) -> Iterator[dict]:
+        """Snapshots of every other process, including workers that have exited (keeps counters monotonic)."""
+        own = self.path(os.getpid()).name
+        for path in self.dir.glob("*.json"):
+            if path.name == own:
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    yield json.load(f)
+            except (OSError, ValueError):
+                continue
+
+
+_multiprocess = _Multiprocess()
+
+
+def prepare_multiprocess(directory: Optional[str] = None) -> None:
+    """In the pre-fork parent: clear old worker snapshots and save the warmup's own metrics."""
+    _multiprocess.dir = Path(directory or settings.metrics_dir)
+    _multiprocess.dir.mkdir(parents=True, exist_ok=True)
+    for path in _multiprocess.dir.glob("*.json"):
+        path.unlink()
+    _multiprocess.write()
+
+
+def start_worker(directory: Optional[str] = None, interval: Optional[float] = None) -> None:
+    """In a forked worker: start from empty metrics and flush snapshots periodically."""
+    for metric in METRICS:
+        metric.reset()
+    _multiprocess.start(directory or settings.metrics_dir, interval or settings.metrics_flush_seconds)
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format (merged across workers when pre-forked)."""
+    merged: dict[str, dict[tuple, list]] = {}
+    _merge(merged, snapshot())
+    if _multiprocess.dir is not None:
+        for snap in _multiprocess.others():
+            _merge(merged, snap)
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.expose(merged.get(metric.name, {})))
+    return "\n".join(lines) + "\n"
@@ -1,5 +1,8 @@
 """RAG module - Retrieval Augmented Generation for news-based answers."""
 
+from src.rag.answer_cache import SemanticAnswerCache
+from src.rag.context import ContextBuilder
+from src.rag.llm_client import LLMQueueFullError, OllamaClient, get_llm_client
 from src.rag.pipeline import RAGPipeline
 
-__all__ = ["RAGPipeline"]
+__all__ = ["ContextBuilder", "LLMQueueFullError", "OllamaClient", "RAGPipeline", "SemanticAnswerCache", "get_llm_client"]
@@ -0,0 +1,114 @@
+"""Semantic answer cache - reuse RAG answers for paraphrased questions."""
+
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from config.settings import settings
+
+
+class SemanticAnswerCache:
+    """Caches (query embedding, source IDs, answer) and serves paraphrases.
+
+    A cached answer is reused when a new query's embedding is within
+    ``threshold`` cosine similarity of a cached query *and* the retrieved
+    sources overlap (Jaccard) by at least ``min_overlap``. Entries expire
+    after ``ttl`` seconds or when the index generation changes (new articles).
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        min_overlap: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.threshold = threshold if threshold is not None else settings.answer_cache_threshold
+        self.min_overlap = min_overlap if min_overlap is not None else settings.answer_cache_min_overlap
+        self.max_entries = max_entries if max_entries is not None else settings.answer_cache_size
+        self.ttl = ttl if ttl is not None else settings.answer_cache_ttl_seconds
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: list[dict] = []
+        self._generation: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def _normalize(vector: list[float]) -> np.ndarray:
+        arr = np.asarray(vector, dtype=np.float32)
+        return arr / (np.linalg.norm(arr) or 1.0)
+
+    def _sync_generation(self, generation: int) -> None:
+        """Drop everything once new articles have been indexed."""
+        if generation != self._generation:
+            self._vectors, self._entries = None, []
+            self._generation = generation
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        keep = [i for i, e in enumerate(self._entries) if now - e["created"] <= self.ttl]
+        if len(keep) != len(self._entries):
+            self._entries = [self._entries[i] for i in keep]
+            self._vectors = self._vectors[keep] if keep else None
+
+    def lookup(self, query_vector: list[float], source_ids: list[str], generation: int) -> Optional[str]:
+        """Return a cached answer for a similar query with overlapping sources, if any."""
+        with self._lock:
+            self._sync_generation(generation)
+            self._expire()
+            if self._vectors is not None:
+                sims = self._vectors @ self._normalize(query_vector)
+                sources = set(source_ids)
+                for i in np.argsort(-sims):
+                    if sims[i] < self.threshold:
+                        break
+                    entry = self._entries[i]
+                    union = sources | entry["sources"]
+                    overlap = len(sources & entry["sources"]) / len(union) if union else 1.0
+                    if overlap >= self.min_overlap:
+                        self.hits += 1
+                        self.saved_seconds += entry["seconds"]
+                        return entry["answer"]
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        query_vector: list[float],
+        source_ids: list[str],
+        answer: str,
+        seconds: float,
+        generation: int,
+    ) -> None:
+        """Remember an answer and how long it took to generate."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._sync_generation(generation)
+            vec = self._normalize(query_vector)[None, :]
+            self._vectors = vec if self._vectors is None else np.vstack([self._vectors, vec])
+            self._entries.append({
+                "sources": set(source_ids),
+                "answer": answer,
+                "seconds": seconds,
+                "created": time.monotonic(),
+            })
+            if len(self._entries) > self.max_entries:
+                self._entries = self._entries[-self.max_entries :]
+                self._vectors = self._vectors[-self.max_entries :]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 2),
+            "threshold": self.threshold,
+            "min_overlap": self.min_overlap,
+        }
@@ -0,0 +1,128 @@
+"""Token-budgeted RAG context - collapse near-duplicate sources and pack the prompt."""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+from config.settings import settings
+
+# Roughly 4 characters per token for English text with Llama-style tokenizers.
+CHARS_PER_TOKEN = 4
+MIN_SNIPPET_TOKENS = 24
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate; no tokenizer is available for the Ollama model."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class ContextBuilder:
+    """Selects distinct, relevant articles and packs them under a token budget.
+
+    Candidates are ordered with maximal marginal relevance (MMR) over their
+    stored index vectors (``vector``, see ``include_vectors`` on the vector
+    store searches), or the embeddings of their title + description when a
+    result comes without one. Each pick maximizes
+    ``lambda * relevance - (1 - lambda) * max similarity to already picked``.
+    Candidates at or above ``dedup_threshold`` similarity to a picked article
+    (syndicated copies of one story) are dropped outright. Picked articles are
+    then added in order until ``max_tokens`` is reached; the last one may be
+    truncated to fill the remaining budget.
+    """
+
+    def __init__(
+        self,
+        encode: Optional[Callable[[list[str]], list[list[float]]]] = None,
+        max_tokens: Optional[int] = None,
+        dedup_threshold: Optional[float] = None,
+        mmr_lambda: Optional[float] = None,
+    ):
+        self.encode = encode
+        self.max_tokens = max_tokens or settings.context_max_tokens
+        self.dedup_threshold = dedup_threshold if dedup_threshold is not None else settings.context_dedup_threshold
+        self.mmr_lambda = mmr_lambda if mmr_lambda is not None else settings.context_mmr_lambda
+
+    @staticmethod
+    def _meta(result: dict) -> dict:
+        return result.get("meta", result)
+
+    def _snippet_text(self, result: dict) -> str:
+        meta = self._meta(result)
+        return f"{meta.get('title', '')} {meta.get('description', '')}".strip()
+
+    @staticmethod
+    def _format(meta: dict, description: str) -> str:
+        title = meta.get("title", "")
+        return f"- {title}\n  {description}" if description else f"- {title}"
+
+    def _vectors(self, results: list[dict]) -> Optional[np.ndarray]:
+        """One embedding per result: the stored vector, else an encoded title + description."""
+        if all(r.get("vector") is not None for r in results):
+            return np.asarray([r["vector"] for r in results], dtype=np.float32)
+        if self.encode is None:
+            return None
+        return np.asarray(self.encode([self._snippet_text(r) for r in results]), dtype=np.float32)
+
+    def _select(self, results: list[dict], limit: int) -> tuple[list[dict], int]:
+        """MMR ordering with near-duplicate removal. Returns (picked, duplicates dropped)."""
+        if len(results) < 2:
+            return results[:limit], 0
+        vectors = self._vectors(results)
+        if vectors is None:
+            return results[:limit], 0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+        pairwise = vectors @ vectors.T
+        relevance = np.asarray([r.get("similarity", 0.0) or 0.0 for r in results], dtype=np.float32)
+
+        remaining = list(range(len(results)))
+        picked: list[int] = []
+        duplicates = 0
+        while remaining and len(picked) < limit:
+            if picked:
+                redundancy = pairwise[np.ix_(remaining, picked)].max(axis=1)
+                keep = redundancy < self.dedup_threshold
+                duplicates += int((~keep).sum())
+                remaining = [i for i, k in zip(remaining, keep) if k]
+                redundancy = redundancy[keep]
+                if not remaining:
+                    break
+            else:
+                redundancy = np.zeros(len(remaining), dtype=np.float32)
+            scores = self.mmr_lambda * relevance[remaining] - (1 - self.mmr_lambda) * redundancy
+            best = remaining.pop(int(np.argmax(scores)))
+            picked.append(best)
+        return [results[i] for i in picked], duplicates
+
+    def build(self, results: list[dict], top_k: int, reserved_tokens: int = 0) -> dict:
+        """Build the context string for at most ``top_k`` distinct articles.
+
+        ``reserved_tokens`` (the rest of the prompt) is subtracted from the budget.
+        Returns the context, the articles it cites and token accounting.
+        """
+        selected, duplicates = self._select(results, top_k)
+        budget = max(self.max_tokens - reserved_tokens, 0)
+        parts: list[str] = []
+        sources: list[dict] = []
+        used = 0
+        for result in selected:
+            meta = self._meta(result)
+            description = meta.get("description", "") or ""
+            part = self._format(meta, description)
+            cost = estimate_tokens(part) + 1  # separator
+            if used + cost > budget:
+                room = budget - used - estimate_tokens(self._format(meta, "")) - 2
+                if room < MIN_SNIPPET_TOKENS:
+                    break
+                part = self._format(meta, description[: room * CHARS_PER_TOKEN].rsplit(" ", 1)[0] + "...")
+                cost = estimate_tokens(part) + 1
+            parts.append(part)
+            sources.append(result)
+            used += cost
+        return {
+            "context": "\n\n".join(parts) if parts else "No relevant articles found.",
+            "sources": sources,
+            "context_tokens": used,
+            "duplicates_dropped": duplicates,
+            "over_budget_dropped": len(selected) - len(sources),
+        }
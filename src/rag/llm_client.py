@@ -0,0 +1,277 @@
+"""Long-lived Ollama client - pooled connections, bounded concurrency, request coalescing."""
+
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+import httpx
+
+from config.settings import settings
+from src.observability.metrics import count_error, observe
+
+
+class LLMQueueFullError(RuntimeError):
+    """Raised when more generations are waiting than ``OLLAMA_MAX_QUEUE`` allows."""
+
+
+class _End:
+    """Stream terminator carrying the generation's error, if any."""
+
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class _Generation:
+    """One in-flight generation that any number of callers can subscribe to."""
+
+    def __init__(self):
+        self.tokens: list[str] = []
+        self.subscribers: list[Callable] = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def publish(self, token: str) -> None:
+        self.tokens.append(token)
+        for emit in self.subscribers:
+            emit(token)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.finished = True
+        self.error = error
+        for emit in self.subscribers:
+            emit(_End(error))
+        self.subscribers.clear()
+
+
+class OllamaClient:
+    """Ollama client shared by all callers of the process.
+
+    A single ``httpx.AsyncClient`` runs on a private event-loop thread, so sync
+    code (scripts, agent workflows) and async request handlers share one
+    connection pool and one concurrency limit. At most ``max_concurrency``
+    generations run at once; up to ``max_queue`` more wait their turn. Callers
+    asking for the same (model, prompt) while it is generating join that
+    generation instead of starting another one. A generation whose callers
+    have all gone away (client disconnect, cancelled request) is cancelled,
+    freeing its concurrency slot.
+
+    All state, counters included, is only touched on the loop thread.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.base_url = base_url or settings.ollama_base_url
+        self.max_concurrency = max_concurrency or settings.ollama_max_concurrency
+        self.max_queue = max_queue if max_queue is not None else settings.ollama_max_queue
+        self.timeout = timeout or settings.ollama_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: dict[tuple[str, str], _Generation] = {}
+        self._stats = {
+            "requests": 0,
+            "coalesced": 0,
+            "rejected": 0,
+            "errors": 0,
+            "queued": 0,
+            "in_flight": 0,
+            "max_queue_depth": 0,
+            "queue_wait_seconds": 0.0,
+            "generations": 0,
+            "cancelled": 0,
+        }
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the private event loop thread (again, if we are in a forked child)."""
+        with self._start_lock:
+            if self._loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="ollama-client", daemon=True)
+                thread.start()
+                self._loop, self._thread, self._pid = loop, thread, os.getpid()
+                self._inflight = {}
+                asyncio.run_coroutine_threadsafe(self._init(), loop).result()
+            return self._loop
+
+    async def _init(self) -> None:
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def _submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    async def _subscribe(self, model: str, prompt: str, emit: Callable) -> _Generation:
+        """Attach ``emit`` to the generation for (model, prompt), starting one if needed.
+
+        Runs on the private loop without awaiting, so it cannot race with ``_run``.
+        """
+        self._stats["requests"] += 1
+        key = (model, prompt)
+        generation = self._inflight.get(key)
+        if generation is None:
+            generation = _Generation()
+            self._inflight[key] = generation
+            generation.task = asyncio.get_running_loop().create_task(self._run(key, generation))
+        else:
+            self._stats["coalesced"] += 1
+        for token in generation.tokens:
+            emit(token)
+        if generation.finished:
+            emit(_End(generation.error))
+        else:
+            generation.subscribers.append(emit)
+        return generation
+
+    def _unsubscribe(self, key: tuple[str, str], generation: _Generation, emit: Callable) -> None:
+        """Detach a caller that stopped reading; cancel the generation if it was the last one (loop thread)."""
+        if emit in generation.subscribers:
+            generation.subscribers.remove(emit)
+        if not generation.subscribers and not generation.finished:
+            if self._inflight.get(key) is generation:
+                del self._inflight[key]  # later callers start a fresh generation
+            generation.task.cancel()
+            self._stats["cancelled"] += 1
+
+    def _release(self, key: tuple[str, str], generation: _Generation, emit: Callable) -> None:
+        """Schedule ``_unsubscribe`` from any thread (a no-op once the generation has finished)."""
+        if self._loop is not None and self._pid == os.getpid() and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._unsubscribe, key, generation, emit)
+
+    async def _run(self, key: tuple[str, str], generation: _Generation) -> None:
+        """Generate under the concurrency limit, publishing tokens to subscribers."""
+        model, prompt = key
+        error: Optional[BaseException] = None
+        queued_at = time.perf_counter()
+        self._stats["queued"] += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._stats["queued"])
+        waiting = True
+        try:
+            if self._stats["queued"] > self.max_queue + self.max_concurrency - self._stats["in_flight"]:
+                self._stats["rejected"] += 1
+                raise LLMQueueFullError(f"LLM queue full ({self.max_queue} waiting)")
+            async with self._semaphore:
+                self._stats["queued"] -= 1
+                waiting = False
+                self._stats["queue_wait_seconds"] += time.perf_counter() - queued_at
+                self._stats["in_flight"] += 1
+                started = time.perf_counter()
+                try:
+                    async with self._client.stream(
+                        "POST",
+                        "/api/generate",
+                        json={"model": model, "prompt": prompt, "stream": True},
+                    ) as response:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if not line:
+                                continue
+                            chunk = json.loads(line)
+                            if chunk.get("error"):
+                                raise RuntimeError(chunk["error"])
+                            if chunk.get("response"):
+                                generation.publish(chunk["response"])
+                            if chunk.get("done"):
+                                break
+                    self._stats["generations"] += 1
+                    # Time spent generating only: callers read tokens from their own queues.
+                    observe("llm", time.perf_counter() - started, "generate")
+                finally:
+                    self._stats["in_flight"] -= 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            count_error("llm", "generate")
+            error = e
+        finally:
+            if waiting:
+                self._stats["queued"] -= 1
+            if self._inflight.get(key) is generation:
+                del self._inflight[key]
+            generation.finish(error)
+
+    def warmup(self, model: Optional[str] = None) -> None:
+        """Have Ollama load the model into memory (an empty prompt generates nothing).
+
+        Uses a one-off synchronous request so the private event loop is not
+        started, e.g. in a server process that forks workers afterwards.
+        """
+        response = httpx.post(
+            f"{self.base_url}/api/generate",
+            json={"model": model or settings.ollama_model, "prompt": "", "stream": False},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+
+    def stream_sync(self, prompt: str, model: Optional[str] = None) -> Iterator[str]:
+        """Yield tokens for a prompt from synchronous code."""
+        items: queue.Queue = queue.Queue()
+        key = (model or settings.ollama_model, prompt)
+        generation = self._submit(self._subscribe(*key, items.put_nowait)).result()
+        try:
+            while True:
+                item = items.get()
+                if isinstance(item, _End):
+                    if item.error is not None:
+                        raise item.error
+                    return
+                yield item
+        finally:
+            self._release(key, generation, items.put_nowait)
+
+    async def stream(self, prompt: str, model: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield tokens for a prompt from async code."""
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+
+        def emit(item) -> None:
+            loop.call_soon_threadsafe(items.put_nowait, item)
+
+        key = (model or settings.ollama_model, prompt)
+        generation = await asyncio.wrap_future(self._submit(self._subscribe(*key, emit)))
+        try:
+            while True:
+                item = await items.get()
+                if isinstance(item, _End):
+                    if item.error is not None:
+                        raise item.error
+                    return
+                yield item
+        finally:
+            self._release(key, generation, emit)
+
+    async def _snapshot(self) -> dict:
+        return dict(self._stats)
+
+    def stats(self) -> dict:
+        """Queue depth, concurrency and coalescing counters."""
+        loop = self._loop
+        if loop is not None and self._pid == os.getpid() and loop.is_running():
+            stats = asyncio.run_coroutine_threadsafe(self._snapshot(), loop).result()
+        else:
+            stats = dict(self._stats)
+        waited = stats["generations"] + stats["errors"] - stats["rejected"]
+        stats["avg_queue_wait_ms"] = round(1000 * stats.pop("queue_wait_seconds") / waited, 2) if waited > 0 else 0.0
+        stats["max_concurrency"] = self.max_concurrency
+        stats["max_queue"] = self.max_queue
+        return stats
+
+
+@lru_cache
+def get_llm_client() -> OllamaClient:
+    """Process-wide shared Ollama client."""
+    return OllamaClient()
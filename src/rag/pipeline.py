@@ -1,43 +1,62 @@
 """RAG pipeline - retrieve relevant news and generate LLM answers."""
 
-from typing import Optional
+import asyncio
+import contextvars
+import time
+from typing import Any, AsyncIterator, Iterator, Optional
 
 from config.settings import settings
+from src.embeddings.encoder import get_cpu_executor
+from src.observability.metrics import observe
+from src.rag.answer_cache import SemanticAnswerCache
+from src.rag.context import ContextBuilder, estimate_tokens
+from src.rag.llm_client import OllamaClient, get_llm_client
 
 
 class RAGPipeline:
-    """Retrieval Augmented Generation using Endee + Ollama."""
+    """Retrieval Augmented Generation using Endee (or the local index) + Ollama."""
 
     def __init__(
         self,
         vector_store=None,
         model: Optional[str] = None,
+        llm: Optional[OllamaClient] = None,
     ):
-        from src.vector_db.endee_client import EndeeVectorStore
-        self.vector_store = vector_store or EndeeVectorStore()
+        from src.vector_db.base import BaseVectorStore
+        self.vector_store = vector_store if vector_store is not None else BaseVectorStore.from_settings()
         self.model = model or settings.ollama_model
-        self.ollama_url = settings.ollama_base_url
+        self.llm = llm or get_llm_client()
+        self.answer_cache = SemanticAnswerCache() if settings.answer_cache_enabled else None
+        self.context_builder = ContextBuilder(encode=self.vector_store.encode_texts)
 
     def _retrieve(self, query: str, top_k: int = 5, **filters) -> list[dict]:
-        """Retrieve relevant news from Endee."""
-        return self.vector_store.semantic_search(query, top_k=top_k, **filters)
-
-    def _build_context(self, results: list[dict]) -> str:
-        """Build context string from retrieved articles."""
-        context_parts = []
-        for r in results:
-            meta = r.get("meta", r)
-            title = meta.get("title", "")
-            desc = meta.get("description", "")
-            content = desc or str(meta)[:500]
-            context_parts.append(f"- {title}\n  {content}")
-        return "\n\n".join(context_parts) if context_parts else "No relevant articles found."
-
-    def _generate(self, query: str, context: str) -> str:
-        """Generate answer using Ollama (free local LLM)."""
-        import httpx
-
-        prompt = f"""Based on the following news articles, answer the question. If the articles don't contain relevant information, say so.
+        """Retrieve relevant news from the vector store."""
+        return self.vector_store.semantic_search(query, top_k=top_k, include_vectors=True, **filters)
+
+    def _build_context(self, query: str, results: list[dict], top_k: int) -> dict:
+        """Pack distinct retrieved articles into a token-budgeted context (see ``ContextBuilder``)."""
+        reserved = estimate_tokens(self._build_prompt(query, ""))
+        return self.context_builder.build(results, top_k=top_k, reserved_tokens=reserved)
+
+    def _prepare(self, query: str, top_k: int, **filters) -> tuple[dict, str]:
+        """Retrieve extra candidates, build the context and the prompt."""
+        fetch_k = top_k * max(settings.context_fetch_multiplier, 1)
+        built = self._build_context(query, self._retrieve(query, top_k=fetch_k, **filters), top_k)
+        return built, self._build_prompt(query, built["context"])
+
+    async def _prepare_async(self, query: str, top_k: int, **filters) -> tuple[dict, str]:
+        """Async ``_prepare``: awaited retrieval, context building on the CPU executor."""
+        fetch_k = top_k * max(settings.context_fetch_multiplier, 1)
+        results = await self.vector_store.semantic_search_async(
+            query, top_k=fetch_k, include_vectors=True, **filters
+        )
+        loop = asyncio.get_running_loop()
+        run = contextvars.copy_context().run
+        built = await loop.run_in_executor(get_cpu_executor(), run, self._build_context, query, results, top_k)
+        return built, self._build_prompt(query, built["context"])
+
+    def _build_prompt(self, query: str, context: str) -> str:
+        return f"""Based on the following news articles, answer the question. If the articles don't contain relevant information, say so.
 
 News context:
 {context}
@@ -46,25 +65,122 @@ Question: {query}
 
 Answer:"""
 
-        try:
-            with httpx.Client(timeout=60.0) as client:
-                response = client.post(
-                    f"{self.ollama_url}/api/generate",
-                    json={"model": self.model, "prompt": prompt, "stream": False},
-                )
-                response.raise_for_status()
-                return response.json().get("response", "Unable to generate response.")
-        except Exception as e:
-            return f"LLM error (ensure Ollama is running with model {self.model}): {e}"
+    def _llm_error(self, error: Exception) -> str:
+        return f"LLM error (ensure Ollama is running with model {self.model}): {error}"
 
-    def ask(self, query: str, top_k: int = 5, **filters) -> dict:
-        """RAG: retrieve + generate answer."""
-        results = self._retrieve(query, top_k=top_k, **filters)
-        context = self._build_context(results)
-        answer = self._generate(query, context)
+    @staticmethod
+    def _observe_token(tokens: list[str], started: float) -> None:
+        """Record time to first token when the first one arrives."""
+        if not tokens:
+            observe("llm_first_token", time.perf_counter() - started)
+
+    def _sources_event(self, query: str, built: dict, prompt: str) -> dict:
+        context = built["context"]
         return {
             "query": query,
-            "answer": answer,
-            "sources": [r.get("meta", r) for r in results],
+            "sources": [r.get("meta", r) for r in built["sources"]],
             "context_preview": context[:500] + "..." if len(context) > 500 else context,
+            "context_tokens": built["context_tokens"],
+            "prompt_tokens": estimate_tokens(prompt),
+            "duplicates_dropped": built["duplicates_dropped"],
         }
+
+    @staticmethod
+    def _collect(query: str, events: list[tuple[str, Any]]) -> dict:
+        """Assemble the non-streaming ``ask`` response from stream events."""
+        retrieved = next(data for event, data in events if event == "sources")
+        answer = "".join(data for event, data in events if event == "token")
+        return {
+            "query": query,
+            "answer": answer or "Unable to generate response.",
+            "sources": retrieved["sources"],
+            "context_preview": retrieved["context_preview"],
+            "prompt_tokens": retrieved["prompt_tokens"],
+        }
+
+    def _cached_answer(self, query_vector: list[float], results: list[dict]) -> tuple[Optional[str], int]:
+        """Look up a cached answer for a paraphrase with overlapping sources."""
+        generation = self.vector_store.index_generation()
+        answer = self.answer_cache.lookup(query_vector, [r["id"] for r in results if "id" in r], generation)
+        return answer, generation
+
+    def _remember_answer(
+        self,
+        results: list[dict],
+        query_vector: list[float],
+        generation: int,
+        tokens: list[str],
+        started: float,
+    ) -> None:
+        if self.answer_cache is not None and tokens:
+            self.answer_cache.store(
+                query_vector,
+                [r["id"] for r in results if "id" in r],
+                "".join(tokens),
+                time.perf_counter() - started,
+                generation,
+            )
+
+    def ask_stream(self, query: str, top_k: int = 5, **filters) -> Iterator[tuple[str, Any]]:
+        """RAG as a stream of (event, data): one ``sources`` event, then ``token`` events, then ``done``."""
+        built, prompt = self._prepare(query, top_k, **filters)
+        results = built["sources"]
+        yield "sources", self._sources_event(query, built, prompt)
+
+        cached, query_vector, generation = None, [], 0
+        if self.answer_cache is not None:
+            query_vector = self.vector_store.embed_query(query)
+            cached, generation = self._cached_answer(query_vector, results)
+        if cached is not None:
+            yield "token", cached
+            yield "done", None
+            return
+
+        started, tokens = time.perf_counter(), []
+        try:
+            # The LLM client times generation itself; this loop also waits on the consumer.
+            for token in self.llm.stream_sync(prompt, model=self.model):
+                self._observe_token(tokens, started)
+                tokens.append(token)
+                yield "token", token
+        except Exception as e:
+            yield "token", self._llm_error(e)
+        else:
+            self._remember_answer(results, query_vector, generation, tokens, started)
+        yield "done", None
+
+    async def ask_stream_async(self, query: str, top_k: int = 5, **filters) -> AsyncIterator[tuple[str, Any]]:
+        """Async variant of ``ask_stream``; encoding and retrieval never block the event loop."""
+        built, prompt = await self._prepare_async(query, top_k, **filters)
+        results = built["sources"]
+        yield "sources", self._sources_event(query, built, prompt)
+
+        cached, query_vector, generation = None, [], 0
+        if self.answer_cache is not None:
+            query_vector = await self.vector_store.embed_query_async(query)
+            cached, generation = self._cached_answer(query_vector, results)
+        if cached is not None:
+            yield "token", cached
+            yield "done", None
+            return
+
+        started, tokens = time.perf_counter(), []
+        try:
+            # The LLM client times generation itself; this loop also waits on the consumer.
+            async for token in self.llm.stream(prompt, model=self.model):
+                self._observe_token(tokens, started)
+                tokens.append(token)
+                yield "token", token
+        except Exception as e:
+            yield "token", self._llm_error(e)
+        else:
+            self._remember_answer(results, query_vector, generation, tokens, started)
+        yield "done", None
+
+    def ask(self, query: str, top_k: int = 5, **filters) -> dict:
+        """RAG: retrieve + generate answer."""
+        return self._collect(query, list(self.ask_stream(query, top_k=top_k, **filters)))
+
+    async def ask_async(self, query: str, top_k: int = 5, **filters) -> dict:
+        """Async variant of ``ask``."""
+        return self._collect(query, [e async for e in self.ask_stream_async(query, top_k=top_k, **filters)])
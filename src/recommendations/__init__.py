@@ -1,5 +1,6 @@
 """Recommendations module - personalized news recommendations."""
 
 from src.recommendations.engine import RecommendationEngine
+from src.recommendations.profiles import UserProfileStore
 
-__all__ = ["RecommendationEngine"]
+__all__ = ["RecommendationEngine", "UserProfileStore"]
@@ -1,15 +1,46 @@
 """Recommendation engine - suggest news based on user interests."""
 
+import asyncio
 from typing import Optional
 
-from src.vector_db.endee_client import EndeeVectorStore
+from src.recommendations.profiles import UserProfileStore
+from src.vector_db.base import BaseVectorStore
 
 
 class RecommendationEngine:
-    """Recommends news articles based on semantic similarity to user interests."""
+    """Recommends news articles based on semantic similarity to user interests.
 
-    def __init__(self, vector_store: Optional[EndeeVectorStore] = None):
-        self.vector_store = vector_store or EndeeVectorStore()
+    ``recommend`` embeds the interests on every call. Stored user profiles
+    (``update_interests`` / ``record_click``) keep one embedding per interest
+    plus a centroid, and ``recommend_for_user`` queries the vector store with
+    those directly, without touching the encoder.
+    """
+
+    def __init__(self, vector_store: Optional[BaseVectorStore] = None, profiles: Optional[UserProfileStore] = None):
+        self.vector_store = vector_store if vector_store is not None else BaseVectorStore.from_settings()
+        self._profiles = profiles
+
+    @property
+    def profiles(self) -> UserProfileStore:
+        """Lazy open the user profile store."""
+        if self._profiles is None:
+            self._profiles = UserProfileStore()
+        return self._profiles
+
+    @property
+    def _model_name(self) -> str:
+        return self.vector_store._get_encoder().model_name
+
+    @staticmethod
+    def _interests_query(user_interests: str | list[str]) -> str:
+        if isinstance(user_interests, list):
+            return " ".join(user_interests)
+        return user_interests
+
+    @staticmethod
+    def _exclude(results: list[dict], top_k: int, exclude_ids: Optional[list[str]]) -> list[dict]:
+        exclude = set(exclude_ids or [])
+        return [r for r in results if r.get("id") not in exclude][:top_k]
 
     def recommend(
         self,
@@ -19,17 +50,123 @@ class RecommendationEngine:
         exclude_ids: Optional[list[str]] = None,
     ) -> list[dict]:
         """Recommend articles similar to user interests."""
-        if isinstance(user_interests, list):
-            query = " ".join(user_interests)
-        else:
-            query = user_interests
-
         results = self.vector_store.semantic_search(
-            query=query,
+            query=self._interests_query(user_interests),
             top_k=top_k * 2,  # fetch extra to filter
             category=category,
         )
+        return self._exclude(results, top_k, exclude_ids)
 
-        exclude = set(exclude_ids or [])
-        filtered = [r for r in results if r.get("id") not in exclude][:top_k]
-        return filtered
+    async def recommend_async(
+        self,
+        user_interests: str | list[str],
+        top_k: int = 10,
+        category: Optional[str] = None,
+        exclude_ids: Optional[list[str]] = None,
+    ) -> list[dict]:
+        """Async variant of ``recommend``."""
+        results = await self.vector_store.semantic_search_async(
+            query=self._interests_query(user_interests),
+            top_k=top_k * 2,
+            category=category,
+        )
+        return self._exclude(results, top_k, exclude_ids)
+
+    def update_interests(self, user_id: str, interests: list[str], weights: Optional[dict[str, float]] = None) -> dict:
+        """Set a user's interests; only interests new to the profile are encoded.
+
+        Interests without an entry in ``weights`` keep their current weight.
+        """
+        model = self._model_name
+        interests = list(dict.fromkeys(i.strip() for i in interests if i.strip()))
+        missing = self.profiles.missing_interests(user_id, interests, model)
+        vectors = dict(zip(missing, self.vector_store.encode_texts(missing))) if missing else {}
+        wanted = {text: (weights or {}).get(text) for text in interests}
+        # Encoding happens outside the write transaction; set_interests encodes any
+        # interest a concurrent update removed (or a model switch reset) meanwhile.
+        return self.profiles.set_interests(user_id, wanted, vectors, model, encode=self.vector_store.encode_texts)
+
+    def _current_profile(self, user_id: str) -> Optional[dict]:
+        """The stored profile, re-encoded once if it was built with another embedding model."""
+        profile = self.profiles.get(user_id)
+        if profile is not None and profile["model"] != self._model_name:
+            weights = {text: float(w) for text, w in zip(profile["interests"], profile["weights"])}
+            profile = self.update_interests(user_id, list(weights), weights)
+        return profile
+
+    def record_click(self, user_id: str, article: dict) -> dict:
+        """Fold a clicked article into the user's profile.
+
+        The article is embedded with the same text it was indexed with, so the
+        embedding cache usually answers without running the model.
+        """
+        self._current_profile(user_id)
+        vector = self.vector_store.encode_texts([self.vector_store._article_text(article)])[0]
+        return self.profiles.add_click(user_id, article["id"], vector, self._model_name)
+
+    @staticmethod
+    def _profile_queries(profile: dict) -> list[tuple[list[float], float]]:
+        """(vector, score factor) per stored interest, plus the centroid when it differs from them.
+
+        Interest factors are their weights relative to the heaviest, so
+        interests boosted by clicks rank ahead.
+        """
+        queries = []
+        if profile["interests"]:
+            top = float(profile["weights"].max()) or 1.0
+            queries = [(v.tolist(), float(w) / top) for v, w in zip(profile["vectors"], profile["weights"])]
+        if profile["centroid"] is not None and (len(queries) != 1 or profile["clicks"] is not None):
+            queries.append((profile["centroid"].tolist(), 1.0))
+        return queries
+
+    @staticmethod
+    def _merge(
+        queries: list[tuple[list[float], float]],
+        result_lists: list[list[dict]],
+        labels: list[str],
+        top_k: int,
+        exclude: set[str],
+    ) -> list[dict]:
+        """Best weighted score per article across the per-vector result lists."""
+        best: dict[str, dict] = {}
+        for (_, factor), label, results in zip(queries, labels, result_lists):
+            for r in results:
+                if r["id"] in exclude:
+                    continue
+                score = r["similarity"] * factor
+                if r["id"] not in best or score > best[r["id"]]["score"]:
+                    best[r["id"]] = {**r, "score": score, "matched": label}
+        return sorted(best.values(), key=lambda r: r["score"], reverse=True)[:top_k]
+
+    def recommend_for_user(
+        self,
+        user_id: str,
+        top_k: int = 10,
+        category: Optional[str] = None,
+        exclude_ids: Optional[list[str]] = None,
+    ) -> Optional[list[dict]]:
+        """Recommend from a stored profile with one multi-vector query; None for an unknown user.
+
+        Articles the user already clicked are left out.
+        """
+        profile = self._current_profile(user_id)
+        if profile is None:
+            return None
+        queries = self._profile_queries(profile)
+        if not queries:
+            return []
+        vectors = [v for v, _ in queries]
+        self.vector_store.ensure_index(dimension=len(vectors[0]))
+        result_lists = self.vector_store.search_many_by_vector(vectors, top_k=top_k * 2, category=category)
+        labels = profile["interests"] + ["profile"]
+        return self._merge(queries, result_lists, labels, top_k, set(profile["seen"]) | set(exclude_ids or []))
+
+    async def recommend_for_user_async(
+        self,
+        user_id: str,
+        top_k: int = 10,
+        category: Optional[str] = None,
+        exclude_ids: Optional[list[str]] = None,
+    ) -> Optional[list[dict]]:
+        """Async variant of ``recommend_for_user`` (profile read and vector queries run in a worker thread)."""
+        return await asyncio.to_thread(self.recommend_for_user, user_id, top_k, category, exclude_ids)
@@ -0,0 +1,235 @@
+"""User profiles - one embedding per interest plus a weighted centroid, stored in SQLite."""
+
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from config.settings import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    interests TEXT NOT NULL,
+    vectors BLOB,
+    centroid BLOB,
+    clicks BLOB,
+    click_count INTEGER NOT NULL DEFAULT 0,
+    seen TEXT NOT NULL DEFAULT '[]',
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector, axis=-1, keepdims=True)
+    return vector / np.maximum(norm, 1e-12)
+
+
+def _to_blob(vector: Optional[np.ndarray]) -> Optional[bytes]:
+    return np.asarray(vector, dtype=np.float32).tobytes() if vector is not None else None
+
+
+def _from_blob(blob: Optional[bytes]) -> Optional[np.ndarray]:
+    return np.frombuffer(blob, dtype=np.float32) if blob is not None else None
+
+
+class UserProfileStore:
+    """Persists per-user interest embeddings, a click vector and the profile centroid.
+
+    ``interests`` (JSON ``[[text, weight], ...]``) and ``vectors`` (a float32
+    matrix, one row per interest in the same order) are kept in one row with
+    the centroid, so serving a recommendation is a single read. Vectors are
+    tagged with the embedding model that produced them; encoding is left to
+    the caller, which only encodes interests the profile does not have yet.
+
+    The centroid is the weight-averaged interest vector, blended with the
+    decayed mean of clicked articles' vectors (``PROFILE_CLICK_WEIGHT``).
+    Each click also adds ``PROFILE_CLICK_BOOST`` to the weight of the interest
+    closest to the article.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.profile_db_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> dict:
+        interests = json.loads(row["interests"])
+        vectors = _from_blob(row["vectors"])
+        return {
+            "user_id": row["user_id"],
+            "model": row["model"],
+            "interests": [text for text, _ in interests],
+            "weights": np.array([weight for _, weight in interests], dtype=np.float32),
+            "vectors": vectors.reshape(len(interests), -1) if vectors is not None else np.zeros((0, 0), np.float32),
+            "centroid": _from_blob(row["centroid"]),
+            "clicks": _from_blob(row["clicks"]),
+            "click_count": row["click_count"],
+            "seen": json.loads(row["seen"]),
+            "updated_at": row["updated_at"],
+        }
+
+    @staticmethod
+    def _new(user_id: str, model: str) -> dict:
+        return {
+            "user_id": user_id,
+            "model": model,
+            "interests": [],
+            "weights": np.zeros(0, np.float32),
+            "vectors": np.zeros((0, 0), np.float32),
+            "centroid": None,
+            "clicks": None,
+            "click_count": 0,
+            "seen": [],
+            "updated_at": None,
+        }
+
+    @staticmethod
+    def _centroid(profile: dict) -> Optional[np.ndarray]:
+        parts = []
+        if profile["interests"]:
+            weights = profile["weights"]
+            parts.append((1.0, _unit(weights @ profile["vectors"] / max(float(weights.sum()), 1e-12))))
+        if profile["clicks"] is not None:
+            parts.append((settings.profile_click_weight, profile["clicks"]))
+        if not parts:
+            return None
+        if len(parts) == 2:
+            parts[0] = (1.0 - settings.profile_click_weight, parts[0][1])
+        return _unit(sum(w * v for w, v in parts)).astype(np.float32)
+
+    def get(self, user_id: str) -> Optional[dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+        return self._from_row(row) if row is not None else None
+
+    def _update(self, user_id: str, model: str, change: Callable[[dict], None]) -> dict:
+        """Read-modify-write one profile inside a write transaction, then recompute its centroid."""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT * FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+                profile = self._from_row(row) if row is not None else self._new(user_id, model)
+                if profile["model"] != model:
+                    # Vectors of another model are not comparable; start over, keeping the seen list.
+                    profile = {**self._new(user_id, model), "seen": profile["seen"]}
+                change(profile)
+                profile["centroid"] = self._centroid(profile)
+                profile["updated_at"] = datetime.utcnow().isoformat()
+                conn.execute(
+                    "INSERT OR REPLACE INTO profiles"
+                    " (user_id, model, interests, vectors, centroid, clicks, click_count, seen, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        user_id,
+                        model,
+                        json.dumps([[t, float(w)] for t, w in zip(profile["interests"], profile["weights"])]),
+                        _to_blob(profile["vectors"]) if profile["interests"] else None,
+                        _to_blob(profile["centroid"]),
+                        _to_blob(profile["clicks"]),
+                        profile["click_count"],
+                        json.dumps(profile["seen"]),
+                        profile["updated_at"],
+                    ),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return profile
+
+    def set_interests(
+        self,
+        user_id: str,
+        weights: dict[str, Optional[float]],
+        vectors: dict[str, list[float]],
+        model: str,
+        encode: Optional[Callable[[list[str]], list[list[float]]]] = None,
+    ) -> dict:
+        """Replace a user's interests.
+
+        ``vectors`` should hold an embedding for every interest not already in the
+        profile (see ``missing_interests``). If the profile changed since then,
+        ``encode`` fills the gaps inside the transaction. A ``None`` weight keeps
+        the current weight, click boosts included (1.0 for a new interest).
+        """
+
+        def change(profile: dict) -> None:
+            current = {
+                text: (vector, weight)
+                for text, vector, weight in zip(profile["interests"], profile["vectors"], profile["weights"])
+            }
+            available = dict(vectors)
+            missing = [text for text in weights if text not in current and text not in available]
+            if missing:
+                if encode is None:
+                    raise ValueError(f"No embedding for interests: {', '.join(missing)}")
+                available.update(zip(missing, encode(missing)))
+            rows = []
+            for text, weight in weights.items():
+                if text in current:
+                    vector, old_weight = current[text]
+                else:
+                    vector, old_weight = _unit(np.asarray(available[text], dtype=np.float32)), 1.0
+                rows.append((text, vector, old_weight if weight is None else weight))
+            profile["interests"] = [text for text, _, _ in rows]
+            profile["vectors"] = np.vstack([v for _, v, _ in rows]) if rows else np.zeros((0, 0), np.float32)
+            profile["weights"] = np.array([w for _, _, w in rows], dtype=np.float32)
+
+        return self._update(user_id, model, change)
+
+    def missing_interests(self, user_id: str, interests: list[str], model: str) -> list[str]:
+        """Interests that have no stored embedding from ``model`` yet (the ones to encode)."""
+        profile = self.get(user_id)
+        known = set(profile["interests"]) if profile is not None and profile["model"] == model else set()
+        return [text for text in interests if text not in known]
+
+    def add_click(self, user_id: str, article_id: str, vector: list[float], model: str) -> dict:
+        """Fold a clicked article's embedding into the profile and remember it as seen."""
+        vector = _unit(np.asarray(vector, dtype=np.float32))
+
+        def change(profile: dict) -> None:
+            if profile["clicks"] is None:
+                profile["clicks"] = vector
+            else:
+                decay = settings.profile_click_decay
+                profile["clicks"] = _unit(decay * profile["clicks"] + (1.0 - decay) * vector)
+            profile["click_count"] += 1
+            if profile["interests"]:
+                weights = profile["weights"].copy()
+                weights[int(np.argmax(profile["vectors"] @ vector))] += settings.profile_click_boost
+                profile["weights"] = weights
+            seen = [i for i in profile["seen"] if i != article_id] + [article_id]
+            profile["seen"] = seen[-settings.profile_seen_max :]
+
+        return self._update(user_id, model, change)
+
+    def delete(self, user_id: str) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,)).rowcount > 0
+
+    @staticmethod
+    def summary(profile: dict) -> dict:
+        """JSON-friendly view of a profile (no vectors)."""
+        return {
+            "user_id": profile["user_id"],
+            "interests": {t: round(float(w), 3) for t, w in zip(profile["interests"], profile["weights"])},
+            "clicks": profile["click_count"],
+            "model": profile["model"],
+            "updated_at": profile["updated_at"],
+        }
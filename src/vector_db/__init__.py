@@ -1,5 +1,8 @@
-"""Vector database module - Endee integration."""
+"""Vector database module - Endee integration and local NumPy backend."""
 
+from src.vector_db.base import BaseVectorStore
 from src.vector_db.endee_client import EndeeVectorStore
+from src.vector_db.ledger import IndexLedger
+from src.vector_db.local_store import LocalVectorStore
 
-__all__ = ["EndeeVectorStore"]
+__all__ = ["BaseVectorStore", "EndeeVectorStore", "IndexLedger", "LocalVectorStore"]
@@ -0,0 +1,545 @@
+"""Vector store interface shared by the Endee and local backends."""
+
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional
+
+from config.settings import settings
+from src.observability.metrics import timed
+from src.vector_db.query_cache import QueryCache
+
+
+@lru_cache
+def _io_executor(pid: int) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=max(settings.vector_io_workers, 1), thread_name_prefix="vector-io")
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Executor for blocking vector-store calls on the async path (one per process, fork-safe).
+
+    Sized by ``VECTOR_IO_WORKERS``, so slow index round trips neither queue
+    behind encoding nor exhaust the event loop's default executor.
+    """
+    return _io_executor(os.getpid())
+
+
+async def _run_io(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    # Carry the request context over so the call shows up in its Server-Timing.
+    run = contextvars.copy_context().run
+    return await loop.run_in_executor(get_io_executor(), run, partial(fn, *args, **kwargs))
+
+
+class BaseVectorStore:
+    """Common ingest/search logic; backends implement index access.
+
+    Subclasses provide ``ensure_index``, ``_write_batch`` and ``search_by_vector``
+    and may override ``_finish_upsert`` to persist buffered writes.
+    """
+
+    ledger_path: Optional[str] = None  # None -> INDEX_LEDGER_PATH
+
+    def __init__(self):
+        self._encoder = None
+        self._query_batcher = None
+        self._ledger = None
+        self.query_cache = QueryCache()
+        self.last_upsert_stats: list[dict] = []
+        self.last_upsert_skipped = 0
+
+    @classmethod
+    def from_settings(cls) -> "BaseVectorStore":
+        """Create the vector store selected by ``VECTOR_BACKEND`` (endee or local)."""
+        if settings.vector_backend == "local":
+            from src.vector_db.local_store import LocalVectorStore
+            return LocalVectorStore()
+        from src.vector_db.endee_client import EndeeVectorStore
+        return EndeeVectorStore()
+
+    def _get_encoder(self):
+        """Lazy init encoder."""
+        if self._encoder is None:
+            from src.embeddings.encoder import EmbeddingEncoder
+            self._encoder = EmbeddingEncoder()
+        return self._encoder
+
+    def _get_query_batcher(self):
+        """Lazy init the micro-batching query encoder (None when QUERY_BATCH_ENABLED is off)."""
+        if self._query_batcher is None and settings.query_batch_enabled:
+            from src.embeddings.batcher import BatchingEncoder
+            self._query_batcher = BatchingEncoder(self._get_encoder())
+        return self._query_batcher
+
+    def ensure_index(self, dimension: int = 384) -> None:
+        """Make sure the index exists and is ready for reads and writes."""
+        raise NotImplementedError
+
+    def warmup(self) -> None:
+        """Load the embedding model and resolve the index ahead of the first request."""
+        encoder = self._get_encoder()
+        encoder.warmup()
+        self.ensure_index(dimension=encoder.dimension)
+
+    def reset_connections(self) -> None:
+        """Drop client connections, e.g. after a fork; they are re-opened on next use."""
+
+    def after_fork(self) -> None:
+        """Reset per-process state in a forked server worker.
+
+        Inherited connections are dropped. The embedding cache needs nothing:
+        ``shared_cache`` is keyed by pid, so the worker opens its own mapping.
+        """
+        self.reset_connections()
+
+    def _partition_of(self, article: dict) -> Optional[str]:
+        """Index partition an article is written to (None for unpartitioned backends)."""
+        return None
+
+    def drop_expired(self, cutoff: datetime) -> int:
+        """Delete vectors of articles published before ``cutoff``. Returns partitions dropped.
+
+        Backends without time partitions keep their vectors.
+        """
+        return 0
+
+    def _expired(self, article: dict) -> bool:
+        """True if retention would already have dropped the article's vector (it is not indexed)."""
+        return False
+
+    def _write_batch(self, batch: list[dict]) -> None:
+        """Write one batch of upsert payloads to the index."""
+        raise NotImplementedError
+
+    def _finish_upsert(self) -> None:
+        """Called once all batches of an upsert have been written."""
+
+    def search_by_vector(
+        self,
+        vector: list[float],
+        top_k: int = 10,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
+    ) -> list[dict]:
+        """Top-k nearest articles to a query vector as {id, similarity, meta}.
+
+        ``since``/``until`` are ISO timestamps bounding ``published_at``. With
+        ``include_vectors`` each result also carries its stored ``vector``.
+        """
+        raise NotImplementedError
+
+    def search_many_by_vector(
+        self,
+        vectors: list[list[float]],
+        top_k: int = 10,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
+    ) -> list[list[dict]]:
+        """``search_by_vector`` for several vectors, results in input order. Backends batch this."""
+        return [
+            self.search_by_vector(
+                v,
+                top_k=top_k,
+                category=category,
+                country=country,
+                since=since,
+                until=until,
+                include_vectors=include_vectors,
+            )
+            for v in vectors
+        ]
+
+    @staticmethod
+    def _article_text(article: dict) -> str:
+        """Text that gets embedded for an article."""
+        return f"{article.get('title', '')} {article.get('description', '')} {article.get('content', '')}".strip()
+
+    @classmethod
+    def _ledger_text(cls, article: dict) -> str:
+        """Text hashed by the ledger: the embedded text plus filter coverage, so a story re-upserts when it grows."""
+        coverage = [",".join(article[field]) for field in ("categories", "countries") if article.get(field)]
+        return " | ".join([cls._article_text(article), *coverage])
+
+    @staticmethod
+    def _coverage_key(field: str, value: str) -> str:
+        """Filter key marking that a story covers ``value`` of ``field`` (e.g. ``category_business``)."""
+        return f"{field}_{value}"
+
+    @classmethod
+    def _article_payload(cls, article: dict, vector: list[float]) -> dict:
+        """Build an upsert payload (id, vector, meta, filter) for an article and its embedding.
+
+        Endee filters match scalar values, so besides the article's own
+        ``category``/``country`` the filter sets one ``_coverage_key`` per
+        category and country the story covers; searches filter on those.
+        """
+        meta = {
+            "title": article.get("title", ""),
+            "description": article.get("description", "")[:500],
+            "url": article.get("url", ""),
+            "source": article.get("source", ""),
+            "category": article.get("category", ""),
+            "country": article.get("country", ""),
+            "published_at": article.get("published_at", ""),
+        }
+        # A deduplicated story covers every category/country its variants were published under.
+        for field in ("categories", "countries"):
+            if article.get(field):
+                meta[field] = article[field]
+        filters = {"category": meta["category"], "country": meta["country"]}
+        for field, plural in (("category", "categories"), ("country", "countries")):
+            for value in meta.get(plural) or [meta[field]]:
+                if value:
+                    filters[cls._coverage_key(field, value)] = 1
+        return {"id": article["id"], "vector": vector, "meta": meta, "filter": filters}
+
+    def _upsert_batch(self, batch: list[dict]) -> float:
+        """Write one batch of payloads. Returns seconds taken."""
+        t0 = time.perf_counter()
+        self._write_batch(batch)
+        return time.perf_counter() - t0
+
+    def upsert_articles(
+        self,
+        articles: list[dict],
+        batch_size: Optional[int] = None,
+        on_batch: Optional[Callable[[dict], None]] = None,
+    ) -> int:
+        """Upsert articles with embeddings into the vector store.
+
+        Articles are encoded in batches of ``batch_size``; each batch is uploaded
+        in a background thread while the next one is encoding. Per-batch
+        throughput is recorded in ``last_upsert_stats`` and passed to ``on_batch``.
+        """
+        encoder = self._get_encoder()
+        self.ensure_index(dimension=encoder.dimension)
+
+        articles = [a for a in articles if self._article_text(a)]
+        texts = [self._article_text(a) for a in articles]
+        self.last_upsert_stats = []
+
+        with ThreadPoolExecutor(max_workers=1) as uploader:
+            pending = None
+            for start, vectors, encode_seconds in encoder.encode_batches(texts, batch_size=batch_size):
+                batch = [
+                    self._article_payload(article, vector)
+                    for article, vector in zip(articles[start : start + len(vectors)], vectors)
+                ]
+                if pending is not None:
+                    self._record_batch_stats(*pending, on_batch)
+                pending = (len(batch), encode_seconds, uploader.submit(self._upsert_batch, batch))
+            if pending is not None:
+                self._record_batch_stats(*pending, on_batch)
+        self._finish_upsert()
+        if articles:
+            self.query_cache.invalidate()
+
+        return len(articles)
+
+    def _get_ledger(self):
+        """Lazy load the indexed-article ledger."""
+        if self._ledger is None:
+            from src.vector_db.ledger import IndexLedger
+            self._ledger = IndexLedger(self.ledger_path)
+        return self._ledger
+
+    def upsert_new_articles(self, articles: list[dict], full_reindex: bool = False) -> int:
+        """Upsert only articles that are new or changed since they were last indexed.
+
+        The ledger tracks content hash and embedding model per article ID; pass
+        ``full_reindex`` (e.g. after a model change) to forget it and index everything.
+        Articles that retention would drop right away (see ``_expired``) are left out.
+        """
+        ledger = self._get_ledger()
+        if full_reindex:
+            ledger.clear()
+        model_name = self._get_encoder().model_name
+        articles = [a for a in articles if not self._expired(a)]
+        pending = [a for a in articles if ledger.needs_indexing(a["id"], self._ledger_text(a), model_name)]
+        self.last_upsert_skipped = len(articles) - len(pending)
+        if not pending:
+            self.last_upsert_stats = []
+            ledger.save()
+            return 0
+
+        indexed = self.upsert_articles(pending)
+        for a in pending:
+            ledger.record(a["id"], self._ledger_text(a), model_name, self._partition_of(a))
+        ledger.save()
+        return indexed
+
+    def embedding_cache_stats(self) -> dict:
+        """Hit/miss counters of the encoder's embedding cache."""
+        return self._get_encoder().cache_stats()
+
+    def _record_batch_stats(
+        self,
+        size: int,
+        encode_seconds: float,
+        upload: Future,
+        on_batch: Optional[Callable[[dict], None]] = None,
+    ) -> None:
+        """Wait for a batch upload and record its throughput."""
+        upsert_seconds = upload.result()
+        stats = {
+            "batch": len(self.last_upsert_stats),
+            "size": size,
+            "encode_seconds": round(encode_seconds, 4),
+            "upsert_seconds": round(upsert_seconds, 4),
+            "encode_per_sec": round(size / encode_seconds, 1) if encode_seconds else None,
+        }
+        self.last_upsert_stats.append(stats)
+        if on_batch:
+            on_batch(stats)
+
+    def embed_query(self, query: str) -> list[float]:
+        """Embedding of a query, served from the query embedding LRU when possible."""
+        query_vector = self.query_cache.get_embedding(query)
+        if query_vector is None:
+            batcher = self._get_query_batcher()
+            with timed("embed", "query"):
+                query_vector = batcher.encode(query) if batcher is not None else self._get_encoder().encode(query)[0]
+            self.query_cache.put_embedding(query, query_vector)
+        return query_vector
+
+    def encode_texts(self, texts: list[str]) -> list[list[float]]:
+        """Embeddings for arbitrary texts with the store's encoder (read-only use of its embedding cache)."""
+        return self._get_encoder().encode(texts)
+
+    async def embed_query_async(self, query: str) -> list[float]:
+        """Async ``embed_query``: the model runs on the batcher thread or the CPU executor."""
+        query_vector = self.query_cache.get_embedding(query)
+        if query_vector is None:
+            batcher = self._get_query_batcher()
+            with timed("embed", "query"):
+                if batcher is not None:
+                    query_vector = await asyncio.wrap_future(batcher.submit(query))
+                else:
+                    query_vector = (await self._get_encoder().encode_async(query))[0]
+            self.query_cache.put_embedding(query, query_vector)
+        return query_vector
+
+    def index_generation(self) -> int:
+        """Counter that changes whenever new vectors are indexed."""
+        return self.query_cache.generation.current()
+
+    def semantic_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
+    ) -> list[dict]:
+        """Semantic search over news, served from the query cache when possible."""
+        key = (query, top_k, category, country, since, until, include_vectors)
+        cached = self.query_cache.get_results(key)
+        if cached is not None:
+            return cached
+
+        self.ensure_index(dimension=self._get_encoder().dimension)
+        query_vector = self.embed_query(query)
+        results = self.search_by_vector(
+            query_vector,
+            top_k=top_k,
+            category=category,
+            country=country,
+            since=since,
+            until=until,
+            include_vectors=include_vectors,
+        )
+        self.query_cache.put_results(key, results)
+        return results
+
+    def _search_ready(self, vector: list[float], **kwargs) -> list[dict]:
+        self.ensure_index(dimension=len(vector))
+        return self.search_by_vector(vector, **kwargs)
+
+    async def search_by_vector_async(
+        self,
+        vector: list[float],
+        top_k: int = 10,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
+    ) -> list[dict]:
+        """Async ``search_by_vector``; the default runs the blocking backend call on the I/O executor."""
+        return await _run_io(
+            self._search_ready,
+            vector,
+            top_k=top_k,
+            category=category,
+            country=country,
+            since=since,
+            until=until,
+            include_vectors=include_vectors,
+        )
+
+    def _search_many_ready(self, vectors: list[list[float]], **kwargs) -> list[list[dict]]:
+        if not vectors:
+            return []
+        self.ensure_index(dimension=len(vectors[0]))
+        return self.search_many_by_vector(vectors, **kwargs)
+
+    async def search_many_by_vector_async(
+        self,
+        vectors: list[list[float]],
+        top_k: int = 10,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
+    ) -> list[list[dict]]:
+        """Async ``search_many_by_vector``, run on the I/O executor."""
+        return await _run_io(
+            self._search_many_ready,
+            vectors,
+            top_k=top_k,
+            category=category,
+            country=country,
+            since=since,
+            until=until,
+            include_vectors=include_vectors,
+        )
+
+    async def semantic_search_async(
+        self,
+        query: str,
+        top_k: int = 10,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
+    ) -> list[dict]:
+        """Async ``semantic_search`` for request handlers; nothing blocks the event loop."""
+        key = (query, top_k, category, country, since, until, include_vectors)
+        cached = self.query_cache.get_results(key)
+        if cached is not None:
+            return cached
+
+        query_vector = await self.embed_query_async(query)
+        results = await self.search_by_vector_async(
+            query_vector,
+            top_k=top_k,
+            category=category,
+            country=country,
+            since=since,
+            until=until,
+            include_vectors=include_vectors,
+        )
+        self.query_cache.put_results(key, results)
+        return results
+
+    def batch_search(self, queries: list[dict], concurrency: Optional[int] = None) -> list[list[dict]]:
+        """Run many searches at once; results come back in input order.
+
+        Each query is a dict with ``query`` and optional ``top_k``, ``category``,
+        ``country``, ``since``, ``until`` and ``include_vectors``. Cached results are served directly, all uncached query
+        texts are embedded in one forward pass, and the vector lookups run
+        concurrently on up to ``concurrency`` threads.
+        """
+        keys, results, pending, vectors, missing = self._batch_lookup(queries)
+        if not pending:
+            return results
+
+        encoder = self._get_encoder()
+        self.ensure_index(dimension=encoder.dimension)
+        if missing:
+            self._batch_embedded(vectors, missing, encoder.encode(missing))
+
+        def run(i: int) -> list[dict]:
+            return self.search_by_vector(vectors[keys[i][0]], **self._batch_kwargs(keys[i]))
+
+        workers = min(concurrency or settings.batch_search_concurrency, len(pending))
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            for i, found in zip(pending, pool.map(run, pending)):
+                self.query_cache.put_results(keys[i], found)
+                results[i] = found
+        return results
+
+    async def batch_search_async(self, queries: list[dict], concurrency: Optional[int] = None) -> list[list[dict]]:
+        """Async ``batch_search``: one encode on the CPU executor, lookups on the I/O executor."""
+        keys, results, pending, vectors, missing = self._batch_lookup(queries)
+        if not pending:
+            return results
+
+        encoder = self._get_encoder()
+        # Off the loop: the dimension may load the model on first use.
+        await _run_io(lambda: self.ensure_index(dimension=encoder.dimension))
+        if missing:
+            self._batch_embedded(vectors, missing, await encoder.encode_async(missing))
+
+        limit = asyncio.Semaphore(max(concurrency or settings.batch_search_concurrency, 1))
+
+        async def run(i: int) -> None:
+            async with limit:
+                found = await _run_io(self.search_by_vector, vectors[keys[i][0]], **self._batch_kwargs(keys[i]))
+            self.query_cache.put_results(keys[i], found)
+            results[i] = found
+
+        await asyncio.gather(*(run(i) for i in pending))
+        return results
+
+    def _batch_lookup(self, queries: list[dict]) -> tuple[list[tuple], list, list[int], dict, list[str]]:
+        """Cache keys, cached results, pending indices, known query vectors and texts still to embed."""
+        keys = [
+            (
+                q["query"],
+                q.get("top_k", 10),
+                q.get("category"),
+                q.get("country"),
+                q.get("since"),
+                q.get("until"),
+                q.get("include_vectors", False),
+            )
+            for q in queries
+        ]
+        results: list[Optional[list[dict]]] = [self.query_cache.get_results(key) for key in keys]
+        pending = [i for i, r in enumerate(results) if r is None]
+        vectors = {}
+        for i in pending:
+            text = keys[i][0]
+            if text not in vectors:
+                vectors[text] = self.query_cache.get_embedding(text)
+        missing = [text for text, vector in vectors.items() if vector is None]
+        return keys, results, pending, vectors, missing
+
+    def _batch_embedded(self, vectors: dict, texts: list[str], embedded: list[list[float]]) -> None:
+        for text, vector in zip(texts, embedded):
+            vectors[text] = vector
+            self.query_cache.put_embedding(text, vector)
+
+    @staticmethod
+    def _batch_kwargs(key: tuple) -> dict:
+        _, top_k, category, country, since, until, include_vectors = key
+        return {
+            "top_k": top_k,
+            "category": category,
+            "country": country,
+            "since": since,
+            "until": until,
+            "include_vectors": include_vectors,
+        }
+
+    def cache_stats(self) -> dict:
+        """Query/result cache, embedding cache and query batching statistics."""
+        stats = {**self.query_cache.stats(), "embedding_cache": self.embedding_cache_stats()}
+        if self._query_batcher is not None:
+            stats["query_batching"] = self._query_batcher.stats()
+        return stats
@@ -4,26 +4,61 @@ Uses Endee (https://github.com/endee-io/endee) - high-performance vector DB.
 Fork and use: https://github.com/Janmejay07/endee
 """
 
-from typing import Any, Optional
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
 
 from config.settings import settings
+from src.observability.metrics import timed
+from src.vector_db.base import BaseVectorStore
 
 
-class EndeeVectorStore:
-    """Endee-backed vector store for news articles."""
+class EndeeVectorStore(BaseVectorStore):
+    """Endee-backed vector store for news articles.
+
+    With ``ENDEE_PARTITIONING=weekly`` (the default) vectors go to one index per
+    ISO week of ``published_at``, e.g. ``news_vectors_2026W41``. Searches fan
+    out concurrently over the partitions overlapping the requested time
+    window and merge the top-k, and retention drops whole partitions. With
+    ``none`` everything lives in the single ``NEWS_INDEX_NAME`` index.
+
+    The partition list is cached, and re-read whenever the index generation
+    changes, so a partition created or dropped by another process (an
+    ingest job, the CLI) is picked up on the next search. A partition that
+    disappears between listing and querying is skipped.
+    """
+
+    MAX_UPSERT_BATCH = 1000  # Endee limit per upsert
+    MAX_WINDOW_FETCH = 512  # largest top_k asked of one partition when widening a windowed search
 
     def __init__(
         self,
         index_name: Optional[str] = None,
         base_url: Optional[str] = None,
         token: Optional[str] = None,
+        partitioning: Optional[str] = None,
     ):
+        super().__init__()
         self.index_name = index_name or settings.news_index_name
+        self.partitioning = partitioning or settings.endee_partitioning
         self._client = None
-        self._index = None
+        self._indexes: dict[str, tuple[Any, float]] = {}  # name -> (handle, resolved at)
+        self._partitions: Optional[list[str]] = None
+        self._partitions_listed_at = 0.0
+        self._partitions_generation: Optional[int] = None
+        self._fanout: Optional[ThreadPoolExecutor] = None
         self._base_url = base_url or settings.endee_url
         self._token = token or settings.endee_token
-        self._encoder = None
+        self._dimension = 384
+        self._index_lock = threading.Lock()
+        self.index_ttl = settings.endee_index_ttl_seconds
+
+    @property
+    def partitioned(self) -> bool:
+        return self.partitioning == "weekly"
 
     def _get_client(self):
         """Lazy init Endee client."""
@@ -36,87 +71,343 @@ class EndeeVectorStore:
             self._client.set_base_url(self._base_url)
         return self._client
 
-    def _get_encoder(self):
-        """Lazy init encoder."""
-        if self._encoder is None:
-            from src.embeddings.encoder import EmbeddingEncoder
-            self._encoder = EmbeddingEncoder()
-        return self._encoder
+    def _index_fresh(self, name: str) -> bool:
+        entry = self._indexes.get(name)
+        return entry is not None and time.monotonic() - entry[1] < self.index_ttl
+
+    def _list_index_names(self) -> list[str]:
+        with timed("endee", "list_indexes"):
+            indexes = self._get_client().list_indexes()
+        return [i.get("name", i) if isinstance(i, dict) else str(i) for i in (indexes or [])]
+
+    def _list_partitions(self, refresh: bool = False) -> list[str]:
+        """Names of the existing weekly partitions.
+
+        Cached for ``ENDEE_INDEX_TTL_SECONDS`` or until the index generation
+        changes; handles of partitions that are gone are dropped on refresh.
+        """
+        generation = self.query_cache.generation.current()
+        if (
+            refresh
+            or self._partitions is None
+            or generation != self._partitions_generation
+            or time.monotonic() - self._partitions_listed_at >= self.index_ttl
+        ):
+            prefix = f"{self.index_name}_"
+            names = sorted(n for n in self._list_index_names() if n.startswith(prefix) and _partition_week(n))
+            for name in list(self._indexes):
+                if name.startswith(prefix) and name not in names:
+                    self._indexes.pop(name, None)
+            self._partitions = names
+            self._partitions_listed_at = time.monotonic()
+            self._partitions_generation = generation
+        return self._partitions
 
     def ensure_index(self, dimension: int = 384) -> None:
-        """Create index if not exists. Dimension matches all-MiniLM-L6-v2."""
+        """Resolve the index handle (or the partition list), creating the index if needed.
+
+        Handles are cached and only re-resolved after ``ENDEE_INDEX_TTL_SECONDS``
+        or after a failed call, so the request path costs no extra round trips.
+        """
+        self._dimension = dimension
+        if self.partitioned:
+            self._list_partitions()
+        else:
+            self._get_index(self.index_name)
+
+    def _get_index(self, name: str, create: bool = True):
+        if self._index_fresh(name):
+            return self._indexes[name][0]
+        with self._index_lock:
+            if not self._index_fresh(name):
+                self._indexes[name] = (self._resolve_index(name, self._dimension, create), time.monotonic())
+            return self._indexes[name][0]
+
+    def _resolve_index(self, name: str, dimension: int, create: bool = True):
+        """Return an index handle, creating the index if it does not exist (unless not ``create``).
+
+        Dimension matches all-MiniLM-L6-v2.
+        """
         client = self._get_client()
-        indexes = client.list_indexes()
-        index_names = [i.get("name", i) if isinstance(i, dict) else str(i) for i in (indexes or [])]
-        if self.index_name not in index_names:
+        known = not create or (self.partitioned and self._partitions is not None and name in self._partitions)
+        if not known and name not in self._list_index_names():
             try:
                 from endee import Precision
-                client.create_index(
-                    name=self.index_name,
-                    dimension=dimension,
-                    space_type="cosine",
-                    precision=Precision.FLOAT16,  # Compatible with both SDK and API
-                )
+                with timed("endee", "create_index"):
+                    client.create_index(
+                        name=name,
+                        dimension=dimension,
+                        space_type="cosine",
+                        precision=Precision.FLOAT16,  # Compatible with both SDK and API
+                    )
             except Exception as e:
                 from endee.exceptions import ConflictException
                 if not isinstance(e, ConflictException):
                     raise
-        self._index = client.get_index(name=self.index_name)
+            if self.partitioned and self._partitions is not None and name not in self._partitions:
+                self._partitions = sorted(self._partitions + [name])
+        with timed("endee", "get_index"):
+            return client.get_index(name=name)
+
+    def invalidate_index(self, name: Optional[str] = None) -> None:
+        """Drop cached index handles (one, or all) so the next call re-resolves them."""
+        if name is None:
+            self._indexes = {}
+            self._partitions = None
+        else:
+            self._indexes.pop(name, None)
 
-    def upsert_articles(self, articles: list[dict]) -> int:
-        """Upsert articles with embeddings into Endee."""
-        encoder = self._get_encoder()
-        self.ensure_index(dimension=encoder.dimension)
+    def reset_connections(self) -> None:
+        """Forget the client and index handles so a forked worker opens its own connection."""
+        self._client = None
+        self._fanout = None
+        self.invalidate_index()
 
-        vectors_to_upsert = []
-        for article in articles:
-            text = f"{article.get('title', '')} {article.get('description', '')} {article.get('content', '')}".strip()
-            if not text:
+    def _call_index(
+        self,
+        fn: Callable[[Any], Any],
+        name: Optional[str] = None,
+        op: str = "call",
+        create: bool = True,
+    ) -> Any:
+        """Run ``fn(index)`` (timed as Endee ``op``); on failure re-resolve the handle once and retry.
+
+        With ``create=False`` a missing index is an error instead of being created.
+        """
+        name = name or self.index_name
+
+        def call() -> Any:
+            index = self._get_index(name, create)
+            with timed("endee", op):
+                return fn(index)
+
+        try:
+            return call()
+        except Exception:
+            self.invalidate_index(name)
+            return call()
+
+    def _partition_for(self, published_at: str) -> str:
+        """Weekly partition of a ``published_at`` timestamp (this week if missing or invalid)."""
+        year, week, _ = (_parse_published(published_at) or datetime.utcnow()).isocalendar()
+        return f"{self.index_name}_{year}W{week:02d}"
+
+    def _partition_of(self, article: dict) -> Optional[str]:
+        return self._partition_for(article.get("published_at", "")) if self.partitioned else None
+
+    def _retention_cutoff(self) -> Optional[datetime]:
+        """Partitions that ended before this are dropped by retention (None if nothing is)."""
+        if not (self.partitioned and settings.auto_delete_enabled):
+            return None
+        return datetime.utcnow() - timedelta(weeks=settings.retention_weeks)
+
+    def _expired(self, article: dict) -> bool:
+        cutoff = self._retention_cutoff()
+        return cutoff is not None and _partition_expired(self._partition_of(article), cutoff)
+
+    def _write_batch(self, batch: list[dict]) -> None:
+        """Upsert one batch of payloads, respecting Endee's per-call limit.
+
+        Payloads of partitions past retention are skipped rather than
+        re-creating a partition that the next retention run drops again.
+        """
+        cutoff = self._retention_cutoff()
+        groups: dict[str, list[dict]] = {}
+        for payload in batch:
+            name = self._partition_for(payload["meta"].get("published_at", "")) if self.partitioned else self.index_name
+            if cutoff is not None and _partition_expired(name, cutoff):
                 continue
-            vector = encoder.encode(text)[0]
-            meta = {
-                "title": article.get("title", ""),
-                "description": article.get("description", "")[:500],
-                "url": article.get("url", ""),
-                "source": article.get("source", ""),
-                "category": article.get("category", ""),
-                "country": article.get("country", ""),
-                "published_at": article.get("published_at", ""),
-            }
-            vectors_to_upsert.append({
-                "id": article["id"],
-                "vector": vector,
-                "meta": meta,
-                "filter": {"category": meta["category"], "country": meta["country"]},
-            })
-
-        batch_size = 1000  # Endee limit per upsert
-        for i in range(0, len(vectors_to_upsert), batch_size):
-            batch = vectors_to_upsert[i : i + batch_size]
-            self._index.upsert(batch)
-        return len(vectors_to_upsert)
-
-    def semantic_search(
+            groups.setdefault(name, []).append(payload)
+        for name, payloads in groups.items():
+            for i in range(0, len(payloads), self.MAX_UPSERT_BATCH):
+                chunk = payloads[i : i + self.MAX_UPSERT_BATCH]
+                self._call_index(lambda index: index.upsert(chunk), name, "upsert")
+
+    def _partitions_between(self, start: Optional[datetime], end: Optional[datetime]) -> list[str]:
+        """Partitions whose week overlaps [start, end]."""
+        names = []
+        for name in self._list_partitions():
+            week_start = _partition_week(name)
+            if (start is None or week_start + timedelta(weeks=1) > start) and (end is None or week_start <= end):
+                names.append(name)
+        return names
+
+    def _get_fanout(self) -> ThreadPoolExecutor:
+        if self._fanout is None:
+            self._fanout = ThreadPoolExecutor(
+                max_workers=settings.endee_fanout_concurrency, thread_name_prefix="endee-fanout"
+            )
+        return self._fanout
+
+    def search_by_vector(
         self,
-        query: str,
+        vector: list[float],
         top_k: int = 10,
         category: Optional[str] = None,
         country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
     ) -> list[dict]:
-        """Semantic search over news using Endee."""
-        encoder = self._get_encoder()
-        self.ensure_index(dimension=encoder.dimension)
+        """Query Endee with a precomputed vector, across partitions when partitioned."""
+        return self.search_many_by_vector(
+            [vector],
+            top_k=top_k,
+            category=category,
+            country=country,
+            since=since,
+            until=until,
+            include_vectors=include_vectors,
+        )[0]
 
-        query_vector = encoder.encode(query)[0]
+    def search_many_by_vector(
+        self,
+        vectors: list[list[float]],
+        top_k: int = 10,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
+    ) -> list[list[dict]]:
+        """Query Endee with several vectors; all (vector, partition) queries run concurrently.
+
+        With ``since``/``until``, a query whose hits mostly fall outside the window is
+        repeated with a larger ``top_k`` (up to ``MAX_WINDOW_FETCH``); results can still be
+        shorter than ``top_k`` when even that many neighbours are outside the window.
+        """
         filters = []
         if category:
-            filters.append({"category": {"$eq": category}})
+            filters.append({self._coverage_key("category", category): {"$eq": 1}})
         if country:
-            filters.append({"country": {"$eq": country}})
+            filters.append({self._coverage_key("country", country): {"$eq": 1}})
+        start, end = _window_bounds(since, until)
+        windowed = start is not None or end is not None
+        # Partitions at the window's edges also hold articles outside it; fetch extra to filter.
+        fetch_k = top_k * 2 if windowed else top_k
+        names = self._partitions_between(start, end) if self.partitioned else [self.index_name]
+        calls = [(vector, name, fetch_k) for vector in vectors for name in names]
 
-        results = self._index.query(
-            vector=query_vector,
-            top_k=top_k,
-            filter=filters if filters else None,
-        )
-        return [{"id": r["id"], "similarity": r.get("similarity", 0), "meta": r.get("meta", {})} for r in results]
+        def query(call: tuple[list[float], str, int]) -> list:
+            vector, name, k = call
+            try:
+                return self._call_index(
+                    lambda index: index.query(
+                        vector=vector,
+                        top_k=k,
+                        filter=filters if filters else None,
+                        include_vectors=include_vectors,
+                    ),
+                    name,
+                    "query",
+                    create=not self.partitioned,
+                )
+            except Exception:
+                if not self.partitioned or name in self._list_partitions(refresh=True):
+                    raise
+                return []  # dropped since it was listed (e.g. by retention in another process)
+
+        def run(batch: list[tuple[list[float], str, int]]) -> list[list]:
+            if len(batch) > 1:
+                # One context copy per call, so each query counts towards the request's timings.
+                contexts = [contextvars.copy_context() for _ in batch]
+                return list(self._get_fanout().map(lambda ctx, call: ctx.run(query, call), contexts, batch))
+            return [query(call) for call in batch]
+
+        def keep(results: list) -> list:
+            if not windowed:
+                return results
+            return [r for r in results if _in_window((r.get("meta") or {}).get("published_at", ""), start, end)]
+
+        raw = run(calls)
+        fanned = [keep(results) for results in raw]
+        # A full page that filtering cut below top_k may hide in-window hits further down.
+        while windowed:
+            short = [
+                i
+                for i, (call, results) in enumerate(zip(calls, raw))
+                if len(results) >= call[2] and len(fanned[i]) < top_k and call[2] < self.MAX_WINDOW_FETCH
+            ]
+            if not short:
+                break
+            for i in short:
+                vector, name, k = calls[i]
+                calls[i] = (vector, name, min(k * 4, self.MAX_WINDOW_FETCH))
+            for i, results in zip(short, run([calls[i] for i in short])):
+                raw[i], fanned[i] = results, keep(results)
+
+        merged = []
+        for i in range(len(vectors)):
+            found = [r for results in fanned[i * len(names) : (i + 1) * len(names)] for r in results]
+            results = [{"id": r["id"], "similarity": r.get("similarity", 0), "meta": r.get("meta", {})} for r in found]
+            if include_vectors:
+                for result, r in zip(results, found):
+                    if r.get("vector") is not None:
+                        result["vector"] = r["vector"]
+            results.sort(key=lambda r: r["similarity"], reverse=True)
+            merged.append(results[:top_k])
+        return merged
+
+    def drop_expired(self, cutoff: datetime) -> int:
+        """Delete weekly partitions that ended before ``cutoff`` (one call per partition).
+
+        Bumps the index generation, so other processes re-list their partitions.
+        """
+        if not self.partitioned:
+            return 0
+        expired = [name for name in self._list_partitions(refresh=True) if _partition_expired(name, cutoff)]
+        client = self._get_client()
+        for name in expired:
+            with timed("endee", "delete_index"):
+                client.delete_index(name=name)
+            self.invalidate_index(name)
+        if expired:
+            self._partitions = [n for n in self._partitions if n not in expired]
+            ledger = self._get_ledger()
+            ledger.forget_partitions(expired)
+            ledger.save()
+            self.query_cache.invalidate()
+        return len(expired)
+
+
+def _parse_published(value: str) -> Optional[datetime]:
+    """Parse an ISO timestamp to naive UTC."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _partition_week(name: str) -> Optional[datetime]:
+    """Monday of the ISO week encoded in a partition name (``..._2026W41``)."""
+    suffix = name.rsplit("_", 1)[-1]
+    try:
+        year, week = suffix.split("W")
+        return datetime.fromisocalendar(int(year), int(week), 1)
+    except ValueError:
+        return None
+
+
+def _partition_expired(name: str, cutoff: datetime) -> bool:
+    """True if the partition's week ended before ``cutoff``."""
+    return _partition_week(name) + timedelta(weeks=1) <= cutoff
+
+
+def _window_bounds(since: Optional[str], until: Optional[str]) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Parse a search window; a date-only ``until`` covers that whole day."""
+    start, end = _parse_published(since or ""), _parse_published(until or "")
+    if end is not None and "T" not in until and " " not in until.strip():
+        end += timedelta(days=1) - timedelta(microseconds=1)
+    return start, end
+
+
+def _in_window(published_at: str, start: Optional[datetime], end: Optional[datetime]) -> bool:
+    published = _parse_published(published_at)
+    if published is None:
+        return False
+    return (start is None or published >= start) and (end is None or published <= end)
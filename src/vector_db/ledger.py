@@ -0,0 +1,81 @@
+"""Local ledger of indexed articles - lets ingest skip vectors Endee already has."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from config.settings import settings
+
+
+class IndexLedger:
+    """Records article ID -> (content hash, model name[, partition]) for everything indexed.
+
+    An article needs (re)indexing when its ID is unknown, its embedded text
+    changed, or it was embedded with a different model. The partition (for
+    time-partitioned indexes) lets a dropped partition's articles be forgotten.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.index_ledger_path)
+        self._entries: dict[str, list[str]] = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash of the text that gets embedded."""
+        return hashlib.sha256(text.encode()).hexdigest()[:24]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, article_id: str) -> bool:
+        return article_id in self._entries
+
+    def needs_indexing(self, article_id: str, text: str, model_name: str) -> bool:
+        """True if the article is new, changed, or embedded with another model."""
+        return self._entries.get(article_id, [])[:2] != [self.content_hash(text), model_name]
+
+    def record(self, article_id: str, text: str, model_name: str, partition: Optional[str] = None) -> None:
+        """Mark an article as indexed (into ``partition``, if the index is partitioned)."""
+        entry = [self.content_hash(text), model_name]
+        if partition:
+            entry.append(partition)
+        self._entries[article_id] = entry
+        self._dirty = True
+
+    def forget(self, article_ids: list[str]) -> None:
+        """Drop articles from the ledger (e.g. after their vectors are deleted)."""
+        for article_id in article_ids:
+            if self._entries.pop(article_id, None) is not None:
+                self._dirty = True
+
+    def forget_partitions(self, partitions: list[str]) -> int:
+        """Drop every article recorded in one of ``partitions``. Returns how many."""
+        dropped = set(partitions)
+        stale = [aid for aid, entry in self._entries.items() if len(entry) > 2 and entry[2] in dropped]
+        self.forget(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Forget everything so the next ingest re-indexes all articles."""
+        self._entries = {}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the ledger to disk atomically."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._dirty = False
@@ -0,0 +1,236 @@
+"""In-process NumPy vector index - an Endee alternative for CI, laptops and small corpora."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config.settings import settings
+from src.vector_db.base import BaseVectorStore
+
+
+class _IndexState:
+    """Immutable snapshot of the index; swapped atomically on every write."""
+
+    def __init__(self, vectors: np.ndarray, ids: list[str], meta: list[dict]):
+        self.vectors = vectors
+        self.ids = ids
+        self.meta = meta
+        self.rows = {article_id: row for row, article_id in enumerate(ids)}
+        self.published = np.array([m.get("published_at", "") or "" for m in meta], dtype=str)
+        self.category_masks = self._masks("category", "categories")
+        self.country_masks = self._masks("country", "countries")
+
+    def _masks(self, field: str, plural: str) -> dict[str, np.ndarray]:
+        """One boolean row mask per distinct value of a filter field.
+
+        A deduplicated story lists all its values under ``plural`` and is set in each of their masks.
+        """
+        masks: dict[str, np.ndarray] = {}
+        for row, m in enumerate(self.meta):
+            for value in m.get(plural) or [m.get(field, "")]:
+                if value not in masks:
+                    masks[value] = np.zeros(len(self.meta), dtype=bool)
+                masks[value][row] = True
+        return masks
+
+
+class LocalVectorStore(BaseVectorStore):
+    """Vector store that keeps normalized embeddings in a memory-mapped NumPy matrix.
+
+    Queries are one matmul + ``argpartition`` over the rows allowed by
+    precomputed category/country masks, so there is no network round trip.
+    """
+
+    def __init__(self, index_dir: Optional[str] = None, dtype: Optional[str] = None):
+        super().__init__()
+        self.index_dir = Path(index_dir or settings.local_index_dir)
+        self.dtype = np.dtype(dtype or settings.local_index_dtype)
+        self.ledger_path = str(self.index_dir / "ledger.json")
+        self._state: Optional[_IndexState] = None
+        self._pending: list[dict] = []
+        self._generation = 0
+        self._loaded_mtime: Optional[int] = None
+        self._write_lock = threading.Lock()
+
+    @property
+    def _records_path(self) -> Path:
+        return self.index_dir / "records.json"
+
+    def _load(self) -> _IndexState:
+        """Open the on-disk index (vectors memory-mapped) or start empty."""
+        if self._records_path.exists():
+            with open(self._records_path, encoding="utf-8") as f:
+                records = json.load(f)
+            vectors = np.load(self.index_dir / records["vectors_file"], mmap_mode="r")
+            self._generation = records["generation"]
+            return _IndexState(vectors, records["ids"], records["meta"])
+        return _IndexState(np.zeros((0, 0), dtype=self.dtype), [], [])
+
+    def _records_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self._records_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def ensure_index(self, dimension: int = 384) -> None:
+        """Load the index from disk on first use, and reload it after another process wrote it."""
+        mtime = self._records_mtime()
+        if self._state is None or mtime != self._loaded_mtime:
+            with self._write_lock:
+                self._state = self._load()
+                self._loaded_mtime = mtime
+
+    def _write_batch(self, batch: list[dict]) -> None:
+        """Buffer payloads; they are merged into the matrix in ``_finish_upsert``."""
+        self._pending.extend(batch)
+
+    def _finish_upsert(self) -> None:
+        """Merge buffered payloads into the matrix and persist it."""
+        if not self._pending:
+            return
+        with self._write_lock:
+            pending, self._pending = self._pending, []
+            state = self._state or self._load()
+            vectors = np.array(state.vectors, dtype=self.dtype)
+            ids, meta = list(state.ids), list(state.meta)
+            rows = dict(state.rows)
+
+            new_vectors = np.asarray([p["vector"] for p in pending], dtype=np.float32)
+            norms = np.linalg.norm(new_vectors, axis=1, keepdims=True)
+            new_vectors = (new_vectors / np.where(norms == 0, 1, norms)).astype(self.dtype)
+            if vectors.size == 0:
+                vectors = np.zeros((0, new_vectors.shape[1]), dtype=self.dtype)
+
+            appended = []
+            for payload, vec in zip(pending, new_vectors):
+                row = rows.get(payload["id"])
+                if row is None:
+                    rows[payload["id"]] = len(ids)
+                    appended.append(vec)
+                    ids.append(payload["id"])
+                    meta.append(payload["meta"])
+                elif row < len(vectors):
+                    vectors[row] = vec
+                    meta[row] = payload["meta"]
+                else:
+                    appended[row - len(vectors)] = vec
+                    meta[row] = payload["meta"]
+            if appended:
+                vectors = np.vstack([vectors, np.asarray(appended, dtype=self.dtype)])
+
+            vectors_path = self._save(vectors, ids, meta)
+            self._state = _IndexState(np.load(vectors_path, mmap_mode="r"), ids, meta)
+            self._loaded_mtime = self._records_mtime()
+
+    def _save(self, vectors: np.ndarray, ids: list[str], meta: list[dict]) -> Path:
+        """Write a new vectors generation, then switch records to it atomically.
+
+        Each write goes to a fresh ``vectors-N.npy`` so files still memory-mapped
+        by readers are never replaced in place.
+        """
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._generation += 1
+        vectors_file = f"vectors-{self._generation:06d}.npy"
+        with open(self.index_dir / vectors_file, "wb") as f:
+            np.save(f, vectors)
+        tmp = self.index_dir / "records.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"generation": self._generation, "vectors_file": vectors_file, "ids": ids, "meta": meta},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp, self._records_path)
+        for old in self.index_dir.glob("vectors-*.npy"):
+            if old.name != vectors_file:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass  # still mapped (Windows); removed on a later write
+        return self.index_dir / vectors_file
+
+    def __len__(self) -> int:
+        self.ensure_index()
+        return len(self._state.ids)
+
+    def search_by_vector(
+        self,
+        vector: list[float],
+        top_k: int = 10,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
+    ) -> list[dict]:
+        """Exact top-k cosine search with vectorized NumPy."""
+        return self.search_many_by_vector(
+            [vector],
+            top_k=top_k,
+            category=category,
+            country=country,
+            since=since,
+            until=until,
+            include_vectors=include_vectors,
+        )[0]
+
+    def search_many_by_vector(
+        self,
+        vectors: list[list[float]],
+        top_k: int = 10,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_vectors: bool = False,
+    ) -> list[list[dict]]:
+        """Exact top-k for several query vectors with one matrix product."""
+        self.ensure_index()
+        state = self._state
+        if not state.ids or top_k <= 0 or not vectors:
+            return [[] for _ in vectors]
+
+        queries = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        mask = None
+        for masks, value in ((state.category_masks, category), (state.country_masks, country)):
+            if value:
+                value_mask = masks.get(value)
+                if value_mask is None:
+                    return [[] for _ in vectors]
+                mask = value_mask if mask is None else mask & value_mask
+        for bound, keep in ((since, np.greater_equal), (until, np.less_equal)):
+            if bound:
+                window = keep(state.published, bound)
+                mask = window if mask is None else mask & window
+
+        # Scoring every row and then masking beats gathering the candidate rows,
+        # which would copy them out of the memory map first.
+        scores = state.vectors @ queries.T.astype(state.vectors.dtype)
+        candidates = None
+        if mask is not None:
+            candidates = np.flatnonzero(mask)
+            if candidates.size == 0:
+                return [[] for _ in vectors]
+            scores = scores[candidates]
+
+        k = min(top_k, scores.shape[0])
+        results = []
+        for column in scores.T:
+            top = np.argpartition(-column, k - 1)[:k]
+            top = top[np.argsort(-column[top])]
+            rows = top if candidates is None else candidates[top]
+            found = [
+                {"id": state.ids[row], "similarity": float(column[i]), "meta": state.meta[row]}
+                for i, row in zip(top, rows)
+            ]
+            if include_vectors:
+                for result, row in zip(found, rows):
+                    result["vector"] = state.vectors[row].astype(np.float32).tolist()
+            results.append(found)
+        return results
@@ -0,0 +1,173 @@
+"""Query-side caches: query embedding LRU and search-result TTL cache."""
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+import numpy as np
+
+from config.settings import settings
+
+
+class IndexGeneration:
+    """Counter bumped whenever the vector index changes.
+
+    Backed by a small file so an ingest in another process (e.g.
+    ``scripts/ingest.py``) invalidates caches held by the API; reading it costs
+    one ``stat`` unless the file changed.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.index_generation_path)
+        self._value = 0
+        self._mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return self._value
+        if mtime_ns != self._mtime_ns:
+            try:
+                self._value = int(self.path.read_text(encoding="utf-8").strip() or 0)
+                self._mtime_ns = mtime_ns
+            except (OSError, ValueError):
+                pass
+        return self._value
+
+    def bump(self) -> int:
+        """Increment and persist the generation."""
+        with self._lock:
+            value = self.current() + 1
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(str(value), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._value = value
+            return value
+
+
+class LRUCache:
+    """Thread-safe bounded LRU with optional per-entry TTL and size accounting."""
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                self._pop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (value, time.monotonic(), size)
+            self.bytes += size
+            while len(self._data) > self.max_entries:
+                self._pop(next(iter(self._data)))
+
+    def _pop(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self.bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "approx_bytes": self.bytes,
+        }
+
+
+class QueryCache:
+    """Two-level cache for ``semantic_search``.
+
+    Level 1 maps query text to its embedding (bounded LRU). Level 2 maps
+    (query, top_k, category, country) to results with a TTL, and is dropped
+    whenever the index generation changes.
+    """
+
+    def __init__(
+        self,
+        embedding_entries: Optional[int] = None,
+        result_entries: Optional[int] = None,
+        result_ttl: Optional[float] = None,
+        generation: Optional[IndexGeneration] = None,
+    ):
+        self.embeddings = LRUCache(
+            embedding_entries if embedding_entries is not None else settings.query_embedding_cache_size
+        )
+        self.results = LRUCache(
+            result_entries if result_entries is not None else settings.search_cache_size,
+            ttl=result_ttl if result_ttl is not None else settings.search_cache_ttl_seconds,
+        )
+        self.generation = generation or IndexGeneration()
+        self._seen_generation = self.generation.current()
+
+    def _check_generation(self) -> None:
+        current = self.generation.current()
+        if current != self._seen_generation:
+            self.results.clear()
+            self._seen_generation = current
+
+    def get_embedding(self, query: str) -> Optional[list[float]]:
+        vector = self.embeddings.get(query)
+        return vector.tolist() if vector is not None else None
+
+    def put_embedding(self, query: str, vector: list[float]) -> None:
+        arr = np.asarray(vector, dtype=np.float32)
+        self.embeddings.put(query, arr, size=arr.nbytes + len(query))
+
+    def get_results(self, key: tuple) -> Optional[list[dict]]:
+        self._check_generation()
+        results = self.results.get(key)
+        # Deep copies both ways: callers mutate nested ``meta`` dicts in place.
+        return copy.deepcopy(results) if results is not None else None
+
+    def put_results(self, key: tuple, results: list[dict]) -> None:
+        self._check_generation()
+        size = len(json.dumps(results, default=str))
+        self.results.put(key, copy.deepcopy(results), size=size)
+
+    def invalidate(self) -> None:
+        """Bump the index generation (call after the index changes)."""
+        self._seen_generation = self.generation.bump()
+        self.results.clear()
+
+    def stats(self) -> dict:
+        return {
+            "generation": self._seen_generation,
+            "query_embeddings": self.embeddings.stats(),
+            "search_results": self.results.stats(),
+        }
@@ -0,0 +1,50 @@
+"""SemanticAnswerCache: paraphrase hits, source overlap, generation invalidation, TTL and size."""
+
+from src.rag import answer_cache
+from src.rag.answer_cache import SemanticAnswerCache
+
+
+def make_cache(**kwargs) -> SemanticAnswerCache:
+    options = {"threshold": 0.9, "min_overlap": 0.5, "max_entries": 10, "ttl": 60, **kwargs}
+    return SemanticAnswerCache(**options)
+
+
+def test_similar_query_with_overlapping_sources_hits():
+    cache = make_cache()
+    cache.store([1.0, 0.0, 0.0], ["a", "b"], "answer", 2.5, generation=1)
+
+    assert cache.lookup([0.99, 0.05, 0.0], ["a", "b", "c"], generation=1) == "answer"
+    assert cache.lookup([0.0, 1.0, 0.0], ["a", "b"], generation=1) is None  # different question
+    assert cache.lookup([1.0, 0.0, 0.0], ["c", "d"], generation=1) is None  # different sources
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+    assert cache.stats()["saved_seconds"] == 2.5
+
+
+def test_new_index_generation_drops_cached_answers():
+    cache = make_cache()
+    cache.store([1.0, 0.0], ["a"], "stale answer", 1.0, generation=1)
+
+    assert cache.lookup([1.0, 0.0], ["a"], generation=2) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "monotonic", lambda: now[0])
+    cache = make_cache(ttl=30)
+    cache.store([1.0, 0.0], ["a"], "answer", 1.0, generation=1)
+
+    now[0] += 29
+    assert cache.lookup([1.0, 0.0], ["a"], generation=1) == "answer"
+    now[0] += 2
+    assert cache.lookup([1.0, 0.0], ["a"], generation=1) is None
+
+
+def test_oldest_entries_are_dropped_beyond_max_entries():
+    cache = make_cache(max_entries=2)
+    for i, vector in enumerate(([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])):
+        cache.store(vector, ["a"], f"answer {i}", 1.0, generation=1)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup([1.0, 0.0, 0.0], ["a"], generation=1) is None
+    assert cache.lookup([0.0, 0.0, 1.0], ["a"], generation=1) == "answer 2"
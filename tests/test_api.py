@@ -0,0 +1,74 @@
+"""HTTP API over the local index, the hashing model and the fake Ollama server."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import HashingModel, OllamaServer, install_fakes
+from config.settings import settings
+from src.news_ingestion.jobs import IngestLock
+
+ARTICLES = [
+    {"id": "rates", "title": "Central bank raises interest rates", "category": "business", "country": "us"},
+    {"id": "cup", "title": "Football club wins the cup final", "category": "sports", "country": "gb"},
+]
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    """``src.api.main`` with every data path in a scratch directory (the app is built at import)."""
+    patch = pytest.MonkeyPatch()
+    patch.chdir(tmp_path_factory.mktemp("api"))
+    patch.setattr(settings, "vector_backend", "local")
+    patch.setattr(settings, "ingest_schedule_minutes", 0)
+    from src.api import main
+
+    install_fakes(main.agent.vector_store, HashingModel(dimension=64))
+    main.agent.vector_store.upsert_articles([dict(a) for a in ARTICLES])
+    with OllamaServer(tokens=3, first_token_ms=5, token_ms=1) as ollama:
+        patch.setattr(main.agent.rag.llm, "base_url", ollama.url)
+        yield main
+    patch.undo()
+
+
+@pytest.fixture(scope="module")
+def client(api):
+    with TestClient(api.app) as client:
+        yield client
+
+
+def test_ready_once_warm(client):
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["ready"] is True
+    assert body["components"]["vector_store"]["ok"] and body["components"]["llm"]["ok"]
+
+
+def test_not_ready_while_the_vector_store_is_unreachable(api, client, monkeypatch):
+    def unreachable():
+        raise ConnectionError("index unreachable")
+
+    monkeypatch.setitem(api.warmup_state, "ready", False)
+    monkeypatch.setattr(api.agent.vector_store, "warmup", unreachable)
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["components"]["vector_store"] == {"ok": False, "error": "index unreachable"}
+
+    monkeypatch.undo()
+    api.warmup_state["ready"] = False
+    assert client.get("/ready").status_code == 200  # warms up again on the next probe
+
+
+def test_ingest_while_another_one_runs_is_rejected(api, client):
+    other = IngestLock(api.get_ingest_jobs().lock.path)  # e.g. a script ingesting in another process
+    assert other.acquire("other-job")
+    try:
+        response = client.post("/ingest")
+    finally:
+        other.release()
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["job_id"] == "other-job"
+    assert client.get("/ingest").json()["jobs"] == []
@@ -0,0 +1,70 @@
+"""SQLiteArticleStore: idempotent inserts, hydration, indexed queries and retention."""
+
+from datetime import datetime
+
+import pytest
+
+from config.settings import settings
+from src.news_ingestion.article_db import SQLiteArticleStore
+
+
+def article(id: str, published_at: str, category: str = "business", country: str = "us", source: str = "Reuters") -> dict:
+    return {
+        "id": id,
+        "title": f"Story {id}",
+        "source": source,
+        "category": category,
+        "country": country,
+        "published_at": published_at,
+        "fetched_at": published_at,
+    }
+
+
+@pytest.fixture
+def store(tmp_path) -> SQLiteArticleStore:
+    store = SQLiteArticleStore(path=str(tmp_path / "articles.db"))
+    store.insert_articles([
+        article("a1", "2026-10-01T08:00:00Z"),
+        article("a2", "2026-10-03T08:00:00Z", country="gb", source="BBC"),
+        article("a3", "2026-10-05T08:00:00Z", category="sports"),
+    ])
+    return store
+
+
+def test_insert_ignores_known_ids(store):
+    assert store.insert_articles([article("a1", "2026-10-09T08:00:00Z"), article("a4", "2026-10-09T08:00:00Z")]) == 1
+    assert store.count() == 4
+    assert store.get_many(["a1"])["a1"]["published_at"] == "2026-10-01T08:00:00Z"
+
+
+def test_get_many_returns_full_rows_for_known_ids(store):
+    found = store.get_many(["a2", "missing", "a3"])
+
+    assert sorted(found) == ["a2", "a3"]
+    assert found["a2"]["source"] == "BBC" and found["a2"]["description"] == ""
+    assert store.get_many([]) == {}
+
+
+def test_query_filters_and_orders_newest_first(store):
+    def ids(**filters) -> list[str]:
+        return [a["id"] for a in store.query(**filters)]
+
+    assert ids() == ["a3", "a2", "a1"]
+    assert ids(category="business") == ["a2", "a1"]
+    assert ids(country="gb") == ids(source="BBC") == ["a2"]
+    assert ids(since=datetime(2026, 10, 2), until=datetime(2026, 10, 5, 8)) == ["a3", "a2"]
+    assert ids(limit=1) == ["a3"]
+
+
+def test_retention_deletes_by_fetch_date(store, monkeypatch):
+    assert store.delete_fetched_before(datetime(2026, 10, 4)) == 2
+    assert [a["id"] for a in store.query()] == ["a3"]
+
+    monkeypatch.setattr(settings, "auto_delete_enabled", False)
+    assert store.run_retention() == 0
+    monkeypatch.setattr(settings, "auto_delete_enabled", True)
+    monkeypatch.setattr(settings, "retention_weeks", 1)
+    monkeypatch.setattr(settings, "retention_months", 0)
+    store.insert_articles([article("fresh", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"))])
+    assert store.run_retention() == 1
+    assert [a["id"] for a in store.query()] == ["fresh"]
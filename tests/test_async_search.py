@@ -0,0 +1,88 @@
+"""Async search path: same results as sync, blocking calls on the I/O executor, loop stays free."""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from benchmarks.fakes import HashingModel, install_fakes
+from config.settings import settings
+from src.vector_db.local_store import LocalVectorStore
+
+ARTICLES = [
+    {"id": "rates", "title": "Central bank raises interest rates", "category": "business", "country": "us"},
+    {"id": "cup", "title": "Football club wins the cup final", "category": "sports", "country": "gb"},
+]
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> LocalVectorStore:
+    monkeypatch.setattr(settings, "index_generation_path", str(tmp_path / "generation"))
+    store = LocalVectorStore(index_dir=str(tmp_path / "index"))
+    install_fakes(store, HashingModel(dimension=64))
+    store.upsert_articles([dict(a) for a in ARTICLES])
+    return store
+
+
+def test_async_search_matches_sync(store):
+    async_results = asyncio.run(store.semantic_search_async("interest rates", top_k=2, category="business"))
+
+    store.query_cache.results.clear()
+    assert async_results == store.semantic_search("interest rates", top_k=2, category="business")
+    assert async_results[0]["id"] == "rates"
+
+
+def test_backend_calls_run_on_the_io_executor_with_the_request_context(store, monkeypatch):
+    seen = []
+    search = store.search_by_vector
+
+    def recording_search(*args, **kwargs):
+        seen.append((threading.current_thread().name, request_id.get()))
+        return search(*args, **kwargs)
+
+    monkeypatch.setattr(store, "search_by_vector", recording_search)
+
+    async def handler():
+        request_id.set("req-1")
+        return await store.semantic_search_async("cup final")
+
+    assert asyncio.run(handler())[0]["id"] == "cup"
+    assert len(seen) == 1
+    assert seen[0][0].startswith("vector-io") and seen[0][1] == "req-1"
+
+
+def test_slow_backend_does_not_block_the_event_loop(store, monkeypatch):
+    search = store.search_by_vector
+
+    def slow_search(*args, **kwargs):
+        time.sleep(0.3)
+        return search(*args, **kwargs)
+
+    monkeypatch.setattr(store, "search_by_vector", slow_search)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        queries = ["interest rates", "cup final", "rates", "cup"]
+        started = time.perf_counter()
+        results = await asyncio.gather(*(store.semantic_search_async(q) for q in queries))
+        elapsed = time.perf_counter() - started
+        task.cancel()
+        return results, ticks, elapsed
+
+    results, ticks, elapsed = asyncio.run(main())
+
+    assert len(results) == 4
+    assert ticks >= 10
+    assert elapsed < 4 * 0.3  # searches overlapped
@@ -0,0 +1,76 @@
+"""BaseVectorStore.batch_search: input order, partial cache hits and one encode per batch."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import HashingModel, install_fakes
+from config.settings import settings
+from src.vector_db.local_store import LocalVectorStore
+
+ARTICLES = [
+    {"id": "rates", "title": "Central bank raises interest rates", "category": "business", "country": "us"},
+    {"id": "cup", "title": "Football club wins the cup final", "category": "sports", "country": "gb"},
+    {"id": "chips", "title": "Chip maker unveils a new processor", "category": "technology", "country": "us"},
+]
+
+
+class CountingModel(HashingModel):
+    def __init__(self):
+        super().__init__(dimension=64)
+        self.encoded: list[list[str]] = []
+
+    def encode(self, texts, *args, **kwargs):
+        self.encoded.append(list(texts))
+        return super().encode(texts, *args, **kwargs)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> LocalVectorStore:
+    monkeypatch.setattr(settings, "index_generation_path", str(tmp_path / "generation"))
+    store = LocalVectorStore(index_dir=str(tmp_path / "index"))
+    install_fakes(store, CountingModel())
+    store.upsert_articles([dict(a) for a in ARTICLES])
+    store._encoder._model.encoded.clear()
+    return store
+
+
+def top_ids(batches: list[list[dict]]) -> list[str]:
+    return [results[0]["id"] if results else None for results in batches]
+
+
+@pytest.fixture(params=["sync", "async"])
+def batch_search(request, store):
+    if request.param == "sync":
+        return store.batch_search
+    return lambda queries, **kwargs: asyncio.run(store.batch_search_async(queries, **kwargs))
+
+
+def test_results_come_back_in_input_order(store, batch_search):
+    queries = [
+        {"query": "new processor"},
+        {"query": "cup final", "top_k": 1},
+        {"query": "interest rates", "category": "business"},
+        {"query": "cup final", "category": "business", "top_k": 1},
+    ]
+
+    batches = batch_search(queries, concurrency=4)
+
+    assert top_ids(batches) == ["chips", "cup", "rates", "rates"]
+    assert [len(b) for b in batches] == [3, 1, 1, 1]
+    assert batches == [store.semantic_search(**q) for q in queries]
+
+
+def test_cached_queries_are_served_and_the_rest_encoded_once(store, batch_search):
+    store.semantic_search("interest rates")
+    model = store._encoder._model
+    model.encoded.clear()
+
+    batches = batch_search([{"query": "interest rates"}, {"query": "cup final"}, {"query": "cup final", "top_k": 1}])
+
+    assert top_ids(batches) == ["rates", "cup", "cup"]
+    assert model.encoded == [["cup final"]]
+
+    model.encoded.clear()
+    assert batch_search([{"query": "cup final"}, {"query": "interest rates"}]) == [batches[1], batches[0]]
+    assert model.encoded == []
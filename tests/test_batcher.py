@@ -0,0 +1,99 @@
+"""BatchingEncoder: concurrent requests share one encode call, errors and forks are handled."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from src.embeddings.batcher import BatchingEncoder
+
+
+class RecordingEncoder:
+    """Encodes a text as [len(text)], recording each batch; the first call can be held open."""
+
+    def __init__(self, fail: bool = False):
+        self.batches: list[list[str]] = []
+        self.fail = fail
+        self.release = threading.Event()
+        self.release.set()
+
+    def encode(self, texts: list[str], batch_size: int = 32) -> list[list[float]]:
+        self.release.wait(5)
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [[float(len(t))] for t in texts]
+
+
+def test_concurrent_requests_share_one_forward_pass():
+    encoder = RecordingEncoder()
+    batcher = BatchingEncoder(encoder, max_batch=8, max_wait_ms=200)
+
+    futures = [batcher.submit(text) for text in ("a", "bb", "a", "ccc")]
+
+    assert [f.result(timeout=5) for f in futures] == [[1.0], [2.0], [1.0], [3.0]]
+    assert encoder.batches == [["a", "bb", "ccc"]]  # duplicates encoded once
+    assert batcher.stats()["requests"] == 4 and batcher.stats()["batches"] == 1
+
+
+def test_requests_queued_during_an_encode_form_the_next_batch():
+    encoder = RecordingEncoder()
+    encoder.release.clear()
+    batcher = BatchingEncoder(encoder, max_batch=2, max_wait_ms=0)
+
+    first = batcher.submit("first")
+    time.sleep(0.05)  # the worker is now blocked encoding "first"
+    rest = [batcher.submit(text) for text in ("x", "yy", "zzz")]
+    encoder.release.set()
+
+    assert first.result(timeout=5) == [5.0]
+    assert [f.result(timeout=5) for f in rest] == [[1.0], [2.0], [3.0]]
+    assert encoder.batches == [["first"], ["x", "yy"], ["zzz"]]
+
+
+def test_encode_errors_reach_every_caller_and_the_worker_survives():
+    encoder = RecordingEncoder(fail=True)
+    batcher = BatchingEncoder(encoder, max_batch=8, max_wait_ms=50)
+
+    futures = [batcher.submit(text) for text in ("a", "b")]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            future.result(timeout=5)
+
+    encoder.fail = False
+    assert batcher.encode("abc") == [3.0]
+
+
+def test_cancelled_requests_are_skipped():
+    encoder = RecordingEncoder()
+    encoder.release.clear()
+    batcher = BatchingEncoder(encoder, max_batch=8, max_wait_ms=0)
+    blocker = batcher.submit("blocker")
+    time.sleep(0.05)
+
+    cancelled = batcher.submit("cancelled")
+    kept = batcher.submit("kept")
+    assert cancelled.cancel()
+    encoder.release.set()
+
+    assert blocker.result(timeout=5) == [7.0] and kept.result(timeout=5) == [4.0]
+    assert encoder.batches == [["blocker"], ["kept"]]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_worker_restarts_in_a_forked_child():
+    batcher = BatchingEncoder(RecordingEncoder(), max_batch=8, max_wait_ms=0)
+    assert batcher.encode("parent") == [6.0]
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            code = 0 if batcher.submit("child").result(timeout=5) == [5.0] else 1
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert batcher.encode("parent again") == [12.0]
@@ -0,0 +1,73 @@
+"""ContextBuilder: MMR ordering, near-duplicate collapsing and the token budget."""
+
+from src.rag.context import MIN_SNIPPET_TOKENS, ContextBuilder, estimate_tokens
+
+
+def result(id: str, vector: list[float], similarity: float, description: str = "Short description") -> dict:
+    return {"id": id, "similarity": similarity, "vector": vector, "meta": {"title": f"Story {id}", "description": description}}
+
+
+def ids(results: list[dict]) -> list[str]:
+    return [r["id"] for r in results]
+
+
+def test_syndicated_copies_are_collapsed():
+    builder = ContextBuilder(max_tokens=1000, dedup_threshold=0.9, mmr_lambda=0.7)
+    results = [
+        result("a", [1.0, 0.0, 0.0], 0.95),
+        result("a-copy", [0.99, 0.01, 0.0], 0.94),
+        result("b", [0.0, 1.0, 0.0], 0.6),
+    ]
+
+    built = builder.build(results, top_k=3)
+
+    assert ids(built["sources"]) == ["a", "b"]
+    assert built["duplicates_dropped"] == 1
+
+
+def test_mmr_prefers_a_different_article_over_a_similar_one():
+    results = [
+        result("a", [1.0, 0.0, 0.0], 0.9),
+        result("close", [0.8, 0.6, 0.0], 0.85),
+        result("other", [0.0, 0.0, 1.0], 0.7),
+    ]
+
+    assert ids(ContextBuilder(max_tokens=1000, mmr_lambda=0.5).build(results, top_k=2)["sources"]) == ["a", "other"]
+    assert ids(ContextBuilder(max_tokens=1000, mmr_lambda=1.0).build(results, top_k=2)["sources"]) == ["a", "close"]
+
+
+def test_results_without_vectors_are_encoded():
+    encoded = []
+
+    def encode(texts: list[str]) -> list[list[float]]:
+        encoded.extend(texts)
+        return [[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]]
+
+    results = [{**result(i, [], s), "vector": None} for i, s in (("a", 0.9), ("a-copy", 0.8), ("b", 0.7))]
+
+    built = ContextBuilder(encode=encode, max_tokens=1000).build(results, top_k=3)
+
+    assert encoded == ["Story a Short description", "Story a-copy Short description", "Story b Short description"]
+    assert ids(built["sources"]) == ["a", "b"]
+
+
+def test_context_stays_within_the_budget_and_truncates_the_last_article():
+    long = " ".join(["word"] * 200)  # ~250 tokens
+    results = [result(i, [float(n == j) for j in range(3)], 0.9 - n / 10, long) for n, i in enumerate("abc")]
+    reserved = 100
+
+    built = ContextBuilder(max_tokens=reserved + 400).build(results, top_k=3, reserved_tokens=reserved)
+
+    assert ids(built["sources"]) == ["a", "b"]
+    assert built["context"].endswith("...")
+    assert built["context_tokens"] <= 400
+    assert estimate_tokens(built["context"]) <= 400
+    assert built["over_budget_dropped"] == 1
+
+
+def test_no_room_for_a_useful_snippet_drops_the_article():
+    results = [result("a", [1.0, 0.0], 0.9, " ".join(["word"] * 200))]
+
+    built = ContextBuilder(max_tokens=MIN_SNIPPET_TOKENS).build(results, top_k=1)
+
+    assert built["sources"] == [] and built["context"] == "No relevant articles found."
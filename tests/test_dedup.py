@@ -0,0 +1,134 @@
+"""Near-duplicate grouping: canonical assignment, merged coverage and retention."""
+
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from config.settings import settings
+from src.news_ingestion.dedup import NearDuplicateIndex, fingerprint_text
+from src.news_ingestion.storage import NewsStorage
+
+DESCRIPTION = "The central bank raised interest rates by half a point on Thursday, citing persistent inflation in services"
+
+
+def article(id: str, title: str, description: str = DESCRIPTION, category: str = "business", country: str = "us") -> dict:
+    return {"id": id, "title": title, "description": description, "category": category, "country": country}
+
+
+def make_index(tmp_path) -> NearDuplicateIndex:
+    return NearDuplicateIndex(path=str(tmp_path / "dedup.db"), threshold=0.7)
+
+
+def test_fingerprint_drops_source_suffix_and_punctuation():
+    a = fingerprint_text({"title": "Rates rise again - Reuters", "description": "Markets fall!"})
+    b = fingerprint_text({"title": "Rates rise again", "description": "Markets fall."})
+    assert a == b == "rates rise again markets fall"
+
+
+def test_near_duplicates_share_a_canonical_story(tmp_path):
+    index = make_index(tmp_path)
+    articles = [
+        article("a1", "Central bank raises rates by half a point - Reuters"),
+        article("a2", "Central bank raises rates by half a point", category="world", country="gb"),
+        article("b1", "Football club wins the cup", "A late goal settled the final in extra time at a packed stadium"),
+    ]
+
+    report = index.assign_canonical(articles)
+
+    assert [a["canonical_id"] for a in articles] == ["a1", "a1", "b1"]
+    assert report == {"articles": 3, "duplicates": 1, "new_stories": 2, "coverage_grown": 1}
+
+
+def test_known_articles_keep_their_assignment(tmp_path):
+    index = make_index(tmp_path)
+    index.assign_canonical([article("a1", "Central bank raises rates by half a point")])
+    again = [article("a1", "Central bank raises rates by half a point")]
+
+    report = index.assign_canonical(again)
+
+    assert again[0]["canonical_id"] == "a1"
+    assert report["new_stories"] == 0 and report["duplicates"] == 0
+
+
+def test_canonical_articles_merge_coverage(tmp_path):
+    index = make_index(tmp_path)
+    articles = [
+        article("a1", "Central bank raises rates by half a point"),
+        article("a2", "Central bank raises rates by half a point - BBC", category="world", country="gb"),
+        article("a3", "Central bank raises rates by half a point", category="world", country="us"),
+        article("b1", "Football club wins the cup", "A late goal settled the final in extra time at a packed stadium"),
+    ]
+    index.assign_canonical(articles)
+
+    stories = index.canonical_articles(articles)
+
+    assert [s["id"] for s in stories] == ["a1", "b1"]
+    assert stories[0]["categories"] == ["business", "world"]
+    assert stories[0]["countries"] == ["us", "gb"]
+    assert "categories" not in stories[1] and "countries" not in stories[1]
+    assert index.stats() == {"stories": 2, "variants": 2}
+
+
+def test_articles_without_canonical_id_stand_for_themselves(tmp_path):
+    index = make_index(tmp_path)
+    legacy = article("old", "Stored before deduplication was enabled")
+
+    assert index.canonical_articles([legacy]) == [legacy]
+
+
+def test_delete_seen_before_forgets_stale_stories(tmp_path):
+    index = make_index(tmp_path)
+    articles = [
+        article("a1", "Central bank raises rates by half a point"),
+        article("a2", "Central bank raises rates by half a point", category="world"),
+    ]
+    index.assign_canonical(articles)
+
+    assert index.delete_seen_before(datetime.utcnow() - timedelta(days=1)) == 0
+    assert index.delete_seen_before(datetime.utcnow() + timedelta(seconds=1)) == 1
+    assert index.stats() == {"stories": 0, "variants": 0}
+    with closing(sqlite3.connect(index.path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM bands").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM members").fetchone()[0] == 0
+
+    fresh = [article("a2", "Central bank raises rates by half a point", category="world")]
+    assert index.assign_canonical(fresh)["new_stories"] == 1
+    assert fresh[0]["canonical_id"] == "a2"
+
+
+def _age_story(index: NearDuplicateIndex, story_id: str, days: int) -> None:
+    first_seen = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    with closing(sqlite3.connect(index.path)) as conn, conn:
+        conn.execute("UPDATE canonical SET first_seen = ? WHERE id = ?", (first_seen, story_id))
+
+
+def test_run_retention_applies_the_storage_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "retention_weeks", 4)
+    monkeypatch.setattr(settings, "retention_months", 3)
+    index = make_index(tmp_path)
+    index.assign_canonical([
+        article("old", "Central bank raises rates by half a point"),
+        article("new", "Football club wins the cup", "A late goal settled the final in extra time at a packed stadium"),
+    ])
+    _age_story(index, "old", days=100)  # beyond the 3-month window, the longer of the two
+    _age_story(index, "new", days=60)
+
+    monkeypatch.setattr(settings, "auto_delete_enabled", False)
+    assert index.run_retention() == 0
+
+    monkeypatch.setattr(settings, "auto_delete_enabled", True)
+    assert index.run_retention() == 1
+    with closing(sqlite3.connect(index.path)) as conn:
+        remaining = [json.loads(row[0])["id"] for row in conn.execute("SELECT article FROM canonical")]
+    assert remaining == ["new"]
+
+
+def test_stored_stories_match_any_covered_category_and_country(tmp_path):
+    storage = NewsStorage(data_dir=str(tmp_path / "news"))
+    story = article("a1", "Central bank raises rates by half a point")
+    story.update(categories=["business", "world"], countries=["us", "gb"], published_at=datetime.utcnow().isoformat())
+    storage.save_articles([story])
+
+    assert [a["id"] for a in storage.iter_articles(categories=["world"], countries=["gb"])] == ["a1"]
+    assert list(storage.iter_articles(categories=["sports"])) == []
@@ -0,0 +1,44 @@
+"""EmbeddingCache: shared slots across instances and the writer-only write path."""
+
+import pytest
+
+from src.embeddings.cache import EmbeddingCache, shared_cache
+
+
+def make_cache(path, slots=4):
+    cache = EmbeddingCache("test-model", cache_dir=str(path), max_mb=1, dtype="float32")
+    cache.max_bytes = slots * 4 * 4  # ``slots`` vectors of dimension 4
+    return cache
+
+
+def test_written_vectors_are_visible_to_other_instances(tmp_path):
+    writer = make_cache(tmp_path)
+    with writer.writer():
+        writer.put_many(["article A"], [[1, 1, 1, 1]])
+
+    assert make_cache(tmp_path).get_many(["article A", "other"]) == [[1.0, 1.0, 1.0, 1.0], None]
+
+
+def test_reused_slot_is_a_miss_not_another_texts_vector(tmp_path):
+    reader = make_cache(tmp_path)
+    with reader.writer():
+        reader.put_many(["article A"], [[1, 1, 1, 1]])
+    assert reader.get_many(["article A"]) == [[1.0, 1.0, 1.0, 1.0]]
+
+    other = make_cache(tmp_path)  # e.g. the ingest job in another process
+    with other.writer():
+        other.put_many([f"text {i}" for i in range(8)], [[i] * 4 for i in range(8)])
+
+    assert reader.get_many(["article A"]) == [None]
+    assert reader.get_many(["text 7"]) == [[7.0, 7.0, 7.0, 7.0]]
+
+
+def test_put_many_outside_writer_is_rejected(tmp_path):
+    cache = make_cache(tmp_path)
+    with pytest.raises(RuntimeError):
+        cache.put_many(["query"], [[9, 9, 9, 9]])
+
+
+def test_shared_cache_is_one_instance_per_model_and_dir(tmp_path):
+    assert shared_cache("m", str(tmp_path)) is shared_cache("m", str(tmp_path))
+    assert shared_cache("m", str(tmp_path)) is not shared_cache("other", str(tmp_path))
@@ -0,0 +1,171 @@
+"""EndeeVectorStore against FakeEndee: cached index handles, weekly partitions and retention."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.fakes import FakeEndee, HashingModel, install_fakes
+from config.settings import settings
+from src.vector_db.endee_client import EndeeVectorStore
+
+
+class CountingEndee(FakeEndee):
+    """FakeEndee that counts control-plane round trips."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = {"list_indexes": 0, "create_index": 0, "get_index": 0}
+
+    def list_indexes(self):
+        self.calls["list_indexes"] += 1
+        return super().list_indexes()
+
+    def create_index(self, name, dimension, **kwargs):
+        self.calls["create_index"] += 1
+        return super().create_index(name, dimension, **kwargs)
+
+    def get_index(self, name):
+        self.calls["get_index"] += 1
+        return super().get_index(name)
+
+
+def make_store(tmp_path, monkeypatch, partitioning: str = "none") -> EndeeVectorStore:
+    monkeypatch.setattr(settings, "index_generation_path", str(tmp_path / "generation"))
+    monkeypatch.setattr(settings, "index_ledger_path", str(tmp_path / "ledger.json"))
+    store = EndeeVectorStore(index_name="news", partitioning=partitioning)
+    install_fakes(store, HashingModel(dimension=32))
+    store._client = CountingEndee()
+    return store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> EndeeVectorStore:
+    return make_store(tmp_path, monkeypatch)
+
+
+def test_index_handle_is_resolved_once(store):
+    store.upsert_articles([{"id": "a1", "title": "Rates rise", "category": "business", "country": "us"}])
+    vector = store.embed_query("rates")
+    for _ in range(5):
+        assert store.search_by_vector(vector, top_k=1)[0]["id"] == "a1"
+
+    assert store._client.calls == {"list_indexes": 1, "create_index": 1, "get_index": 1}
+
+
+def test_handle_is_re_resolved_after_the_ttl(store):
+    store.ensure_index(dimension=32)
+    store.index_ttl = 0
+
+    store.search_by_vector(store.embed_query("rates"))
+
+    assert store._client.calls["get_index"] == 2
+    assert store._client.calls["create_index"] == 1
+
+
+def test_failed_call_re_resolves_the_handle_and_retries_once(store):
+    store.upsert_articles([{"id": "a1", "title": "Rates rise", "category": "business", "country": "us"}])
+    stale = store._indexes["news"][0]
+
+    def broken(**kwargs):
+        raise ConnectionError("connection reset")
+
+    stale.query = broken
+    store._client.indexes["news"] = type(stale)(32)
+    store._client.indexes["news"].upsert([{"id": "a2", "vector": store.embed_query("rates"), "meta": {}}])
+
+    assert [r["id"] for r in store.search_by_vector(store.embed_query("rates"))] == ["a2"]
+    assert store._client.calls["get_index"] == 2
+
+
+def test_reset_connections_forgets_client_and_handles(store):
+    store.ensure_index(dimension=32)
+
+    store.reset_connections()
+
+    assert store._client is None and store._indexes == {}
+
+
+WEEKLY = [
+    {"id": "w40", "title": "Rates rise again", "published_at": "2026-09-29T10:00:00Z"},
+    {"id": "w41-mon", "title": "Rates rise on Monday", "published_at": "2026-10-05T09:00:00Z"},
+    {"id": "w41-wed", "title": "Rates rise on Wednesday", "published_at": "2026-10-07T18:30:00+02:00"},
+    {"id": "w32", "title": "Rates rise in August", "published_at": "2026-08-04T12:00:00Z"},
+]
+
+
+@pytest.fixture
+def weekly(tmp_path, monkeypatch) -> EndeeVectorStore:
+    monkeypatch.setattr(settings, "auto_delete_enabled", False)
+    store = make_store(tmp_path, monkeypatch, partitioning="weekly")
+    store.upsert_articles([dict(a) for a in WEEKLY])
+    return store
+
+
+def search_ids(store: EndeeVectorStore, **kwargs) -> list[str]:
+    return sorted(r["id"] for r in store.search_by_vector(store.embed_query("rates rise"), **kwargs))
+
+
+def test_articles_are_routed_to_their_iso_week(weekly):
+    assert sorted(weekly._client.indexes) == ["news_2026W32", "news_2026W40", "news_2026W41"]
+    week41 = weekly._client.indexes["news_2026W41"].query(vector=weekly.embed_query("rates"), top_k=10)
+    assert sorted(r["id"] for r in week41) == ["w41-mon", "w41-wed"]  # +02:00 is converted to UTC
+
+
+def test_windowed_search_only_queries_overlapping_partitions(weekly, monkeypatch):
+    queried = []
+    call_index = weekly._call_index
+
+    def recording_call_index(fn, name, *args, **kwargs):
+        queried.append(name)
+        return call_index(fn, name, *args, **kwargs)
+
+    monkeypatch.setattr(weekly, "_call_index", recording_call_index)
+
+    assert search_ids(weekly, since="2026-10-01") == ["w41-mon", "w41-wed"]
+    assert sorted(queried) == ["news_2026W40", "news_2026W41"]
+    assert search_ids(weekly) == ["w32", "w40", "w41-mon", "w41-wed"]
+
+
+def test_date_only_until_covers_the_whole_day(weekly):
+    assert search_ids(weekly, since="2026-10-05", until="2026-10-07") == ["w41-mon", "w41-wed"]
+    assert search_ids(weekly, since="2026-10-05", until="2026-10-07T12:00:00") == ["w41-mon"]
+
+
+def test_windowed_search_widens_when_filtering_leaves_it_short(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "auto_delete_enabled", False)
+    store = make_store(tmp_path, monkeypatch, partitioning="weekly")
+    # Every close match is outside the window; the in-window article ranks last in its week.
+    near = [{"id": f"near{i}", "title": "Rates rise", "published_at": "2026-10-05T08:00:00Z"} for i in range(6)]
+    far = {"id": "far", "title": "Rates rise after a long wait", "published_at": "2026-10-09T08:00:00Z"}
+    store.upsert_articles(near + [far])
+
+    results = store.search_by_vector(store.embed_query("rates rise"), top_k=1, since="2026-10-08")
+
+    assert [r["id"] for r in results] == ["far"]
+
+
+def test_drop_expired_deletes_whole_partitions(weekly):
+    generation = weekly.query_cache.generation.current()
+
+    dropped = weekly.drop_expired(datetime(2026, 10, 5))
+
+    assert dropped == 2
+    assert sorted(weekly._client.indexes) == ["news_2026W41"]
+    assert weekly.query_cache.generation.current() > generation
+    assert search_ids(weekly) == ["w41-mon", "w41-wed"]
+    assert weekly.drop_expired(datetime(2026, 10, 5)) == 0
+
+
+def test_articles_past_retention_are_not_written(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "auto_delete_enabled", True)
+    monkeypatch.setattr(settings, "retention_weeks", 4)
+    store = make_store(tmp_path, monkeypatch, partitioning="weekly")
+    now = datetime.utcnow()
+
+    store.upsert_articles([
+        {"id": "fresh", "title": "Rates rise", "published_at": now.isoformat()},
+        {"id": "stale", "title": "Rates rise", "published_at": (now - timedelta(weeks=10)).isoformat()},
+    ])
+
+    assert list(store._client.indexes) == [store._partition_for(now.isoformat())]
+    assert search_ids(store) == ["fresh"]
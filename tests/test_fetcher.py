@@ -0,0 +1,79 @@
+"""NewsFetcher.fetch_all against the fake feed server: feeds fetched concurrently, within the limits."""
+
+import asyncio
+import threading
+
+import pytest
+
+from benchmarks.fakes import FeedServer
+from src.news_ingestion.feed_cache import FeedStateCache
+from src.news_ingestion.fetcher import NewsFetcher
+
+
+def raw(n: int, published: str = "2026-10-05T08:00:00Z") -> dict:
+    return {
+        "title": f"Story {n}",
+        "description": f"Description of story {n}",
+        "url": f"https://example.com/{n}",
+        "publishedAt": published,
+        "source": {"name": "Example"},
+    }
+
+
+class CountingFeedServer(FeedServer):
+    """FeedServer that records how many requests it served at once."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    class Handler(FeedServer.Handler):
+        def do_GET(self):
+            feeds = self.server.owner
+            with feeds.lock:
+                feeds.active += 1
+                feeds.peak = max(feeds.peak, feeds.active)
+            try:
+                super().do_GET()
+            finally:
+                with feeds.lock:
+                    feeds.active -= 1
+
+
+@pytest.fixture
+def feeds():
+    items = [(raw(1), "business", "us"), (raw(2), "sports", "gb"), (raw(1), "business", "in")]
+    items.append(({**raw(3), "title": "[Removed]"}, "health", "au"))
+    with CountingFeedServer(items, latency_ms=50) as server:
+        yield server
+
+
+def make_fetcher(feeds: FeedServer, tmp_path) -> NewsFetcher:
+    return NewsFetcher(base_url=feeds.url, feed_state=FeedStateCache(str(tmp_path / "feed_state.json")))
+
+
+def test_fetch_all_requests_every_feed_concurrently(feeds, tmp_path):
+    fetcher = make_fetcher(feeds, tmp_path)
+    total = len(fetcher._feeds())
+
+    articles = asyncio.run(fetcher.fetch_all(concurrency=8, per_host_limit=16, conditional=False))
+
+    assert feeds.requests == total
+    assert 1 < feeds.peak <= 8
+    assert sorted(a["title"] for a in articles) == ["Story 1", "Story 2"]  # same story in two feeds, once
+    report = fetcher.last_fetch_report
+    assert report["feeds_total"] == total and report["failed"] == 0 and report["articles"] == 2
+
+
+def test_failed_feed_is_reported_without_failing_the_run(feeds, tmp_path):
+    fetcher = make_fetcher(feeds, tmp_path)
+    broken = "/top-headlines/category/sports/gb.json"
+    del feeds.payloads[broken]
+
+    articles = asyncio.run(fetcher.fetch_all(conditional=False))
+
+    assert [a["title"] for a in articles] == ["Story 1"]
+    failed = [f for f in fetcher.last_fetch_report["feeds"] if f["error"]]
+    assert [f["url"] for f in failed] == [feeds.url + broken]
+    assert failed[0]["status"] == "error" and "404" in failed[0]["error"]
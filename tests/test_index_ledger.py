@@ -0,0 +1,68 @@
+"""IndexLedger and incremental indexing: only new, changed or re-modelled articles are embedded."""
+
+import pytest
+
+from benchmarks.fakes import HashingModel, install_fakes
+from config.settings import settings
+from src.vector_db.ledger import IndexLedger
+from src.vector_db.local_store import LocalVectorStore
+
+
+def article(id: str, title: str, description: str = "") -> dict:
+    return {"id": id, "title": title, "description": description, "category": "business", "country": "us"}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> LocalVectorStore:
+    monkeypatch.setattr(settings, "index_generation_path", str(tmp_path / "generation"))
+    store = LocalVectorStore(index_dir=str(tmp_path / "index"))
+    install_fakes(store, HashingModel(dimension=32))
+    return store
+
+
+def test_ledger_tracks_text_and_model(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    ledger = IndexLedger(path)
+    ledger.record("a1", "rates rise", "model-a", partition="news_vectors_2026W41")
+    ledger.save()
+
+    reloaded = IndexLedger(path)
+    assert "a1" in reloaded and len(reloaded) == 1
+    assert not reloaded.needs_indexing("a1", "rates rise", "model-a")
+    assert reloaded.needs_indexing("a1", "rates rise again", "model-a")
+    assert reloaded.needs_indexing("a1", "rates rise", "model-b")
+    assert reloaded.needs_indexing("a2", "rates rise", "model-a")
+    assert reloaded.forget_partitions(["news_vectors_2026W41"]) == 1 and len(reloaded) == 0
+
+
+def test_unchanged_articles_are_skipped(store):
+    articles = [article("a1", "Rates rise"), article("a2", "Cup final")]
+    assert store.upsert_new_articles(articles) == 2
+
+    assert store.upsert_new_articles(articles) == 0
+    assert store.last_upsert_skipped == 2
+
+    articles[1]["description"] = "Extra time decided it"
+    assert store.upsert_new_articles(articles) == 1
+    assert store.last_upsert_skipped == 1
+    assert len(store) == 2
+
+
+def test_model_change_and_full_reindex_embed_everything(store):
+    articles = [article("a1", "Rates rise"), article("a2", "Cup final")]
+    store.upsert_new_articles(articles)
+
+    assert store.upsert_new_articles(articles, full_reindex=True) == 2
+
+    store._get_encoder().model_name = "another-model"
+    assert store.upsert_new_articles(articles) == 2
+    assert store.upsert_new_articles(articles) == 0
+
+
+def test_growing_coverage_reindexes_a_story(store):
+    story = article("a1", "Rates rise")
+    store.upsert_new_articles([story])
+
+    story.update(categories=["business", "world"], countries=["us"])
+    assert store.upsert_new_articles([story]) == 1
+    assert [r["id"] for r in store.search_by_vector(store.embed_query("Rates rise"), category="world")] == ["a1"]
@@ -0,0 +1,135 @@
+"""IngestJobs: stage checkpoints, resume after a failure, the resume cap and the single-flight lock."""
+
+import json
+from typing import Optional
+
+import pytest
+
+from config.settings import settings
+from src.news_ingestion.jobs import STAGES, IngestBusyError, IngestJobs, IngestLock
+
+ARTICLES = [{"id": "rates", "title": "Central bank raises interest rates"}]
+
+
+class Stages:
+    """Stand-in stages that record their runs; ``fail`` names a stage that raises once."""
+
+    def __init__(self, jobs: IngestJobs, fail: Optional[str] = None):
+        self.jobs = jobs
+        self.fail = fail
+        self.runs: list[str] = []
+
+    def install(self, monkeypatch) -> "Stages":
+        for stage in STAGES:
+            monkeypatch.setattr(self.jobs, f"_stage_{stage}", self._stage(stage))
+        return self
+
+    def _stage(self, name: str):
+        async def run(job, state):
+            self.runs.append(name)
+            if name == self.fail:
+                self.fail = None
+                raise RuntimeError(f"{name} broke")
+            if name == "fetch":
+                self.jobs._checkpoint(job, state, [dict(a) for a in ARTICLES])
+            return {"articles": len(self.jobs._articles(job, state))}
+
+        return run
+
+
+@pytest.fixture
+def jobs(tmp_path) -> IngestJobs:
+    return IngestJobs(jobs_dir=str(tmp_path / "jobs"), keep=10)
+
+
+def test_job_runs_every_stage_and_removes_its_checkpoint(jobs, monkeypatch):
+    stages = Stages(jobs).install(monkeypatch)
+
+    job = jobs.run_now()
+
+    assert stages.runs == list(STAGES)
+    assert job["status"] == "succeeded" and job["resumed"] == 0
+    assert all(jobs.get(job["id"])["stages"][s]["status"] == "done" for s in STAGES)
+    assert not jobs._articles_path(job["id"]).exists()
+    assert jobs.lock.holder() is None and jobs.lock.acquire("next")
+
+
+def test_failed_job_resumes_from_its_first_unfinished_stage(jobs, monkeypatch):
+    stages = Stages(jobs, fail="store").install(monkeypatch)
+
+    failed = jobs.run_now()
+
+    assert failed["status"] == "failed" and failed["error"] == "store broke"
+    assert failed["stages"]["store"]["status"] == "failed"
+    assert jobs._articles_path(failed["id"]).exists()
+
+    stages.runs.clear()
+    resumed = jobs.run_now()
+
+    assert resumed["id"] == failed["id"]
+    assert resumed["status"] == "succeeded" and resumed["resumed"] == 1 and resumed["error"] is None
+    assert stages.runs == ["store", "retention", "index"]  # articles come from the checkpoint
+
+
+def test_job_is_abandoned_after_the_resume_cap(jobs, monkeypatch):
+    monkeypatch.setattr(settings, "ingest_max_resumes", 1)
+    stages = Stages(jobs, fail="index").install(monkeypatch)
+    first = jobs.run_now()
+    stages.fail = "index"
+    assert jobs.run_now()["id"] == first["id"]
+
+    stages.runs.clear()
+    job = jobs.run_now()
+
+    assert job["id"] != first["id"] and job["status"] == "succeeded"
+    assert stages.runs == list(STAGES)
+    abandoned = jobs.get(first["id"])
+    assert abandoned["status"] == "abandoned" and "Gave up after 1 resumes" in abandoned["error"]
+    assert not jobs._articles_path(first["id"]).exists()
+
+
+def test_unreadable_checkpoint_starts_a_new_job(jobs, monkeypatch):
+    stages = Stages(jobs, fail="dedup").install(monkeypatch)
+    failed = jobs.run_now()
+    jobs._articles_path(failed["id"]).write_text("[{", encoding="utf-8")
+
+    stages.runs.clear()
+    job = jobs.run_now()
+
+    assert job["id"] != failed["id"] and job["status"] == "succeeded"
+    assert stages.runs == list(STAGES)
+    assert jobs.get(failed["id"])["error"].startswith("Unreadable checkpoint")
+
+
+def test_full_reindex_supersedes_an_unfinished_job(jobs, monkeypatch):
+    Stages(jobs, fail="index").install(monkeypatch)
+    failed = jobs.run_now()
+
+    job = jobs.run_now(full_reindex=True)
+
+    assert job["id"] != failed["id"] and job["full_reindex"] is True
+    assert jobs.get(failed["id"])["status"] == "abandoned"
+
+
+def test_busy_lock_rejects_a_second_ingest(jobs, monkeypatch):
+    stages = Stages(jobs).install(monkeypatch)
+    other = IngestLock(jobs.lock.path)  # another process's handle on the same lock file
+    assert other.acquire("other-job")
+
+    with pytest.raises(IngestBusyError) as excinfo:
+        jobs.run_now()
+
+    assert excinfo.value.holder["job_id"] == "other-job"
+    assert stages.runs == [] and jobs.recent() == []
+
+    other.release()
+    assert jobs.run_now()["status"] == "succeeded"
+
+
+def test_job_files_are_never_left_half_written(jobs, monkeypatch):
+    Stages(jobs).install(monkeypatch)
+
+    job = jobs.run_now()
+
+    assert json.loads(jobs._job_path(job["id"]).read_text(encoding="utf-8"))["status"] == "succeeded"
+    assert not list(jobs.jobs_dir.glob("*.tmp"))
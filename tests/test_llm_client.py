@@ -0,0 +1,85 @@
+"""OllamaClient against the fake Ollama server: streaming, coalescing, cancellation and the queue limit."""
+
+import threading
+import time
+
+import pytest
+
+from benchmarks.fakes import OllamaServer
+from src.rag.llm_client import LLMQueueFullError, OllamaClient
+
+
+@pytest.fixture
+def ollama():
+    with OllamaServer(tokens=5, first_token_ms=100, token_ms=20) as server:
+        yield server
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_stream_sync_yields_every_token(ollama):
+    client = OllamaClient(base_url=ollama.url)
+
+    assert "".join(client.stream_sync("hello", model="m")) == "".join(f" token{i}" for i in range(5))
+    assert client.stats()["generations"] == 1
+
+
+def test_same_prompt_joins_the_running_generation(ollama):
+    client = OllamaClient(base_url=ollama.url)
+    answers = []
+
+    def ask():
+        answers.append("".join(client.stream_sync("same prompt", model="m")))
+
+    threads = [threading.Thread(target=ask) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(answers)) == 1 and len(answers) == 3
+    assert ollama.requests == 1
+    assert client.stats()["coalesced"] == 2
+
+
+def test_generation_nobody_reads_is_cancelled(ollama):
+    client = OllamaClient(base_url=ollama.url)
+    tokens = client.stream_sync("abandoned", model="m")
+    next(tokens)
+    tokens.close()
+
+    wait_for(lambda: client.stats()["cancelled"] == 1)
+    stats = client.stats()
+    assert stats["in_flight"] == 0 and stats["generations"] == 0
+
+    # The next caller starts a fresh generation rather than joining the cancelled one.
+    assert len(list(client.stream_sync("abandoned", model="m"))) == 5
+    assert ollama.requests == 2
+
+
+def test_generation_survives_while_a_subscriber_remains(ollama):
+    client = OllamaClient(base_url=ollama.url)
+    first = client.stream_sync("shared", model="m")
+    next(first)
+    second = client.stream_sync("shared", model="m")
+    next(second)
+    first.close()
+
+    assert len(list(second)) == 4
+    assert client.stats()["cancelled"] == 0
+
+
+def test_queue_limit_rejects_extra_generations(ollama):
+    client = OllamaClient(base_url=ollama.url, max_concurrency=1, max_queue=0)
+    running = client.stream_sync("first", model="m")
+    next(running)
+
+    with pytest.raises(LLMQueueFullError):
+        list(client.stream_sync("second", model="m"))
+    assert client.stats()["rejected"] == 1
+    assert len(list(running)) == 4
@@ -0,0 +1,77 @@
+"""LocalVectorStore: exact top-k with filters, in-place updates and reloads across instances."""
+
+import pytest
+
+from benchmarks.fakes import HashingModel, install_fakes
+from config.settings import settings
+from src.vector_db.base import BaseVectorStore
+from src.vector_db.local_store import LocalVectorStore
+
+ARTICLES = [
+    {"id": "rates", "title": "Central bank raises interest rates", "category": "business", "country": "us",
+     "published_at": "2026-10-01T08:00:00Z"},
+    {"id": "bonds", "title": "Bond yields rise after interest rates decision", "category": "business", "country": "gb",
+     "published_at": "2026-10-03T08:00:00Z"},
+    {"id": "cup", "title": "Football club wins the cup final", "category": "sports", "country": "gb",
+     "published_at": "2026-10-05T08:00:00Z"},
+]
+
+
+def make_store(tmp_path) -> LocalVectorStore:
+    store = LocalVectorStore(index_dir=str(tmp_path / "index"))
+    install_fakes(store, HashingModel(dimension=64))
+    return store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> LocalVectorStore:
+    monkeypatch.setattr(settings, "index_generation_path", str(tmp_path / "generation"))
+    store = make_store(tmp_path)
+    store.upsert_articles([dict(a) for a in ARTICLES])
+    return store
+
+
+def test_from_settings_selects_the_local_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "vector_backend", "local")
+    monkeypatch.setattr(settings, "local_index_dir", str(tmp_path / "index"))
+    monkeypatch.setattr(settings, "index_generation_path", str(tmp_path / "generation"))
+
+    assert isinstance(BaseVectorStore.from_settings(), LocalVectorStore)
+
+
+def test_search_ranks_by_similarity_and_applies_filters(store):
+    vector = store.embed_query("interest rates")
+
+    assert [r["id"] for r in store.search_by_vector(vector, top_k=2)] == ["rates", "bonds"]
+    assert [r["id"] for r in store.search_by_vector(vector, country="gb")] == ["bonds", "cup"]
+    assert [r["id"] for r in store.search_by_vector(vector, category="sports", country="us")] == []
+    assert [r["id"] for r in store.search_by_vector(vector, since="2026-10-02", until="2026-10-04")] == ["bonds"]
+    hit = store.search_by_vector(vector, top_k=1, include_vectors=True)[0]
+    assert hit["meta"]["title"] == ARTICLES[0]["title"] and len(hit["vector"]) == 64
+
+
+def test_search_many_matches_single_searches(store):
+    vectors = [store.embed_query("interest rates"), store.embed_query("cup final")]
+
+    many = store.search_many_by_vector(vectors, top_k=2, category="business")
+
+    assert many == [store.search_by_vector(v, top_k=2, category="business") for v in vectors]
+
+
+def test_upsert_replaces_existing_ids(store):
+    store.upsert_articles([{**ARTICLES[2], "title": "Cup final postponed", "category": "world"}])
+
+    assert len(store) == 3
+    hits = store.search_by_vector(store.embed_query("cup final postponed"), category="world")
+    assert [(h["id"], h["meta"]["title"]) for h in hits] == [("cup", "Cup final postponed")]
+    assert store.search_by_vector(store.embed_query("cup final"), category="sports") == []
+
+
+def test_another_instance_sees_new_writes(store, tmp_path):
+    reader = make_store(tmp_path)
+    assert len(reader) == 3
+
+    store.upsert_articles([{"id": "chips", "title": "Chip maker unveils new processor", "category": "technology"}])
+
+    assert len(reader) == 4
+    assert reader.search_by_vector(reader.embed_query("new processor"), top_k=1)[0]["id"] == "chips"
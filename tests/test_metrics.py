@@ -0,0 +1,81 @@
+"""ServerTimingMiddleware: Server-Timing header from the request's stages, and per-route latency."""
+
+import asyncio
+import re
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.observability import metrics
+from src.observability.metrics import ServerTimingMiddleware, timed
+
+
+def make_app(header: bool) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, header=header)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        with timed("embed"):
+            pass
+        # Calls in worker threads count too: they run in a copy of the request's context.
+        for _ in range(3):
+            await asyncio.to_thread(run_timed, "endee")
+        return {"id": item_id}
+
+    @app.get("/missing")
+    def missing():
+        raise HTTPException(status_code=404, detail="nope")
+
+    return app
+
+
+def run_timed(stage: str) -> None:
+    with timed(stage, "query"):
+        pass
+
+
+def parse(header: str) -> dict[str, str]:
+    return {part.split(";", 1)[0]: part for part in header.split(", ")}
+
+
+def request_count(route: str, status: str) -> int:
+    series = metrics.REQUEST_SECONDS._series.get(("GET", route, status))
+    return series[-1] if series else 0
+
+
+def test_header_lists_each_stage_with_its_call_count():
+    with TestClient(make_app(header=True)) as client:
+        response = client.get("/items/a1")
+
+    parts = parse(response.headers["server-timing"])
+    assert list(parts) == ["embed", "endee", "total"]
+    assert re.fullmatch(r"embed;dur=\d+\.\d", parts["embed"])
+    assert re.fullmatch(r'endee;dur=\d+\.\d;desc="3 calls"', parts["endee"])
+    assert re.fullmatch(r"total;dur=\d+\.\d", parts["total"])
+
+
+def test_header_is_off_unless_enabled():
+    with TestClient(make_app(header=False)) as client:
+        response = client.get("/items/a1")
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+@pytest.mark.parametrize("path, route, status", [("/items/a1", "/items/{item_id}", "200"), ("/missing", "/missing", "404")])
+def test_latency_is_recorded_per_route_template_and_status(path, route, status):
+    before = request_count(route, status)
+
+    with TestClient(make_app(header=False)) as client:
+        client.get(path)
+
+    assert request_count(route, status) == before + 1
+
+
+def test_timings_are_only_collected_inside_a_request():
+    with TestClient(make_app(header=True)) as client:
+        client.get("/items/a1")
+
+    assert metrics._request_timings.get() is None
@@ -0,0 +1,74 @@
+"""UserProfileStore: incremental interest updates, click folding and model switches."""
+
+import numpy as np
+import pytest
+
+from src.recommendations.profiles import UserProfileStore
+
+MODEL = "test-model"
+
+
+def unit(*values: float) -> list[float]:
+    vector = np.asarray(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+@pytest.fixture
+def store(tmp_path) -> UserProfileStore:
+    return UserProfileStore(path=str(tmp_path / "profiles.db"))
+
+
+def test_only_new_interests_need_vectors(store):
+    store.set_interests("u1", {"markets": None}, {"markets": unit(1, 0, 0)}, MODEL)
+
+    assert store.missing_interests("u1", ["markets", "football"], MODEL) == ["football"]
+    assert store.missing_interests("u1", ["markets"], "other-model") == ["markets"]
+
+    profile = store.set_interests("u1", {"markets": 2.0, "football": None}, {"football": unit(0, 1, 0)}, MODEL)
+
+    assert profile["interests"] == ["markets", "football"]
+    assert profile["weights"].tolist() == [2.0, 1.0]
+    np.testing.assert_allclose(profile["vectors"][0], unit(1, 0, 0))
+
+
+def test_interests_removed_meanwhile_are_encoded_in_the_transaction(store):
+    store.set_interests("u1", {"markets": None}, {"markets": unit(1, 0, 0)}, MODEL)
+    assert store.missing_interests("u1", ["markets"], MODEL) == []
+    store.set_interests("u1", {}, {}, MODEL)  # a concurrent update drops "markets"
+
+    encoded = []
+
+    def encode(texts: list[str]) -> list[list[float]]:
+        encoded.extend(texts)
+        return [unit(1, 0, 0) for _ in texts]
+
+    profile = store.set_interests("u1", {"markets": None}, {}, MODEL, encode=encode)
+
+    assert encoded == ["markets"]
+    assert profile["interests"] == ["markets"]
+    with pytest.raises(ValueError):
+        store.set_interests("u1", {"football": None}, {}, MODEL)
+
+
+def test_clicks_boost_the_closest_interest_and_move_the_centroid(store):
+    vectors = {"markets": unit(1, 0, 0), "football": unit(0, 1, 0)}
+    store.set_interests("u1", {"markets": None, "football": None}, vectors, MODEL)
+
+    profile = store.add_click("u1", "a1", unit(0, 1, 0.1), MODEL)
+
+    assert profile["weights"][1] > profile["weights"][0]
+    assert profile["click_count"] == 1 and profile["seen"] == ["a1"]
+    assert profile["centroid"] @ np.asarray(unit(0, 1, 0)) > profile["centroid"] @ np.asarray(unit(1, 0, 0))
+    assert store.get("u1")["click_count"] == 1
+
+
+def test_switching_models_starts_over_but_keeps_seen(store):
+    store.set_interests("u1", {"markets": None}, {"markets": unit(1, 0, 0)}, MODEL)
+    store.add_click("u1", "a1", unit(1, 0, 0), MODEL)
+
+    profile = store.set_interests("u1", {"markets": None}, {"markets": unit(1, 0, 0, 0)}, "new-model")
+
+    assert profile["model"] == "new-model"
+    assert profile["click_count"] == 0 and profile["clicks"] is None
+    assert profile["seen"] == ["a1"]
+    assert store.delete("u1") and store.get("u1") is None
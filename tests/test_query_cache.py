@@ -0,0 +1,91 @@
+"""LRUCache eviction/TTL and IndexGeneration invalidation across instances."""
+
+from src.vector_db import query_cache
+from src.vector_db.query_cache import IndexGeneration, LRUCache, QueryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_tracks_sizes_and_replaced_keys():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1, size=10)
+    cache.put("a", 2, size=4)
+    cache.put("b", 3, size=5)
+    cache.put("c", 4, size=6)  # evicts "a"
+
+    assert cache.bytes == 11
+    assert cache.stats()["entries"] == 2
+
+
+def test_lru_disabled_with_zero_entries():
+    cache = LRUCache(max_entries=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+
+def test_lru_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(query_cache.time, "monotonic", clock)
+    cache = LRUCache(max_entries=10, ttl=30)
+    cache.put("a", 1, size=8)
+
+    clock.now += 29
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.bytes == 0
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_generation_bump_is_seen_by_another_instance(tmp_path):
+    path = str(tmp_path / "generation")
+    api, ingest = IndexGeneration(path), IndexGeneration(path)
+    assert api.current() == 0
+
+    ingest.bump()
+    assert api.current() == 1
+    assert api.bump() == 2
+    assert ingest.current() == 2
+
+
+def test_result_cache_dropped_when_another_instance_bumps(tmp_path):
+    path = str(tmp_path / "generation")
+    api = QueryCache(generation=IndexGeneration(path))
+    key = ("query", 10, None, None, None, None)
+    api.put_results(key, [{"id": "a", "similarity": 0.9}])
+    assert api.get_results(key) == [{"id": "a", "similarity": 0.9}]
+
+    QueryCache(generation=IndexGeneration(path)).invalidate()  # e.g. scripts/ingest.py
+
+    assert api.get_results(key) is None
+
+
+def test_cached_results_are_isolated_from_callers(tmp_path):
+    cache = QueryCache(generation=IndexGeneration(str(tmp_path / "generation")))
+    key = ("query", 10, None, None, None, None)
+    results = [{"id": "a", "similarity": 0.9, "meta": {"title": "Rates rise"}}]
+    cache.put_results(key, results)
+    results[0]["meta"]["title"] = "changed after put"
+
+    hit = cache.get_results(key)
+    hit[0]["meta"]["snippet"] = "added by a caller"
+
+    assert cache.get_results(key) == [{"id": "a", "similarity": 0.9, "meta": {"title": "Rates rise"}}]
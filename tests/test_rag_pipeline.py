@@ -0,0 +1,84 @@
+"""RAGPipeline streaming and answer caching over the local index and the fake Ollama server."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import HashingModel, OllamaServer, install_fakes
+from config.settings import settings
+from src.rag.llm_client import OllamaClient
+from src.rag.pipeline import RAGPipeline
+from src.vector_db.local_store import LocalVectorStore
+
+ARTICLES = [
+    {"id": "rates", "title": "Central bank raises interest rates", "description": "Inflation stays high"},
+    {"id": "cup", "title": "Football club wins the cup final", "description": "A late goal in extra time"},
+]
+ANSWER = "".join(f" token{i}" for i in range(3))
+
+
+@pytest.fixture
+def ollama():
+    with OllamaServer(tokens=3, first_token_ms=10, token_ms=5) as server:
+        yield server
+
+
+def make_pipeline(tmp_path, monkeypatch, ollama_url: str, answer_cache: bool = False) -> RAGPipeline:
+    monkeypatch.setattr(settings, "index_generation_path", str(tmp_path / "generation"))
+    monkeypatch.setattr(settings, "answer_cache_enabled", answer_cache)
+    store = LocalVectorStore(index_dir=str(tmp_path / "index"))
+    install_fakes(store, HashingModel(dimension=64))
+    store.upsert_articles([dict(a) for a in ARTICLES])
+    return RAGPipeline(vector_store=store, model="m", llm=OllamaClient(base_url=ollama_url))
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch, ollama) -> RAGPipeline:
+    return make_pipeline(tmp_path, monkeypatch, ollama.url)
+
+
+def test_stream_sends_sources_then_tokens_then_done(pipeline):
+    events = list(pipeline.ask_stream("interest rates", top_k=1))
+
+    assert [event for event, _ in events] == ["sources", "token", "token", "token", "done"]
+    sources = events[0][1]
+    assert [s["title"] for s in sources["sources"]] == [ARTICLES[0]["title"]]
+    assert sources["prompt_tokens"] > sources["context_tokens"] > 0
+    assert "".join(data for event, data in events if event == "token") == ANSWER
+
+
+def test_async_stream_matches_the_sync_one(pipeline):
+    async def collect() -> list:
+        return [e async for e in pipeline.ask_stream_async("interest rates", top_k=1)]
+
+    assert asyncio.run(collect()) == list(pipeline.ask_stream("interest rates", top_k=1))
+
+
+def test_ask_collects_the_stream(pipeline):
+    result = pipeline.ask("interest rates", top_k=1)
+
+    assert result["answer"] == ANSWER
+    assert result["sources"][0]["title"] == ARTICLES[0]["title"]
+
+
+def test_llm_failure_is_reported_in_the_stream(tmp_path, monkeypatch):
+    pipeline = make_pipeline(tmp_path, monkeypatch, "http://127.0.0.1:9")
+
+    events = list(pipeline.ask_stream("interest rates", top_k=1))
+
+    assert [event for event, _ in events] == ["sources", "token", "done"]
+    assert events[1][1].startswith("LLM error")
+
+
+def test_cached_answer_is_served_until_new_articles_are_indexed(tmp_path, monkeypatch, ollama):
+    pipeline = make_pipeline(tmp_path, monkeypatch, ollama.url, answer_cache=True)
+    assert pipeline.ask("interest rates", top_k=1)["answer"] == ANSWER
+    generations = ollama.requests
+
+    assert pipeline.ask("interest rates", top_k=1)["answer"] == ANSWER
+    assert ollama.requests == generations
+    assert pipeline.answer_cache.stats()["hits"] == 1
+
+    pipeline.vector_store.upsert_articles([{"id": "chips", "title": "Chip maker unveils a new processor"}])
+    assert pipeline.ask("interest rates", top_k=1)["answer"] == ANSWER
+    assert ollama.requests == generations + 1
@@ -0,0 +1,74 @@
+"""Pre-fork serve: thread limits are in place before warmup, and workers are spawned after it."""
+
+import os
+import sys
+import types
+
+import pytest
+
+from src.api import server
+
+
+@pytest.fixture
+def environ(monkeypatch) -> dict:
+    """A throwaway copy of the environment, without thread settings."""
+    environ = {k: v for k, v in os.environ.items() if k not in ("OMP_NUM_THREADS", "MKL_NUM_THREADS")}
+    monkeypatch.setattr(os, "environ", environ)
+    return environ
+
+
+@pytest.fixture
+def fake_app(monkeypatch, environ):
+    """Stand-in for ``src.api.main`` that records the environment warmup ran with."""
+    calls = []
+    main = types.ModuleType("src.api.main")
+
+    def warmup():
+        calls.append(("warmup", os.environ.get("OMP_NUM_THREADS")))
+        return {"components": {}}
+
+    main.warmup = warmup
+    main.app = object()
+    monkeypatch.setitem(sys.modules, "src.api.main", main)
+    monkeypatch.setattr(sys.modules["src.api"], "main", main, raising=False)
+    return calls
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_threads_are_limited_before_warmup_and_the_fork(fake_app, environ, monkeypatch):
+    monkeypatch.setattr(server.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(server, "_bind", lambda host, port: types.SimpleNamespace(close=lambda: None))
+    monkeypatch.setattr(server.metrics, "prepare_multiprocess", lambda: None)
+    monkeypatch.setattr(server.gc, "freeze", lambda: None)
+    monkeypatch.setattr(server, "_spawn", lambda sock: fake_app.append(("spawn", None)) or len(fake_app))
+    monkeypatch.setattr(server.signal, "signal", lambda *args: None)
+
+    def no_children():
+        raise ChildProcessError
+
+    monkeypatch.setattr(server.os, "wait", no_children)
+
+    server.serve(host="127.0.0.1", port=0, workers=4)
+
+    assert fake_app == [("warmup", "2"), ("spawn", None), ("spawn", None), ("spawn", None), ("spawn", None)]
+    assert environ["MKL_NUM_THREADS"] == "2"
+
+
+def test_explicit_thread_setting_is_kept(environ, monkeypatch):
+    environ["OMP_NUM_THREADS"] = "3"
+    monkeypatch.setattr(server.os, "cpu_count", lambda: 8)
+
+    server._limit_torch_threads(workers=8)
+
+    assert environ["OMP_NUM_THREADS"] == "3"
+    assert environ["MKL_NUM_THREADS"] == "1"
+
+
+def test_single_worker_serves_in_process_without_limits(fake_app, monkeypatch):
+    served = []
+    monkeypatch.setattr(server.uvicorn, "run", lambda app, host, port: served.append((host, port)))
+
+    server.serve(host="127.0.0.1", port=8123, workers=1)
+
+    assert fake_app == [("warmup", None)]
+    assert served == [("127.0.0.1", 8123)]
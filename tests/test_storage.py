@@ -0,0 +1,60 @@
+"""NewsStorage.iter_articles: filters, cross-bucket dedup and manifest pruning, for both backends."""
+
+from datetime import datetime
+
+import pytest
+
+from src.news_ingestion.segments import SegmentedNewsStorage
+from src.news_ingestion.storage import NewsStorage
+
+
+def article(id: str, category: str = "business", country: str = "us", published_at: str = "2026-10-05T08:00Z") -> dict:
+    return {"id": id, "title": f"Story {id}", "category": category, "country": country, "published_at": published_at}
+
+
+@pytest.fixture(params=[NewsStorage, SegmentedNewsStorage], ids=["json", "segmented"])
+def storage(request, tmp_path) -> NewsStorage:
+    return request.param(data_dir=str(tmp_path / "news"))
+
+
+def test_articles_in_both_buckets_are_yielded_once(storage):
+    storage.save_articles([article("a1"), article("a2")], bucket="weekly")
+    storage.save_articles([article("a2"), article("a3")], bucket="monthly")
+    storage.save_articles([article("a1")], bucket="weekly")
+
+    found = {a["id"]: a["_bucket"] for a in storage.iter_articles()}
+
+    assert found == {"a1": "weekly", "a2": "weekly", "a3": "monthly"}
+
+
+def test_filters_on_category_country_and_published_range(storage):
+    storage.save_articles([
+        article("a1", published_at="2026-10-05T08:00:00Z"),
+        article("a2", country="gb", published_at="2026-10-05T09:30:00+02:00"),
+        article("a3", category="sports", published_at="2026-10-06T12:00:00.250Z"),
+        article("a4", published_at=""),
+    ])
+
+    def ids(**filters) -> list[str]:
+        return sorted(a["id"] for a in storage.iter_articles(**filters))
+
+    assert ids(categories=["business"]) == ["a1", "a2", "a4"]
+    assert ids(categories=["business"], countries=["gb"]) == ["a2"]
+    assert ids(since=datetime(2026, 10, 5, 7, 45)) == ["a1", "a3"]  # a2 is 07:30 UTC
+    assert ids(until=datetime(2026, 10, 6)) == ["a1", "a2"]
+
+
+def test_buckets_the_manifest_rules_out_are_not_read(storage, monkeypatch):
+    storage.save_articles([article("a1", category="business")], bucket="weekly")
+    storage.save_articles([article("a2", category="sports")], bucket="monthly")
+    read = []
+    iter_bucket = storage._iter_bucket
+
+    def spy(bucket_dir):
+        read.append(bucket_dir.parent.name)
+        return iter_bucket(bucket_dir)
+
+    monkeypatch.setattr(storage, "_iter_bucket", spy)
+
+    assert [a["id"] for a in storage.iter_articles(categories=["sports"])] == ["a2"]
+    assert read == ["monthly"]